@@ -0,0 +1,54 @@
+"""
+Micro-benchmark of the mask functions available to the TabNet attentive
+transformers: the sort based sparsemax/entmax ('sparsemax', 'entmax') against
+the sort-free, bisection based versions ('sparsemax_bisect',
+'entmax_bisect'). Times a forward plus backward pass for a range of input
+dimensions (i.e. number of features)
+"""
+
+from time import perf_counter
+
+import torch
+
+from pytorch_widedeep.models.tabular.tabnet import sparsemax
+
+use_cuda = torch.cuda.is_available()
+device = "cuda" if use_cuda else "cpu"
+
+mask_fns = {
+    "sparsemax": sparsemax.sparsemax,
+    "sparsemax_bisect": sparsemax.sparsemax_bisect,
+    "entmax": sparsemax.entmax15,
+    "entmax_bisect": sparsemax.entmax15_bisect,
+}
+
+
+def run(mask_fn, X: torch.Tensor, grad: torch.Tensor):
+    # the sort based sparsemax modifies its input in place
+    out = mask_fn(X * 1.0, -1)
+    out.backward(grad)
+
+
+def benchmark(mask_fn, X: torch.Tensor, grad: torch.Tensor, n_runs: int = 50):
+    for _ in range(5):
+        run(mask_fn, X, grad)
+    if use_cuda:
+        torch.cuda.synchronize()
+    start = perf_counter()
+    for _ in range(n_runs):
+        run(mask_fn, X, grad)
+    if use_cuda:
+        torch.cuda.synchronize()
+    return (perf_counter() - start) / n_runs * 1e3
+
+
+if __name__ == "__main__":
+    batch_size = 1024
+
+    print(f"device: {device}, batch size: {batch_size}. Times in ms")
+    print("n_feat".ljust(8) + "".join(name.rjust(18) for name in mask_fns))
+    for n_feat in [16, 32, 64, 128, 256, 512]:
+        X = torch.randn(batch_size, n_feat, device=device, requires_grad=True)
+        grad = torch.randn(batch_size, n_feat, device=device)
+        times = [benchmark(fn, X, grad) for fn in mask_fns.values()]
+        print(str(n_feat).ljust(8) + "".join(f"{t:18.3f}" for t in times))
@@ -1,8 +1,9 @@
-from typing import Tuple
+from typing import List, Tuple, Iterator
 
 import numpy as np
-from torch.utils.data import DataLoader, WeightedRandomSampler
+from torch.utils.data import Sampler, DataLoader, WeightedRandomSampler
 
+from pytorch_widedeep.utils.text_utils import RaggedText
 from pytorch_widedeep.training._wd_dataset import WideDeepDataset
 
 
@@ -89,3 +90,150 @@ class DataLoaderImbalanced(DataLoader):
         super().__init__(
             dataset, batch_size, num_workers=num_workers, sampler=sampler, **kwargs
         )
+
+
+class BucketBatchSampler(Sampler):
+    r"""Batch sampler that groups sequences of similar length in the same
+    batch, while keeping the batches random.
+
+    The (shuffled) indices are split in pools of `batch_size *
+    bucket_size_mul` elements. Within each pool the indices are sorted by
+    the length of the sequences and split in batches, and then the order
+    of all the batches is shuffled.
+
+    Parameters
+    ----------
+    lengths: np.ndarray
+        array with the length of each sequence
+    batch_size: int
+        size of batch
+    shuffle: bool, default = True
+        Boolean indicating whether to shuffle the indices and the batches.
+        If `False`, all indices are sorted by length
+    drop_last: bool, default = False
+        Boolean indicating whether to drop the last, incomplete batch of each
+        pool
+    bucket_size_mul: int, default = 50
+        number of batches per pool
+    """
+
+    def __init__(
+        self,
+        lengths: np.ndarray,
+        batch_size: int,
+        shuffle: bool = True,
+        drop_last: bool = False,
+        bucket_size_mul: int = 50,
+    ):
+        self.lengths = np.asarray(lengths)
+        self.batch_size = batch_size
+        self.shuffle = shuffle
+        self.drop_last = drop_last
+        self.bucket_size_mul = bucket_size_mul
+
+    def __iter__(self) -> Iterator[List[int]]:
+        if self.shuffle:
+            idx = np.random.permutation(len(self.lengths))
+        else:
+            idx = np.arange(len(self.lengths))
+
+        pool_size = (
+            self.batch_size * self.bucket_size_mul
+            if self.shuffle
+            else len(self.lengths)
+        )
+
+        batches: List[np.ndarray] = []
+        for start in range(0, len(idx), pool_size):
+            pool = idx[start : start + pool_size]
+            pool = pool[np.argsort(self.lengths[pool], kind="stable")]
+            for b_start in range(0, len(pool), self.batch_size):
+                batch = pool[b_start : b_start + self.batch_size]
+                if len(batch) < self.batch_size and self.drop_last:
+                    continue
+                batches.append(batch)
+
+        if self.shuffle:
+            batches = [batches[i] for i in np.random.permutation(len(batches))]
+
+        for batch in batches:
+            yield batch.tolist()
+
+    def __len__(self) -> int:
+        pool_size = (
+            self.batch_size * self.bucket_size_mul
+            if self.shuffle
+            else len(self.lengths)
+        )
+        n_batches = 0
+        for start in range(0, len(self.lengths), pool_size):
+            n_pool = min(pool_size, len(self.lengths) - start)
+            n_batches += (
+                n_pool // self.batch_size
+                if self.drop_last
+                else -(-n_pool // self.batch_size)
+            )
+        return n_batches
+
+
+class DataLoaderBucketed(DataLoader):
+    r"""Class to load batches of texts of similar length (see
+    `BucketBatchSampler`). Combined with the `use_packed_sequences` option
+    of the RNN based text models, the computation spent on padding tokens is
+    largely reduced.
+
+    The length of each text is inferred from the padding index, or taken
+    directly from the `X_text` input of the dataset if this is a
+    `RaggedText` object. If `X_text` is a list, the first element is used.
+
+    Parameters
+    ----------
+    dataset: `WideDeepDataset`
+        see `pytorch_widedeep.training._wd_dataset`
+    batch_size: int
+        size of batch
+    num_workers: int
+        number of workers
+
+    Other Parameters
+    ----------------
+    **kwargs: Dict
+        This can include any parameter that can be passed to the _'standard'_
+        pytorch
+        [DataLoader](https://pytorch.org/docs/stable/data.html#torch.utils.data.DataLoader)
+        and that is not already explicitely passed to the class (except for
+        those related to sampling and batching, since this loader uses a
+        batch sampler). In addition, the dictionary can also include the
+        extra parameters `padding_idx` (default 1, the padding index used by
+        the `TextPreprocessor`) and `bucket_size_mul` (default 50), the
+        number of batches that are sorted by length together. The `shuffle`
+        and `drop_last` parameters are passed to the `BucketBatchSampler`.
+    """
+
+    def __init__(
+        self, dataset: WideDeepDataset, batch_size: int, num_workers: int, **kwargs
+    ):
+        assert dataset.X_text is not None, (
+            "The 'dataset' instance of WideDeepDataset must contain a "
+            "text array 'X_text'"
+        )
+
+        padding_idx = kwargs.pop("padding_idx", 1)
+        bucket_size_mul = kwargs.pop("bucket_size_mul", 50)
+        shuffle = kwargs.pop("shuffle", True)
+        drop_last = kwargs.pop("drop_last", False)
+
+        X_text = (
+            dataset.X_text[0] if isinstance(dataset.X_text, list) else dataset.X_text
+        )
+        if isinstance(X_text, RaggedText):
+            lengths = X_text.lengths
+        else:
+            lengths = (X_text != padding_idx).sum(axis=1)
+
+        batch_sampler = BucketBatchSampler(
+            lengths, batch_size, shuffle, drop_last, bucket_size_mul
+        )
+        super().__init__(
+            dataset, batch_sampler=batch_sampler, num_workers=num_workers, **kwargs
+        )
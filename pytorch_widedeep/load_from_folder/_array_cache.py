@@ -0,0 +1,144 @@
+import os
+import hashlib
+from typing import Dict, Tuple, Optional
+from contextlib import contextmanager
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None  # type: ignore[assignment]
+
+
+class ArrayCache:
+    """Append-only, on-disk cache of numpy arrays, used to cache processed
+    samples (e.g. decoded images or token ids) when loading from folder.
+
+    All arrays are stored in a single binary shard file. An index file,
+    with one line per array containing the (hashed) key, the offset within
+    the shard file, the dtype and the shape, allows to read the arrays back
+    via a memory map. The cache is filled lazily: arrays are only written
+    the first time they are requested.
+
+    The cache can be safely shared by several processes (e.g. the workers
+    of a `DataLoader`): appends are serialised with a file lock (on POSIX
+    systems) and each process syncs the index it holds in memory with the
+    index file whenever a key is not found.
+
+    Parameters
+    ----------
+    cache_dir: str
+        directory where the shard, index and lock files will be stored
+    name: str, default = "arrays"
+        name of the shard, index and lock files within `cache_dir`
+    """
+
+    def __init__(self, cache_dir: str, name: str = "arrays"):
+        self.cache_dir = cache_dir
+        self.name = name
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        self.shard_path = os.path.join(self.cache_dir, f"{name}.bin")
+        self.index_path = os.path.join(self.cache_dir, f"{name}.idx")
+        self.lock_path = os.path.join(self.cache_dir, f"{name}.lock")
+
+        self.index: Dict[str, Tuple[int, str, Tuple[int, ...]]] = {}
+        self._index_pos = 0
+        self._mmap: Optional[np.memmap] = None
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        hkey = self._hash(key)
+        if hkey not in self.index:
+            self._sync_index()
+            if hkey not in self.index:
+                return None
+
+        offset, dtype, shape = self.index[hkey]
+        nbytes = int(np.prod(shape)) * np.dtype(dtype).itemsize
+        if self._mmap is None or offset + nbytes > self._mmap.size:
+            # the shard file has grown since it was mapped
+            self._mmap = np.memmap(self.shard_path, dtype="uint8", mode="r")
+
+        return np.array(self._mmap[offset : offset + nbytes]).view(dtype).reshape(shape)
+
+    def put(self, key: str, arr: np.ndarray):
+        hkey = self._hash(key)
+        arr = np.ascontiguousarray(arr)
+
+        with self._lock():
+            # another process might have written this array in the meantime
+            self._sync_index()
+            if hkey in self.index:
+                return
+
+            with open(self.shard_path, "ab") as f:
+                f.seek(0, os.SEEK_END)
+                offset = f.tell()
+                f.write(arr.tobytes())
+
+            with open(self.index_path, "a", encoding="utf-8") as f:
+                f.write(
+                    "\t".join(
+                        [
+                            hkey,
+                            str(offset),
+                            arr.dtype.str,
+                            ",".join(map(str, arr.shape)),
+                        ]
+                    )
+                    + "\n"
+                )
+
+            self._sync_index()
+
+    def _sync_index(self):
+        if not os.path.exists(self.index_path):
+            return
+
+        with open(self.index_path, "rb") as f:
+            f.seek(self._index_pos)
+            lines = f.read()
+
+        # only complete lines are consumed
+        for line in lines.splitlines(keepends=True):
+            if not line.endswith(b"\n"):
+                break
+            hkey, offset, dtype, shape = line.decode("utf-8").rstrip("\n").split("\t")
+            self.index[hkey] = (
+                int(offset),
+                dtype,
+                tuple(int(s) for s in shape.split(",") if s != ""),
+            )
+            self._index_pos += len(line)
+
+    @staticmethod
+    def _hash(key: str) -> str:
+        # keys might be raw texts, with tabs and line breaks
+        return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+    @contextmanager
+    def _lock(self):
+        if fcntl is None:  # pragma: no cover
+            yield
+            return
+        with open(self.lock_path, "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def __getstate__(self):
+        # the memory map is not pickled (e.g. when sent to the DataLoader
+        # workers), it will be re-opened on first access
+        state = self.__dict__.copy()
+        state["_mmap"] = None
+        return state
+
+    def __len__(self) -> int:
+        self._sync_index()
+        return len(self.index)
+
+    def __repr__(self) -> str:
+        return f"ArrayCache(cache_dir={self.cache_dir}, name={self.name})"
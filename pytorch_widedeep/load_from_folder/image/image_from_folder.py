@@ -2,10 +2,12 @@ import os
 import os.path
 from typing import Any, List, Tuple, Union, Callable, Optional
 
+import cv2
 import numpy as np
 import torch
 from PIL import Image
 
+from pytorch_widedeep.load_from_folder._array_cache import ArrayCache
 from pytorch_widedeep.preprocessing.image_preprocessor import ImagePreprocessor
 
 IMG_EXTENSIONS = (
@@ -47,6 +49,45 @@ def accimage_loader(path: str) -> Any:  # pragma: no cover
         return pil_loader(path)
 
 
+def cv2_loader(path: str, reduce_to: Optional[Tuple[int, int]] = None) -> np.ndarray:
+    """Loads an image as an RGB `np.ndarray` using `cv2`, which is
+    significantly faster than PIL decoding.
+
+    If `reduce_to` (a tuple `(height, width)`) is not `None`, JPEG images are
+    decoded at a reduced size (1/2, 1/4 or 1/8 of the original, via `cv2`'s
+    `IMREAD_REDUCED_COLOR_*` flags), picking the largest reduction that keeps
+    the image at least as large as `reduce_to`. Note that this function has
+    to be passed as a `functools.partial` to set `reduce_to`, e.g.
+    `partial(cv2_loader, reduce_to=(224, 224))`
+    """
+    flag = cv2.IMREAD_COLOR
+    if reduce_to is not None:
+        # the header is read lazily by PIL, without decoding the image
+        with Image.open(path) as pil_img:
+            w, h = pil_img.size
+        for factor, reduced_flag in [
+            (8, cv2.IMREAD_REDUCED_COLOR_8),
+            (4, cv2.IMREAD_REDUCED_COLOR_4),
+            (2, cv2.IMREAD_REDUCED_COLOR_2),
+        ]:
+            if h // factor >= reduce_to[0] and w // factor >= reduce_to[1]:
+                flag = reduced_flag
+                break
+
+    img = cv2.imread(path, flag)
+    return cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+
+
+def torchvision_loader(path: str) -> np.ndarray:
+    """Loads an image as an RGB `np.ndarray` using `torchvision.io`, which
+    decodes JPEG and PNG images with libjpeg-turbo/libpng directly from the
+    raw bytes"""
+    from torchvision.io import ImageReadMode, read_file, decode_image
+
+    img = decode_image(read_file(path), mode=ImageReadMode.RGB)
+    return img.permute(1, 2, 0).numpy()
+
+
 def default_loader(path: str) -> Any:
     from torchvision import get_image_backend
 
@@ -73,7 +114,10 @@ class ImageFromFolder:
     preprocessor: `ImagePreprocessor`, Optional, default = None
         a fitted `ImagePreprocessor` object.
     loader: Callable[[str], Any], Optional, default = default_loader
-        a function to load a sample given its path.
+        a function to load a sample given its path. In addition to the
+        default, PIL-based, loader, this module includes two faster
+        alternatives: `cv2_loader` (which also supports reduced-size JPEG
+        decoding) and `torchvision_loader`.
     extensions: Tuple[str, ...], Optional, default = IMG_EXTENSIONS
         a tuple with the allowed extensions. If None, IMG_EXTENSIONS will be
         used where IMG_EXTENSIONS
@@ -81,6 +125,16 @@ class ImageFromFolder:
     transforms: Optional[Any], default = None
         a `torchvision.transforms` object. If None, this class will simply
         return an array representation of the PIL Image
+    cache_dir: str, Optional, default = None
+        If not None, directory where the decoded (and resized, if a
+        preprocessor is provided) images will be cached. The cache is filled
+        lazily, the first time each image is accessed, and stored in a
+        single memory-mapped file (see `ArrayCache`). Subsequent
+        accesses (e.g. in subsequent epochs) will simply read the `uint8`
+        arrays from the cache, skipping decoding and resizing. Note that the
+        cache keys include the image path and the preprocessor's height and
+        width, but not the loader, so a new directory should be used if the
+        loader changes.
     """
 
     def __init__(
@@ -92,6 +146,7 @@ class ImageFromFolder:
         loader: Callable[[str], Any] = default_loader,
         extensions: Optional[Tuple[str, ...]] = None,
         transforms: Optional[Any] = None,
+        cache_dir: Optional[str] = None,
     ) -> None:
         assert (
             directory is not None or preprocessor is not None
@@ -125,6 +180,10 @@ class ImageFromFolder:
         self.preprocessor = preprocessor
         self.loader = loader
         self.extensions = extensions if extensions is not None else IMG_EXTENSIONS
+        self.cache_dir = cache_dir
+        self.cache = (
+            ArrayCache(cache_dir, name="images") if cache_dir is not None else None
+        )
         self.transforms = transforms
         if self.transforms:
             self.transforms_names = [
@@ -174,6 +233,28 @@ class ImageFromFolder:
         assert has_file_allowed_extension(fname, self.extensions)
 
         path = os.path.join(directory, fname)
+
+        if self.cache is not None:
+            key = (
+                path
+                if preprocessor is None
+                else f"{path}|{preprocessor.height}x{preprocessor.width}"
+            )
+            cached_sample = self.cache.get(key)
+            if cached_sample is None:
+                cached_sample = np.asarray(self._load_sample(path, preprocessor))
+                self.cache.put(key, cached_sample)
+            processed_sample: Union[np.ndarray, Image.Image] = cached_sample
+        else:
+            processed_sample = self._load_sample(path, preprocessor)
+
+        prepared_sample = self._prepare_sample(processed_sample)
+
+        return prepared_sample
+
+    def _load_sample(
+        self, path: str, preprocessor: Optional[ImagePreprocessor] = None
+    ) -> Union[np.ndarray, Image.Image]:
         sample = self.loader(path)
 
         assert isinstance(sample, (Image.Image, np.ndarray)), (  # pragma: no cover
@@ -189,9 +270,7 @@ class ImageFromFolder:
         else:
             processed_sample = sample
 
-        prepared_sample = self._prepare_sample(processed_sample)
-
-        return prepared_sample
+        return processed_sample
 
     def _prepare_sample(  # noqa: C901
         self, processed_sample: Union[np.ndarray, Image.Image]
@@ -251,10 +330,14 @@ class ImageFromFolder:
                 f"preprocessor={self.preprocessor.__class__.__name__}"
             )
         if self.loader is not None:
-            list_of_params.append(f"loader={self.loader.__name__}")
+            # 'functools.partial' objects have no '__name__'
+            loader = getattr(self.loader, "func", self.loader)
+            list_of_params.append(f"loader={loader.__name__}")
         if self.extensions is not None:
             list_of_params.append("extensions={extensions}")
         if self.transforms is not None:
             list_of_params.append(f"transforms={self.transforms_names}")
+        if self.cache_dir is not None:
+            list_of_params.append("cache_dir={cache_dir}")
         all_params = ", ".join(list_of_params)
         return f"ImageFromFolder({all_params.format(**self.__dict__)})"
@@ -1,8 +1,10 @@
 import os
-from typing import List, Union
+import hashlib
+from typing import List, Union, Optional
 
 import numpy as np
 
+from pytorch_widedeep.load_from_folder._array_cache import ArrayCache
 from pytorch_widedeep.preprocessing.hf_preprocessor import (
     HFPreprocessor,
     ChunkHFPreprocessor,
@@ -12,6 +14,13 @@ from pytorch_widedeep.preprocessing.text_preprocessor import (
     ChunkTextPreprocessor,
 )
 
+TextProcessor = Union[
+    TextPreprocessor,
+    ChunkTextPreprocessor,
+    HFPreprocessor,
+    ChunkHFPreprocessor,
+]
+
 
 class TextFromFolder:
     """
@@ -26,6 +35,15 @@ class TextFromFolder:
     preprocessor: Union[TextPreprocessor, ChunkTextPreprocessor, HFPreprocessor, ChunkHFPreprocessor]
         The preprocessor used to process the text. It must be fitted before using
         this class
+    cache_dir: str, Optional, default = None
+        If not None, directory where the padded token id sequences will be
+        cached. The cache is filled lazily, the first time each text is
+        accessed, and stored in a single memory-mapped file (see
+        `ArrayCache`). Subsequent accesses (e.g. in subsequent epochs) will
+        simply read the sequences from the cache, with no file reading or
+        tokenization. The cache files are named after a hash of the
+        preprocessor's vocabulary and padding setup, so that a cache built
+        with a different vocabulary is never used.
     """
 
     def __init__(
@@ -40,6 +58,7 @@ class TextFromFolder:
             List[HFPreprocessor],
             List[ChunkHFPreprocessor],
         ],
+        cache_dir: Optional[str] = None,
     ):
         if isinstance(preprocessor, list):
             for p in preprocessor:
@@ -52,6 +71,17 @@ class TextFromFolder:
             ), "The preprocessor must be fitted before using this class"
 
         self.preprocessor = preprocessor
+        self.cache_dir = cache_dir
+
+        if cache_dir is not None:
+            if isinstance(preprocessor, list):
+                self.cache: Optional[Union[ArrayCache, List[ArrayCache]]] = [
+                    self._set_cache(cache_dir, p) for p in preprocessor
+                ]
+            else:
+                self.cache = self._set_cache(cache_dir, preprocessor)
+        else:
+            self.cache = None
 
     def get_item(
         self, text: Union[str, List[str]]
@@ -59,24 +89,43 @@ class TextFromFolder:
         if isinstance(self.preprocessor, list):
             assert isinstance(text, list)
             processed_sample: Union[np.ndarray, List[np.ndarray]] = [
-                self._preprocess_one_sample(t, self.preprocessor[i])
+                self._get_one_sample(
+                    t,
+                    self.preprocessor[i],
+                    self.cache[i] if self.cache is not None else None,  # type: ignore[index]
+                )
                 for i, t in enumerate(text)
             ]
         else:
             assert isinstance(text, str)
-            processed_sample = self._preprocess_one_sample(text, self.preprocessor)
+            processed_sample = self._get_one_sample(
+                text, self.preprocessor, self.cache  # type: ignore[arg-type]
+            )
+
+        return processed_sample
+
+    def _get_one_sample(
+        self,
+        text: str,
+        preprocessor: TextProcessor,
+        cache: Optional[ArrayCache] = None,
+    ) -> np.ndarray:
+        if cache is None:
+            return self._preprocess_one_sample(text, preprocessor)
+
+        processed_sample = cache.get(text)
+        if processed_sample is None:
+            processed_sample = np.asarray(
+                self._preprocess_one_sample(text, preprocessor)
+            )
+            cache.put(text, processed_sample)
 
         return processed_sample
 
     def _preprocess_one_sample(
         self,
         text: str,
-        preprocessor: Union[
-            TextPreprocessor,
-            ChunkTextPreprocessor,
-            HFPreprocessor,
-            ChunkHFPreprocessor,
-        ],
+        preprocessor: TextProcessor,
     ) -> np.ndarray:
         if (
             isinstance(preprocessor, ChunkTextPreprocessor)
@@ -93,6 +142,33 @@ class TextFromFolder:
 
         return processed_sample
 
+    @staticmethod
+    def _set_cache(cache_dir: str, preprocessor: TextProcessor) -> ArrayCache:
+        # the cache is tied to the vocabulary (or tokenizer) and to how the
+        # sequences are padded. A change in any of them results in a new
+        # set of cache files
+        if isinstance(preprocessor, TextPreprocessor):
+            root_dir = getattr(preprocessor, "root_dir", None)
+            fingerprint = [
+                "\n".join(preprocessor.vocab.itos),
+                str(preprocessor.maxlen),
+                str(preprocessor.pad_first),
+                str(preprocessor.pad_idx),
+                str(preprocessor.already_processed),
+                preprocessor.tokenizer_engine,
+                str(root_dir),
+            ]
+        else:
+            assert isinstance(preprocessor, HFPreprocessor)
+            fingerprint = [
+                preprocessor.model_name,
+                str(sorted(preprocessor.tokenizer.get_vocab().items())),
+                str(sorted(preprocessor.encode_params.items())),
+                str(preprocessor.root_dir),
+            ]
+        vocab_hash = hashlib.sha1("\t".join(fingerprint).encode("utf-8")).hexdigest()
+        return ArrayCache(cache_dir, name=f"tokens_{vocab_hash[:16]}")
+
     def __repr__(self):
         if isinstance(self.preprocessor, list):
             return f"{self.__class__.__name__}({[p.__class__.__name__ for p in self.preprocessor]})"
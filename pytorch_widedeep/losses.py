@@ -1,6 +1,7 @@
 import torch
 import torch.nn as nn
 import torch.nn.functional as F
+from torch.utils.checkpoint import checkpoint
 
 from pytorch_widedeep.wdtypes import (
     List,
@@ -736,21 +737,53 @@ class InfoNCELoss(nn.Module):
 
     Partially inspired by the code in this [repo](https://github.com/RElbers/info-nce-pytorch)
 
+    Both directions of the symmetric loss are derived from a single
+    similarity matrix. For large batches, the similarity matrix can be
+    computed in blocks of rows (see `chunk_size`) so that the full `B x B`
+    matrix is never held in memory, and the number of negatives per
+    observation can be capped (see `max_negatives`).
+
     Parameters
     ----------
     temperature: float, default = 0.1
         The logits are divided by the temperature before computing the loss value
     reduction: str, default = "mean"
         Loss reduction method
+    chunk_size: int, Optional, default = None
+        If not None, the similarity matrix is computed in blocks of
+        `chunk_size` rows, accumulating the log-sum-exp over the columns
+        across blocks. The blocks are recomputed during the backward pass
+        (see [checkpoint](https://pytorch.org/docs/stable/checkpoint.html)),
+        so the memory used by the loss grows as `chunk_size x B` instead of
+        `B x B`. The loss value is the same as without chunking
+    max_negatives: int, Optional, default = None
+        If not None, at each step the observations in the batch are randomly
+        split into groups of (at most) `max_negatives + 1` observations and
+        each observation is contrasted only with the other observations in
+        its group. Note that this changes the value of the loss
+        (fewer negatives lead to a lower loss) and that, when set,
+        `chunk_size` is ignored
     """
 
-    def __init__(self, temperature: float = 0.1, reduction: str = "mean"):
+    def __init__(
+        self,
+        temperature: float = 0.1,
+        reduction: str = "mean",
+        chunk_size: Optional[int] = None,
+        max_negatives: Optional[int] = None,
+    ):
         super(InfoNCELoss, self).__init__()
 
         self.temperature = temperature
         self.reduction = reduction
+        self.chunk_size = chunk_size
+        self.max_negatives = max_negatives
 
-    def forward(self, g_projs: Tuple[Tensor, Tensor]) -> Tensor:
+    def forward(
+        self,
+        g_projs: Tuple[Tensor, Tensor],
+        generator: Optional[torch.Generator] = None,
+    ) -> Tensor:
         r"""
         Parameters
         ----------
@@ -758,6 +791,10 @@ class InfoNCELoss(nn.Module):
             Tuple with the two tensors corresponding to the output of the two
             projection heads, as described 'SAINT: Improved Neural Networks
             for Tabular Data via Row Attention and Contrastive Pre-Training'.
+        generator: torch.Generator, Optional, default = None
+            Random number generator used to split the observations into
+            groups when `max_negatives` is not None. If None, the global
+            generator is used
 
         Examples
         --------
@@ -772,17 +809,80 @@ class InfoNCELoss(nn.Module):
         norm_z = F.normalize(z, dim=-1).flatten(1)
         norm_z_ = F.normalize(z_, dim=-1).flatten(1)
 
-        logits = (norm_z @ norm_z_.t()) / self.temperature
-        logits_ = (norm_z_ @ norm_z.t()) / self.temperature
+        if self.max_negatives is not None and self.max_negatives < len(norm_z) - 1:
+            return self._grouped_loss(norm_z, norm_z_, generator)
+
+        # the targets are the entries on the diagonal of the similarity matrix
+        pos = (norm_z * norm_z_).sum(dim=1) / self.temperature
+
+        # the rows of the similarity matrix are the logits of z vs z_ and its
+        # columns the logits of z_ vs z
+        if self.chunk_size is None or self.chunk_size >= len(norm_z):
+            row_lse, col_lse = self._logsumexp(norm_z, norm_z_)
+        else:
+            row_lses, col_lses = [], []
+            for norm_z_chunk in norm_z.split(self.chunk_size):
+                if torch.is_grad_enabled():
+                    chunk_lses = checkpoint(
+                        self._logsumexp, norm_z_chunk, norm_z_, use_reentrant=False
+                    )
+                else:
+                    chunk_lses = self._logsumexp(norm_z_chunk, norm_z_)
+                row_lses.append(chunk_lses[0])
+                col_lses.append(chunk_lses[1])
+            row_lse = torch.cat(row_lses)
+            col_lse = torch.stack(col_lses).logsumexp(dim=0)
+
+        loss = self._reduce(row_lse - pos)
+        loss_ = self._reduce(col_lse - pos)
 
-        # the target/labels are the entries on the diagonal
-        target = torch.arange(len(norm_z), device=norm_z.device)
+        return (loss + loss_) / 2.0
+
+    def _logsumexp(self, norm_z: Tensor, norm_z_: Tensor) -> Tuple[Tensor, Tensor]:
+        logits = (norm_z @ norm_z_.t()) / self.temperature
+        return logits.logsumexp(dim=1), logits.logsumexp(dim=0)
 
-        loss = F.cross_entropy(logits, target, reduction=self.reduction)
-        loss_ = F.cross_entropy(logits_, target, reduction=self.reduction)
+    def _grouped_loss(
+        self,
+        norm_z: Tensor,
+        norm_z_: Tensor,
+        generator: Optional[torch.Generator] = None,
+    ) -> Tensor:
+        bsz = len(norm_z)
+        group_size = self.max_negatives + 1  # type: ignore[operator]
+        n_groups = -(-bsz // group_size)
+        n_pad = n_groups * group_size - bsz
+
+        # the last group is completed with padding, which is masked out
+        perm = torch.randperm(bsz, device=norm_z.device, generator=generator)
+        z_g = F.pad(norm_z[perm], (0, 0, 0, n_pad)).view(n_groups, group_size, -1)
+        z_g_ = F.pad(norm_z_[perm], (0, 0, 0, n_pad)).view(n_groups, group_size, -1)
+        is_pad = torch.arange(n_groups * group_size, device=norm_z.device) >= bsz
+
+        logits = torch.bmm(z_g, z_g_.transpose(1, 2)) / self.temperature
+        pos = torch.diagonal(logits, dim1=1, dim2=2)
+
+        row_lse = logits.masked_fill(
+            is_pad.view(n_groups, 1, group_size), float("-inf")
+        ).logsumexp(dim=2)
+        col_lse = logits.masked_fill(
+            is_pad.view(n_groups, group_size, 1), float("-inf")
+        ).logsumexp(dim=1)
+
+        # back to the order of the observations in the input
+        unperm = torch.argsort(perm)
+        loss = self._reduce((row_lse - pos).flatten()[:bsz][unperm])
+        loss_ = self._reduce((col_lse - pos).flatten()[:bsz][unperm])
 
         return (loss + loss_) / 2.0
 
+    def _reduce(self, loss: Tensor) -> Tensor:
+        if self.reduction == "mean":
+            return loss.mean()
+        if self.reduction == "sum":
+            return loss.sum()
+        return loss
+
 
 class DenoisingLoss(nn.Module):
     r"""Denoising Loss. Loss applied during the Contrastive Denoising Self
@@ -834,7 +934,10 @@ class DenoisingLoss(nn.Module):
             encodings, referred in the SAINT paper as $x$ and $x''$
             respectively. If one denoising MLP is used per categorical
             feature `x_cat_and_cat_` will be a list of tuples, one per
-            categorical feature
+            categorical feature. If these MLPs are grouped, it will be a
+            tuple of tensors stacked along the first dimension, of shape
+            $(F, N)$ and $(F, N, C)$ respectively, where $F$ is the number of
+            features and $C$ the largest number of categories
         x_cont_and_cont_: tuple of Tensors or lists of tuples
             same as `x_cat_and_cat_` but for continuous columns
 
@@ -870,7 +973,14 @@ class DenoisingLoss(nn.Module):
                 loss_cat += F.cross_entropy(x_, x, reduction=self.reduction)
         elif isinstance(x_cat_and_cat_, tuple):
             x, x_ = x_cat_and_cat_
-            loss_cat += F.cross_entropy(x_, x, reduction=self.reduction)
+            if x_.dim() == 3:
+                loss_cat += self._reduce_per_feature(
+                    F.cross_entropy(
+                        x_.flatten(0, 1), x.flatten(), reduction="none"
+                    ).view(x.shape)
+                )
+            else:
+                loss_cat += F.cross_entropy(x_, x, reduction=self.reduction)
 
         return loss_cat
 
@@ -881,13 +991,30 @@ class DenoisingLoss(nn.Module):
                 loss_cont += F.mse_loss(x_, x, reduction=self.reduction)
         elif isinstance(x_cont_and_cont_, tuple):
             x, x_ = x_cont_and_cont_
-            loss_cont += F.mse_loss(x_, x, reduction=self.reduction)
+            if x_.dim() == 3:
+                loss_cont += self._reduce_per_feature(
+                    F.mse_loss(x_, x, reduction="none")
+                )
+            else:
+                loss_cont += F.mse_loss(x_, x, reduction=self.reduction)
 
         return loss_cont
 
+    def _reduce_per_feature(self, loss: Tensor) -> Tensor:
+        # loss of the grouped MLPs, of shape (n_feat, batch_size, ...): as
+        # with one MLP per feature, the loss of each feature is reduced
+        # separately and then added
+        loss = loss.flatten(1)
+        if self.reduction == "mean":
+            return loss.mean(dim=1).sum()
+        elif self.reduction == "sum":
+            return loss.sum()
+        else:
+            return loss
+
     @staticmethod
     def _get_device(
-        x_and_x_: Union[List[Tuple[Tensor, Tensor]], Tuple[Tensor, Tensor]]
+        x_and_x_: Union[List[Tuple[Tensor, Tensor]], Tuple[Tensor, Tensor]],
     ):
         if isinstance(x_and_x_, tuple):
             device = x_and_x_[0].device
@@ -24,3 +24,7 @@ from pytorch_widedeep.models.tabular import (
 )
 from pytorch_widedeep.models.wide_deep import WideDeep
 from pytorch_widedeep.models.model_fusion import ModelFuser
+from pytorch_widedeep.models.tabular.tabnet import tabnet_inference_mode
+from pytorch_widedeep.models._attention_capture import (
+    capture_attention_weights,
+)
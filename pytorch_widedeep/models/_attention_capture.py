@@ -0,0 +1,50 @@
+from typing import Iterator
+from contextlib import contextmanager
+
+from torch import nn
+
+
+@contextmanager
+def capture_attention_weights(model: nn.Module) -> Iterator[nn.Module]:
+    r"""Context manager to capture the attention weights of a model.
+
+    By default, the attention layers in the library do not keep their
+    attention weights, and the attention is computed with the fused
+    [scaled_dot_product_attention](https://pytorch.org/docs/stable/generated/torch.nn.functional.scaled_dot_product_attention.html)
+    kernel where possible, which never materializes them. Within this
+    context manager the weights are explicitly computed and stored, so that
+    they can be accessed via the `attention_weights` property of the
+    models after a forward pass. The weights stored during the last forward
+    pass within the context manager remain available after it exits, until
+    the next forward pass.
+
+    Note that the weights are not captured for layers that do not compute
+    them (i.e. when using linear attention or `use_flash_attention = True`)
+
+    Parameters
+    ----------
+    model: nn.Module
+        Model, or model component, with attention layers
+
+    Examples
+    --------
+    >>> import torch
+    >>> from pytorch_widedeep.models import TabTransformer, capture_attention_weights
+    >>> X_tab = torch.cat((torch.empty(5, 4).random_(4), torch.rand(5, 1)), axis=1)
+    >>> colnames = ['a', 'b', 'c', 'd', 'e']
+    >>> cat_embed_input = [(u,i) for u,i in zip(colnames[:4], [4]*4)]
+    >>> column_idx = {k:v for v,k in enumerate(colnames)}
+    >>> model = TabTransformer(column_idx=column_idx, cat_embed_input=cat_embed_input, continuous_cols=['e'])
+    >>> with capture_attention_weights(model):
+    ...     out = model(X_tab)
+    >>> attn_weights = model.attention_weights
+    """
+    attn_layers = [m for m in model.modules() if hasattr(m, "store_attn_weights")]
+    previous = [m.store_attn_weights for m in attn_layers]
+    for m in attn_layers:
+        setattr(m, "store_attn_weights", True)
+    try:
+        yield model
+    finally:
+        for m, store_attn_weights in zip(attn_layers, previous):
+            setattr(m, "store_attn_weights", store_attn_weights)
@@ -2,9 +2,10 @@ import math
 
 import torch
 import einops
+import torch.nn.functional as F
 from torch import nn, einsum
 
-from pytorch_widedeep.wdtypes import Tensor
+from pytorch_widedeep.wdtypes import Tensor, Optional
 
 
 class ContextAttention(nn.Module):
@@ -21,10 +22,18 @@ class ContextAttention(nn.Module):
         self.dropout = nn.Dropout(dropout)
         self.sum_along_seq = sum_along_seq
 
-    def forward(self, X: Tensor) -> Tensor:
+        # see 'pytorch_widedeep.models.capture_attention_weights'
+        self.store_attn_weights = False
+        self.attn_weights: Optional[Tensor] = None
+
+    def forward(self, X: Tensor, mask: Optional[Tensor] = None) -> Tensor:
         scores = torch.tanh_(self.inp_proj(X))
-        attn_weights = self.context(scores).softmax(dim=1)
-        self.attn_weights = attn_weights.squeeze(2)
+        logits = self.context(scores)
+        if mask is not None:
+            # mask: (N, S), True for the elements to attend
+            logits = logits.masked_fill(~mask.unsqueeze(2), float("-inf"))
+        attn_weights = logits.softmax(dim=1)
+        self.attn_weights = attn_weights.squeeze(2) if self.store_attn_weights else None
         attn_weights = self.dropout(attn_weights)
         output = (attn_weights * X).sum(1) if self.sum_along_seq else (attn_weights * X)
         return output
@@ -59,6 +68,10 @@ class QueryKeySelfAttention(nn.Module):
         self.qk_proj = nn.Linear(input_dim, input_dim * 2, bias=use_bias)
         self.dropout = nn.Dropout(dropout)
 
+        # see 'pytorch_widedeep.models.capture_attention_weights'
+        self.store_attn_weights = False
+        self.attn_weights: Optional[Tensor] = None
+
     def forward(self, X: Tensor) -> Tensor:
         # b: batch size
         # s: seq length
@@ -71,10 +84,19 @@ class QueryKeySelfAttention(nn.Module):
             lambda t: einops.rearrange(t, "b m (h d) -> b h m d", h=self.n_heads),
             (q, k, X),
         )
-        scores = einsum("b h s d, b h l d -> b h s l", q, k) / math.sqrt(self.head_dim)
-        attn_weights = scores.softmax(dim=-1)
-        self.attn_weights = attn_weights
-        attn_weights = self.dropout(attn_weights)
-        attn_output = einsum("b h s l, b h l d -> b h s d", attn_weights, x_rearr)
+        if self.store_attn_weights:
+            scores = einsum("b h s d, b h l d -> b h s l", q, k) / math.sqrt(
+                self.head_dim
+            )
+            attn_weights = scores.softmax(dim=-1)
+            self.attn_weights = attn_weights
+            attn_weights = self.dropout(attn_weights)
+            attn_output = einsum("b h s l, b h l d -> b h s d", attn_weights, x_rearr)
+        else:
+            # the input itself plays the role of the values
+            attn_output = F.scaled_dot_product_attention(
+                q, k, x_rearr, dropout_p=self.dropout.p if self.training else 0
+            )
+            self.attn_weights = None
         output = einops.rearrange(attn_output, "b h s d -> b s (h d)", h=self.n_heads)
         return output
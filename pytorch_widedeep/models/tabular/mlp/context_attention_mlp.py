@@ -250,5 +250,9 @@ class ContextAttentionMLP(BaseTabularModelWithAttention):
 
         The shape of the attention weights is $(N, F)$, where $N$ is the batch
         size and $F$ is the number of features/columns in the dataset
+
+        :information_source: **NOTE**: the attention weights are only stored
+        for the forward passes run within the `capture_attention_weights`
+        context manager (see `pytorch_widedeep.models`)
         """
         return [blk.attn.attn_weights for blk in self.encoder]
@@ -275,5 +275,9 @@ class SelfAttentionMLP(BaseTabularModelWithAttention):
         The shape of the attention weights is $(N, H, F, F)$, where $N$ is the
         batch size, $H$ is the number of attention heads and $F$ is the
         number of features/columns in the dataset
+
+        :information_source: **NOTE**: the attention weights are only stored
+        for the forward passes run within the `capture_attention_weights`
+        context manager (see `pytorch_widedeep.models`)
         """
         return [blk.attn.attn_weights for blk in self.encoder]
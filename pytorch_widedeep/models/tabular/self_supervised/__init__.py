@@ -1,3 +1,6 @@
+from pytorch_widedeep.models.tabular.self_supervised.cached_encoder_head import (
+    CachedEncoderHead,
+)
 from pytorch_widedeep.models.tabular.self_supervised.encoder_decoder_model import (
     EncoderDecoderModel,
 )
@@ -6,33 +6,51 @@ The following two functions are based on those in the SAINT repo
 - MixUp: https://github.com/facebookresearch/mixup-cifar10
 """
 
-import numpy as np
 import torch
 
-from pytorch_widedeep.wdtypes import Tensor
+from pytorch_widedeep.wdtypes import Tensor, Optional
 
 
-def cut_mix(x: Tensor, lam: float = 0.8) -> Tensor:
+def cut_mix(
+    x: Tensor, lam: float = 0.8, generator: Optional[torch.Generator] = None
+) -> Tensor:
     batch_size = x.size()[0]
 
-    mask = torch.from_numpy(np.random.choice(2, (x.shape), p=[lam, 1 - lam])).to(
-        x.device
-    )
+    # every value is kept with probability lam and replaced by that of a
+    # random row otherwise. The random numbers are drawn directly on the
+    # device of x
+    keep = torch.rand(x.shape, device=x.device, generator=generator) < lam
 
-    rand_idx = torch.randperm(batch_size).to(x.device)
+    rand_idx = torch.randperm(batch_size, device=x.device, generator=generator)
 
-    x_ = x[rand_idx].clone()
+    return torch.where(keep, x, x[rand_idx])
 
-    x_[mask == 0] = x[mask == 0]
 
-    return x_
-
-
-def mix_up(p: Tensor, lam: float = 0.8) -> Tensor:
+def mix_up(
+    p: Tensor, lam: float = 0.8, generator: Optional[torch.Generator] = None
+) -> Tensor:
     batch_size = p.size()[0]
 
-    rand_idx = torch.randperm(batch_size).to(p.device)
+    rand_idx = torch.randperm(batch_size, device=p.device, generator=generator)
 
     p_ = lam * p + (1 - lam) * p[rand_idx, ...]
 
     return p_
+
+
+def device_generator(
+    seed: Optional[int],
+    device: torch.device,
+    generator: Optional[torch.Generator] = None,
+) -> Optional[torch.Generator]:
+    r"""Returns a random number generator on `device` seeded with `seed`, or
+    None (i.e. the global generator will be used) if `seed` is None. If
+    `generator` is already on `device` it is returned as it is, so that its
+    state carries on across calls
+    """
+    if seed is None:
+        return None
+    if generator is None or generator.device != device:
+        generator = torch.Generator(device=device)
+        generator.manual_seed(seed)
+    return generator
@@ -2,6 +2,7 @@ import torch
 from torch import nn
 
 from pytorch_widedeep.wdtypes import Dict, List, Tuple, Tensor
+from pytorch_widedeep.models._get_activation_fn import get_activation_fn
 from pytorch_widedeep.models.tabular.mlp._layers import MLP
 
 
@@ -196,3 +197,154 @@ class ContMlpPerFeature(nn.Module):
         ]
 
         return list(zip(x, x_))
+
+
+class CatGroupedMlp(nn.Module):
+    r"""Dedicated MLP per categorical feature, as in `CatMlpPerFeature`, but
+    with the weights of all MLPs stacked so that they are run at once with
+    batched matrix multiplications. The hidden and output dimensions are
+    padded to those of the feature with the most categories. The padded
+    hidden units are zeroed and the padded outputs (i.e. classes) are set to
+    -inf, so that they do not contribute to the loss
+    """
+
+    col_idx: Tensor
+
+    def __init__(
+        self,
+        input_dim: int,
+        cat_embed_input: List[Tuple[str, int]],
+        column_idx: Dict[str, int],
+        activation: str,
+    ):
+        super(CatGroupedMlp, self).__init__()
+
+        self.input_dim = input_dim
+        self.column_idx = column_idx
+        self.cat_embed_input = cat_embed_input
+        self.activation = activation
+
+        n_classes = [val for col, val in cat_embed_input if col != "cls_token"]
+        self.register_buffer(
+            "col_idx",
+            torch.tensor(
+                [column_idx[col] for col, _ in cat_embed_input if col != "cls_token"]
+            ),
+            persistent=False,
+        )
+
+        self.grouped_mlp = _GroupedMlp(
+            input_dim, [val * 4 for val in n_classes], n_classes, activation
+        )
+
+    def forward(self, X: Tensor, r_: Tensor) -> Tuple[Tensor, Tensor]:
+        # (n_feat, batch_size)
+        x = X[:, self.col_idx].long().t()
+
+        # (n_feat, batch_size, max_n_classes)
+        x_ = self.grouped_mlp(r_[:, self.col_idx, :].transpose(0, 1))
+        x_ = x_.masked_fill(~self.grouped_mlp.out_mask, float("-inf"))
+
+        return x, x_
+
+
+class ContGroupedMlp(nn.Module):
+    r"""Dedicated MLP per continuous feature, as in `ContMlpPerFeature`, but
+    with the weights of all MLPs stacked so that they are run at once with
+    batched matrix multiplications
+    """
+
+    col_idx: Tensor
+
+    def __init__(
+        self,
+        input_dim: int,
+        continuous_cols: List[str],
+        column_idx: Dict[str, int],
+        activation: str,
+    ):
+        super(ContGroupedMlp, self).__init__()
+
+        self.input_dim = input_dim
+        self.column_idx = column_idx
+        self.continuous_cols = continuous_cols
+        self.activation = activation
+
+        self.register_buffer(
+            "col_idx",
+            torch.tensor([column_idx[col] for col in continuous_cols]),
+            persistent=False,
+        )
+
+        n_feat = len(continuous_cols)
+        self.grouped_mlp = _GroupedMlp(
+            input_dim, [input_dim * 2] * n_feat, [1] * n_feat, activation
+        )
+
+    def forward(self, X: Tensor, r_: Tensor) -> Tuple[Tensor, Tensor]:
+        # (n_feat, batch_size, 1)
+        x = X[:, self.col_idx].float().t().unsqueeze(2)
+
+        x_ = self.grouped_mlp(r_[:, self.col_idx, :].transpose(0, 1))
+
+        return x, x_
+
+
+class _GroupedMlp(nn.Module):
+    r"""n_feat MLPs `[input_dim, hidden_dims[i], out_dims[i]]` (with the
+    same structure as those built with `MLP`: linear + activation per layer)
+    stacked along the first dimension. The input is expected to be of shape
+    `(n_feat, batch_size, input_dim)`
+    """
+
+    hidden_mask: Tensor
+    out_mask: Tensor
+
+    def __init__(
+        self,
+        input_dim: int,
+        hidden_dims: List[int],
+        out_dims: List[int],
+        activation: str,
+    ):
+        super(_GroupedMlp, self).__init__()
+
+        n_feat, max_hidden, max_out = len(hidden_dims), max(hidden_dims), max(out_dims)
+
+        self.w1 = nn.Parameter(torch.empty(n_feat, input_dim, max_hidden))
+        self.b1 = nn.Parameter(torch.empty(n_feat, 1, max_hidden))
+        self.w2 = nn.Parameter(torch.empty(n_feat, max_hidden, max_out))
+        self.b2 = nn.Parameter(torch.empty(n_feat, 1, max_out))
+
+        self.register_buffer(
+            "hidden_mask", self._padding_mask(hidden_dims, max_hidden), persistent=False
+        )
+        self.register_buffer(
+            "out_mask", self._padding_mask(out_dims, max_out), persistent=False
+        )
+
+        self.activation = get_activation_fn(activation)
+
+        self._reset_parameters(input_dim, hidden_dims)
+
+    def forward(self, X: Tensor) -> Tensor:
+        # the padded hidden units are zeroed so that neither them nor their
+        # weights contribute to the output or receive gradients
+        h = self.activation(torch.baddbmm(self.b1, X, self.w1)) * self.hidden_mask
+        return self.activation(torch.baddbmm(self.b2, h, self.w2))
+
+    @staticmethod
+    def _padding_mask(dims: List[int], max_dim: int) -> Tensor:
+        return (torch.arange(max_dim) < torch.tensor(dims).unsqueeze(1)).unsqueeze(1)
+
+    def _reset_parameters(self, input_dim: int, hidden_dims: List[int]):
+        # same as the default initialization of nn.Linear, using the actual
+        # (not padded) fan in of each MLP
+        for w, b, fan_in in [
+            (self.w1, self.b1, [input_dim] * len(hidden_dims)),
+            (self.w2, self.b2, hidden_dims),
+        ]:
+            bound = 1 / torch.tensor(fan_in, dtype=torch.float).sqrt()
+            with torch.no_grad():
+                w.uniform_(-1, 1).mul_(bound.view(-1, 1, 1))
+                b.uniform_(-1, 1).mul_(bound.view(-1, 1, 1))
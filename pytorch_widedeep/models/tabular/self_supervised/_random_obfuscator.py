@@ -5,11 +5,15 @@ https://github.com/dreamquark-ai/tabnet
 Therefore, ALL CREDIT to the dreamquark-ai's team
 """
 
-from typing import Tuple
+from typing import Tuple, Optional
 
 import torch
 from torch import nn
 
+from pytorch_widedeep.models.tabular.self_supervised._augmentations import (
+    device_generator,
+)
+
 
 class RandomObfuscator(nn.Module):
     r"""Creates and applies an obfuscation masks
@@ -21,13 +25,19 @@ class RandomObfuscator(nn.Module):
     ----------
     p: float
         Ratio of features that will be discarded for reconstruction
+    seed: int, Optional, default = None
+        Seed of the random number generator used to build the masks. If
+        None the global generator is used
     """
 
-    def __init__(self, p: float):
+    def __init__(self, p: float, seed: Optional[int] = None):
         super(RandomObfuscator, self).__init__()
         self.p = p
+        self.seed = seed
+        self.generator: Optional[torch.Generator] = None
 
     def forward(self, x: torch.Tensor) -> Tuple[torch.Tensor, torch.Tensor]:
-        mask = torch.bernoulli(self.p * torch.ones(x.shape)).to(x.device)
+        self.generator = device_generator(self.seed, x.device, self.generator)
+        mask = torch.empty_like(x).bernoulli_(self.p, generator=self.generator)
         masked_input = torch.mul(1 - mask, x)
         return masked_input, mask
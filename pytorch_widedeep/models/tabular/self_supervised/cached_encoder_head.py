@@ -0,0 +1,139 @@
+import copy
+
+from pytorch_widedeep.models import TabNet, TabPerceiver, TabTransformer
+from pytorch_widedeep.wdtypes import (
+    Union,
+    Tensor,
+    ModelWithAttention,
+    ModelWithoutAttention,
+)
+from pytorch_widedeep.models.tabular.tabnet import tabnet_inference_mode
+from pytorch_widedeep.models._base_wd_model_component import (
+    BaseWDModelComponent,
+)
+
+
+def encoder_outputs(
+    model: Union[ModelWithAttention, ModelWithoutAttention], X: Tensor
+) -> Tensor:
+    r"""Computes the output of the encoder of a tabular model, i.e. the
+    output of `model.encoder(model._get_embeddings(X))`. For the `TabNet`,
+    the output of the decision steps is aggregated, as in the model's forward
+    pass
+
+    Parameters
+    ----------
+    model: ModelWithAttention | ModelWithoutAttention
+        tabular model
+    X: Tensor
+        input tensor (as the one passed to the model)
+
+    Returns
+    -------
+    Tensor
+        encoder outputs, with shape $(N, F, E)$ for models with attention,
+        where $F$ is the number of tokens (including the cls token, if any),
+        and $(N, E)$ otherwise
+    """
+    _check_model_is_supported(model)
+
+    if isinstance(model, TabNet):
+        with tabnet_inference_mode(model):
+            res, _ = model(X)
+        return res
+
+    return model.encoder(model._get_embeddings(X))
+
+
+class CachedEncoderHead(BaseWDModelComponent):
+    r"""Layers of a (pre-trained) tabular model that come after its encoder.
+
+    This class is designed to speed up the supervised training that
+    normally follows the self-supervised pre-training, when the embeddings
+    and the encoder of the pre-trained model are frozen. In that case, the
+    encoder outputs can be computed once for the whole dataset and cached
+    (see the `cache_encoder_outputs` method of the `EncoderDecoderTrainer`
+    and `ContrastiveDenoisingTrainer`). This class is then used as the
+    `deeptabular` component of a `WideDeep` model, and the cached outputs as
+    the `X_tab` input, so that only the layers after the encoder (and the
+    prediction head of the `WideDeep` model) are trained.
+
+    The layers after the encoder are the pooling of the tokens (i.e. using
+    the cls token or concatenating all tokens) for models with attention
+    and the MLP on top of the encoder, if any. The MLP is copied, so the
+    layers of the pre-trained model are not modified.
+
+    :information_source: **NOTE**: the predictions on new data also need to
+     be computed on the cached encoder outputs of that data.
+
+    Parameters
+    ----------
+    model: ModelWithAttention | ModelWithoutAttention
+        (pre-trained) tabular model whose encoder outputs will be the input
+        to this component
+
+    Attributes
+    ----------
+    mlp: nn.Module, Optional
+        copy of the MLP on top of the model's encoder, if any
+
+    Examples
+    --------
+    >>> import torch
+    >>> from pytorch_widedeep.models import TabMlp, WideDeep
+    >>> from pytorch_widedeep.self_supervised_training import CachedEncoderHead
+    >>> from pytorch_widedeep.models.tabular.self_supervised.cached_encoder_head import encoder_outputs
+    >>> X_tab = torch.cat((torch.empty(5, 4).random_(4), torch.rand(5, 1)), axis=1)
+    >>> colnames = ["a", "b", "c", "d", "e"]
+    >>> cat_embed_input = [(u, i, j) for u, i, j in zip(colnames[:4], [4] * 4, [8] * 4)]
+    >>> column_idx = {k: v for v, k in enumerate(colnames)}
+    >>> tab_mlp = TabMlp(column_idx=column_idx, cat_embed_input=cat_embed_input, continuous_cols=["e"])
+    >>> with torch.no_grad():
+    ...     X_encoded = encoder_outputs(tab_mlp, X_tab)
+    >>> model = WideDeep(deeptabular=CachedEncoderHead(tab_mlp))
+    >>> out = model({"deeptabular": X_encoded})
+    """
+
+    def __init__(self, model: Union[ModelWithAttention, ModelWithoutAttention]):
+        super(CachedEncoderHead, self).__init__()
+
+        _check_model_is_supported(model)
+
+        self.with_cls_token = getattr(model, "with_cls_token", False)
+
+        mlp = getattr(model, "mlp", None)
+        self.mlp = copy.deepcopy(mlp) if mlp is not None else None
+
+        self.model_output_dim = model.output_dim
+
+    def forward(self, X: Tensor) -> Tensor:
+        x = X.float()
+        if x.dim() == 3:
+            x = x[:, 0, :] if self.with_cls_token else x.flatten(1)
+        if self.mlp is not None:
+            x = self.mlp(x)
+        return x
+
+    @property
+    def output_dim(self) -> int:
+        r"""The output dimension of the model. This is a required property
+        neccesary to build the `WideDeep` class
+        """
+        return self.model_output_dim
+
+
+def _check_model_is_supported(model: Union[ModelWithAttention, ModelWithoutAttention]):
+    if isinstance(model, TabPerceiver):
+        raise ValueError(
+            "Caching the encoder outputs is not supported for the 'TabPerceiver'"
+        )
+    if (
+        isinstance(model, TabTransformer)
+        and model.n_cont
+        and not model.embed_continuous
+    ):
+        raise ValueError(
+            "Caching the encoder outputs is only supported for the 'TabTransformer' "
+            "if both categorical and continuous columns are embedded. Please set "
+            "'embed_continuous = True'"
+        )
@@ -15,16 +15,26 @@ from pytorch_widedeep.models.tabular.mlp._layers import MLP
 from pytorch_widedeep.preprocessing.tab_preprocessor import TabPreprocessor
 from pytorch_widedeep.models.tabular.self_supervised._denoise_mlps import (
     CatSingleMlp,
+    CatGroupedMlp,
     ContSingleMlp,
+    ContGroupedMlp,
     CatMlpPerFeature,
     ContMlpPerFeature,
 )
 from pytorch_widedeep.models.tabular.self_supervised._augmentations import (
     mix_up,
     cut_mix,
+    device_generator,
 )
 
-DenoiseMlp = Union[CatSingleMlp, ContSingleMlp, CatMlpPerFeature, ContMlpPerFeature]
+DenoiseMlp = Union[
+    CatSingleMlp,
+    ContSingleMlp,
+    CatMlpPerFeature,
+    ContMlpPerFeature,
+    CatGroupedMlp,
+    ContGroupedMlp,
+]
 
 
 class ContrastiveDenoisingModel(nn.Module):
@@ -38,6 +48,8 @@ class ContrastiveDenoisingModel(nn.Module):
     ``pytorch_widedeep.self_supervised_training.ContrastiveDenoisingTrainer``
     """
 
+    _t: Optional[Tensor]
+
     def __init__(
         self,
         model: ModelWithAttention,
@@ -46,9 +58,10 @@ class ContrastiveDenoisingModel(nn.Module):
         projection_head1_dims: Optional[List],
         projection_head2_dims: Optional[List],
         projection_heads_activation: str,
-        cat_mlp_type: Literal["single", "multiple"],
-        cont_mlp_type: Literal["single", "multiple"],
+        cat_mlp_type: Literal["single", "multiple", "grouped"],
+        cont_mlp_type: Literal["single", "multiple", "grouped"],
         denoise_mlps_activation: str,
+        seed: Optional[int] = None,
     ):
         super(ContrastiveDenoisingModel, self).__init__()
 
@@ -62,10 +75,15 @@ class ContrastiveDenoisingModel(nn.Module):
         self.cat_mlp_type = cat_mlp_type
         self.cont_mlp_type = cont_mlp_type
         self.denoise_mlps_activation = denoise_mlps_activation
+        self.seed = seed
+        self.generator: Optional[torch.Generator] = None
 
         self.projection_head1, self.projection_head2 = self._set_projection_heads()
         if self.loss_type in ["denoising", "both"]:
-            self._t = self._tensor_to_subtract_from_cats(preprocessor)
+            # a (non persistent) buffer so that it moves with the model
+            self.register_buffer(
+                "_t", self._tensor_to_subtract_from_cats(preprocessor), persistent=False
+            )
             (
                 self.denoise_cat_mlp,
                 self.denoise_cont_mlp,
@@ -84,11 +102,12 @@ class ContrastiveDenoisingModel(nn.Module):
 
         # cut_mixed and mixed_up branch
         if self.training:
-            cut_mixed = cut_mix(X)
+            self.generator = device_generator(self.seed, X.device, self.generator)
+            cut_mixed = cut_mix(X, generator=self.generator)
             cut_mixed_embed = self.model._get_embeddings(cut_mixed)
             if self.model.with_cls_token:
                 cut_mixed_embed[:, 0, :] = 0.0
-            cut_mixed_embed_mixed_up = mix_up(cut_mixed_embed)
+            cut_mixed_embed_mixed_up = mix_up(cut_mixed_embed, generator=self.generator)
             encoded_ = self.model.encoder(cut_mixed_embed_mixed_up)
         else:
             encoded_ = encoded.clone()
@@ -111,8 +130,7 @@ class ContrastiveDenoisingModel(nn.Module):
         # mlps for denoising loss
         if self.loss_type in ["denoising", "both"]:
             if self._t is not None:
-                self._t = self._t.to(X.device)
-                _X = X - self._t.repeat(X.size(0), 1)
+                _X = X - self._t
             else:
                 _X = X
 
@@ -170,7 +188,9 @@ class ContrastiveDenoisingModel(nn.Module):
     ) -> Tuple[Optional[DenoiseMlp], Optional[DenoiseMlp]]:
         if self.use_cat_mlp:
             if self.cat_mlp_type == "single":
-                denoise_cat_mlp: Union[CatSingleMlp, CatMlpPerFeature] = CatSingleMlp(
+                denoise_cat_mlp: Union[
+                    CatSingleMlp, CatMlpPerFeature, CatGroupedMlp
+                ] = CatSingleMlp(
                     self.model.input_dim,
                     self.model.cat_embed_input,
                     self.model.column_idx,
@@ -183,18 +203,25 @@ class ContrastiveDenoisingModel(nn.Module):
                     self.model.column_idx,
                     self.denoise_mlps_activation,
                 )
+            elif self.cat_mlp_type == "grouped":
+                denoise_cat_mlp = CatGroupedMlp(
+                    self.model.input_dim,
+                    self.model.cat_embed_input,
+                    self.model.column_idx,
+                    self.denoise_mlps_activation,
+                )
         else:
             denoise_cat_mlp = None
 
         if self.model.continuous_cols is not None:
             if self.cont_mlp_type == "single":
-                denoise_cont_mlp: Union[ContSingleMlp, ContMlpPerFeature] = (
-                    ContSingleMlp(
-                        self.model.input_dim,
-                        self.model.continuous_cols,
-                        self.model.column_idx,
-                        self.denoise_mlps_activation,
-                    )
+                denoise_cont_mlp: Union[
+                    ContSingleMlp, ContMlpPerFeature, ContGroupedMlp
+                ] = ContSingleMlp(
+                    self.model.input_dim,
+                    self.model.continuous_cols,
+                    self.model.column_idx,
+                    self.denoise_mlps_activation,
                 )
             elif self.cont_mlp_type == "multiple":
                 denoise_cont_mlp = ContMlpPerFeature(
@@ -203,13 +230,22 @@ class ContrastiveDenoisingModel(nn.Module):
                     self.model.column_idx,
                     self.denoise_mlps_activation,
                 )
+            elif self.cont_mlp_type == "grouped":
+                denoise_cont_mlp = ContGroupedMlp(
+                    self.model.input_dim,
+                    self.model.continuous_cols,
+                    self.model.column_idx,
+                    self.denoise_mlps_activation,
+                )
         else:
             denoise_cont_mlp = None
 
         return denoise_cat_mlp, denoise_cont_mlp
 
     def _set_idx_to_substract(self, encoding_dict) -> Optional[Dict[str, int]]:
-        if self.cat_mlp_type == "multiple":
+        # with one MLP per feature the categories are encoded from 0 for
+        # every feature
+        if self.cat_mlp_type in ["multiple", "grouped"]:
             idx_to_substract: Optional[Dict[str, int]] = {
                 k: min(sorted(list(v.values()))) for k, v in encoding_dict.items()
             }
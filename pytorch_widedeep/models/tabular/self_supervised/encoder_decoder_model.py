@@ -38,6 +38,7 @@ class EncoderDecoderModel(nn.Module):
         encoder: ModelWithoutAttention,
         decoder: Optional[DecoderWithoutAttention],
         masked_prob: float,
+        seed: Optional[int] = None,
     ):
         super(EncoderDecoderModel, self).__init__()
 
@@ -47,7 +48,7 @@ class EncoderDecoderModel(nn.Module):
             self.decoder = self._build_decoder(encoder)
         else:
             self.decoder = decoder
-        self.masker = RandomObfuscator(p=masked_prob)
+        self.masker = RandomObfuscator(p=masked_prob, seed=seed)
 
         self.is_tabnet = isinstance(self.encoder, TabNet)
 
@@ -65,7 +66,7 @@ class EncoderDecoderModel(nn.Module):
             x_embed_rec = self.decoder(self.encoder(X))
         else:
             x_embed_rec = self.decoder(self.encoder(X))
-            mask = torch.ones(x_embed.shape).to(X.device)
+            mask = torch.ones_like(x_embed)
 
         return x_embed, x_embed_rec, mask
 
@@ -80,7 +81,7 @@ class EncoderDecoderModel(nn.Module):
         else:
             steps_out, _ = self.encoder(x_embed)
             x_embed_rec = self.decoder(steps_out)
-            mask = torch.ones(x_embed.shape).to(X.device)
+            mask = torch.ones_like(x_embed)
 
         return x_embed_rec, x_embed, mask
 
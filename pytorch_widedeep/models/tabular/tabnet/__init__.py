@@ -1,4 +1,5 @@
 from pytorch_widedeep.models.tabular.tabnet.tab_net import (
     TabNet,
     TabNetDecoder,
+    tabnet_inference_mode,
 )
@@ -45,9 +45,65 @@ class GBN(torch.nn.Module):
         self.bn = nn.BatchNorm1d(input_dim, momentum=momentum)
 
     def forward(self, X: Tensor) -> Tensor:
-        chunks = X.chunk(int(np.ceil(X.shape[0] / self.virtual_batch_size)), 0)
-        res = [self.bn(x_) for x_ in chunks]
-        return torch.cat(res, dim=0)
+        if not self.training:
+            # the running statistics are used, so the virtual batches make no
+            # difference
+            return self.bn(X)
+
+        # same virtual batches as 'X.chunk(n_chunks)': all of the same size
+        # except, possibly, the last one
+        n_chunks = int(np.ceil(X.shape[0] / self.virtual_batch_size))
+        chunk_size = int(np.ceil(X.shape[0] / n_chunks))
+        n_full = X.shape[0] // chunk_size
+
+        out, mean, var = self._ghost_batch_norm(
+            X[: n_full * chunk_size].view(n_full, chunk_size, -1)
+        )
+        if n_full * chunk_size < X.shape[0]:
+            out_tail, mean_tail, var_tail = self._ghost_batch_norm(
+                X[n_full * chunk_size :].unsqueeze(0)
+            )
+            out = torch.cat([out, out_tail])
+            mean, var = torch.cat([mean, mean_tail]), torch.cat([var, var_tail])
+
+        self._update_running_stats(mean, var)
+
+        return out
+
+    def _ghost_batch_norm(self, X: Tensor) -> Tuple[Tensor, Tensor, Tensor]:
+        # X: (n, c, d), i.e. n virtual batches of c rows. Each (virtual batch,
+        # feature) pair becomes a channel of a single sample, so that all
+        # virtual batches are normalised in one call
+        n, c, d = X.shape
+        x = X.permute(0, 2, 1).reshape(1, n * d, c)
+
+        # with momentum = 1 the 'running' statistics are those of the batch
+        mean, var = X.new_zeros(n * d), X.new_ones(n * d)
+        out = F.batch_norm(
+            x,
+            mean,
+            var,
+            self.bn.weight.repeat(n),
+            self.bn.bias.repeat(n),
+            True,
+            1.0,
+            self.bn.eps,
+        )
+        out = out.view(n, d, c).permute(0, 2, 1).reshape(n * c, d)
+
+        return out, mean.view(n, d), var.view(n, d)
+
+    def _update_running_stats(self, mean: Tensor, var: Tensor):
+        # the running statistics are updated as if 'self.bn' had been called
+        # once per virtual batch, in order: the i-th batch statistic, out of
+        # k, is weighted by m * (1 - m)^(k - 1 - i)
+        k, m = mean.shape[0], self.bn.momentum
+        weights = m * (1 - m) ** torch.arange(
+            k - 1, -1, -1, dtype=mean.dtype, device=mean.device
+        ).unsqueeze(1)
+        self.bn.running_mean.mul_((1 - m) ** k).add_((weights * mean).sum(0))
+        self.bn.running_var.mul_((1 - m) ** k).add_((weights * var).sum(0))
+        self.bn.num_batches_tracked.add_(k)
 
 
 class GLU_Layer(nn.Module):
@@ -206,14 +262,22 @@ class AttentiveTransformer(nn.Module):
             self.bn = nn.BatchNorm1d(output_dim, momentum=momentum)
 
         if mask_type == "sparsemax":
-            self.mask: Union[sparsemax.Sparsemax, sparsemax.Entmax15] = (
-                sparsemax.Sparsemax(dim=-1)
-            )
+            self.mask: Union[
+                sparsemax.Sparsemax,
+                sparsemax.Entmax15,
+                sparsemax.SparsemaxBisect,
+                sparsemax.Entmax15Bisect,
+            ] = sparsemax.Sparsemax(dim=-1)
         elif mask_type == "entmax":
             self.mask = sparsemax.Entmax15(dim=-1)
+        elif mask_type == "sparsemax_bisect":
+            self.mask = sparsemax.SparsemaxBisect(dim=-1)
+        elif mask_type == "entmax_bisect":
+            self.mask = sparsemax.Entmax15Bisect(dim=-1)
         else:
             raise NotImplementedError(
-                "Please choose either 'sparsemax' or 'entmax' as masktype"
+                "Please choose one of 'sparsemax', 'entmax', 'sparsemax_bisect' "
+                "or 'entmax_bisect' as masktype"
             )
 
     def forward(self, priors: Tensor, processed_feat: Tensor) -> Tensor:
@@ -248,6 +312,12 @@ class TabNetEncoder(nn.Module):
         self.gamma = gamma
         self.epsilon = epsilon
 
+        # inference options, see 'tabnet_inference_mode'
+        self.compute_sparsity_loss = True
+        self.store_masks = False
+        self.M_explain: Optional[Tensor] = None
+        self.masks: Optional[Dict[int, Tensor]] = None
+
         self.initial_bn = nn.BatchNorm1d(input_dim, momentum=0.01)
 
         params = {
@@ -307,6 +377,10 @@ class TabNetEncoder(nn.Module):
         # sparsity regularization
         M_loss = torch.FloatTensor([0.0]).to(x.device)
 
+        if self.store_masks:
+            M_explain = torch.zeros(x.shape).to(x.device)
+            masks: Dict[int, Tensor] = {}
+
         # split block
         attn = self.initial_splitter(x)[:, self.step_dim :]
 
@@ -320,43 +394,45 @@ class TabNetEncoder(nn.Module):
             prior = torch.mul(self.gamma - M, prior)
 
             # sparsity regularization
-            M_loss += torch.mean(
-                torch.sum(torch.mul(M, torch.log(M + self.epsilon)), dim=1)
-            )
+            if self.compute_sparsity_loss:
+                M_loss += torch.mean(
+                    torch.sum(torch.mul(M, torch.log(M + self.epsilon)), dim=1)
+                )
 
             # update attention and d_out
             masked_x = torch.mul(M, x)
             out = self.feat_transformers[step](masked_x)
             attn = out[:, self.step_dim :]
+            # 'decision contribution' in the paper
             d_out = nn.ReLU()(out[:, : self.step_dim])
             steps_output.append(d_out)
 
+            if self.store_masks:
+                masks[step] = M
+                # aggregate decision contribution
+                M_explain += torch.mul(M, torch.sum(d_out, dim=1).unsqueeze(dim=1))
+
         M_loss /= self.n_steps  # type: ignore[has-type]
 
+        if self.store_masks:
+            self.M_explain, self.masks = M_explain, masks
+
         return steps_output, M_loss
 
     def forward_masks(self, X: Tensor) -> Tuple[Tensor, Dict[int, Tensor]]:
-        x = self.initial_bn(X)
-
-        prior = torch.ones(x.shape).to(x.device)
-        M_explain = torch.zeros(x.shape).to(x.device)
-        attn = self.initial_splitter(x)[:, self.step_dim :]
-        masks = {}
-
-        for step in range(self.n_steps):
-            M = self.attn_transformers[step](prior, attn)
-            masks[step] = M
-
-            prior = torch.mul(self.gamma - M, prior)
-
-            masked_x = torch.mul(M, x)
-            out = self.feat_transformers[step](masked_x)
-            attn = out[:, self.step_dim :]
-            # 'decision contribution' in the paper
-            d_out = nn.ReLU()(out[:, : self.step_dim])
-
-            # aggregate decision contribution
-            agg_decision_contrib = torch.sum(d_out, dim=1)
-            M_explain += torch.mul(M, agg_decision_contrib.unsqueeze(dim=1))
-
-        return M_explain, masks
+        store_masks, compute_sparsity_loss = (
+            self.store_masks,
+            self.compute_sparsity_loss,
+        )
+        self.store_masks, self.compute_sparsity_loss = True, False
+        try:
+            self.forward(X)
+        finally:
+            self.store_masks, self.compute_sparsity_loss = (
+                store_masks,
+                compute_sparsity_loss,
+            )
+        M_explain, masks = self.M_explain, self.masks
+        if not store_masks:
+            self.M_explain, self.masks = None, None
+        return M_explain, masks  # type: ignore[return-value]
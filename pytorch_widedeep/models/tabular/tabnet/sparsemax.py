@@ -120,6 +120,75 @@ class Sparsemax(nn.Module):
         return sparsemax(input, self.dim)
 
 
+def _bisect_threshold(input, dim=-1, alpha_pow=1, n_iter=24):
+    """Finds, by bisection, the threshold tau such that sum(clamp(input -
+    tau, min=0) ** alpha_pow) = 1 along dim. The input is expected to be
+    max-shifted (i.e. its max along dim is 0), so that tau lies in [-1, 0).
+    After n_iter iterations the returned lower bound is within 2 ** -n_iter
+    of tau
+    """
+    tau = torch.full_like(input.narrow(dim, 0, 1), -1.0)
+    step = 1.0
+    for _ in range(n_iter):
+        step /= 2
+        tau_m = tau + step
+        z = torch.clamp(input - tau_m, min=0)
+        if alpha_pow == 2:
+            z = z * z
+        tau = torch.where(z.sum(dim=dim, keepdim=True) >= 1, tau_m, tau)
+    return tau
+
+
+class SparsemaxBisectFunction(SparsemaxFunction):
+    """
+    Sort-free sparsemax. The support is found by bisection over the
+    threshold, and the threshold is then computed exactly from the support,
+    so that the output is the same as that of `SparsemaxFunction` (up to
+    differences of order 2 ** -n_iter when two input values are closer than
+    that around the threshold). The backward pass is that of
+    `SparsemaxFunction`
+    """
+
+    @staticmethod
+    def forward(ctx, input, dim=-1, n_iter=24):
+        ctx.dim = dim
+        max_val, _ = input.max(dim=dim, keepdim=True)
+        input = input - max_val
+        tau, supp_size = SparsemaxBisectFunction._threshold_and_support(
+            input, dim=dim, n_iter=n_iter
+        )
+        output = torch.clamp(input - tau, min=0)
+        ctx.save_for_backward(supp_size, output)
+        return output
+
+    @staticmethod
+    def backward(ctx, grad_output):
+        grad_input, _ = SparsemaxFunction.backward(ctx, grad_output)
+        return grad_input, None, None
+
+    @staticmethod
+    def _threshold_and_support(input, dim=-1, n_iter=24):
+        support = input > _bisect_threshold(input, dim, 1, n_iter)
+        support_size = support.sum(dim=dim, keepdim=True)
+        tau = ((input * support).sum(dim=dim, keepdim=True) - 1) / support_size.to(
+            input.dtype
+        )
+        return tau, support_size
+
+
+sparsemax_bisect = SparsemaxBisectFunction.apply
+
+
+class SparsemaxBisect(nn.Module):
+    def __init__(self, dim=-1, n_iter=24):
+        self.dim = dim
+        self.n_iter = n_iter
+        super(SparsemaxBisect, self).__init__()
+
+    def forward(self, input):
+        return sparsemax_bisect(input, self.dim, self.n_iter)
+
+
 class Entmax15Function(Function):
     """
     An implementation of exact Entmax with alpha=1.5 (B. Peters, V. Niculae, A. Martins). See
@@ -181,3 +250,56 @@ class Entmax15(nn.Module):
 
     def forward(self, input):
         return entmax15(input, self.dim)
+
+
+class Entmax15BisectFunction(Entmax15Function):
+    """
+    Sort-free Entmax with alpha=1.5. As in `SparsemaxBisectFunction`, the
+    support is found by bisection and the threshold is then computed exactly
+    from it. The backward pass is that of `Entmax15Function`
+    """
+
+    @staticmethod
+    def forward(ctx, input, dim=-1, n_iter=24):
+        ctx.dim = dim
+
+        max_val, _ = input.max(dim=dim, keepdim=True)
+        input = input - max_val
+        input = input / 2
+
+        tau_star, _ = Entmax15BisectFunction._threshold_and_support(input, dim, n_iter)
+        output = torch.clamp(input - tau_star, min=0) ** 2
+        ctx.save_for_backward(output)
+        return output
+
+    @staticmethod
+    def backward(ctx, grad_output):
+        dX, _ = Entmax15Function.backward(ctx, grad_output)
+        return dX, None, None
+
+    @staticmethod
+    def _threshold_and_support(input, dim=-1, n_iter=24):
+        support = (input > _bisect_threshold(input, dim, 2, n_iter)).to(input.dtype)
+        support_size = support.sum(dim=dim, keepdim=True)
+
+        # same closed form as in the sort based version, restricted to the
+        # support: sum((input - tau) ** 2) = 1
+        mean = (input * support).sum(dim=dim, keepdim=True) / support_size
+        mean_sq = (input**2 * support).sum(dim=dim, keepdim=True) / support_size
+        ss = support_size * (mean_sq - mean**2)
+        delta = (1 - ss) / support_size
+        tau_star = mean - torch.sqrt(torch.clamp(delta, 0))
+        return tau_star, support_size.long()
+
+
+entmax15_bisect = Entmax15BisectFunction.apply
+
+
+class Entmax15Bisect(nn.Module):
+    def __init__(self, dim=-1, n_iter=24):
+        self.dim = dim
+        self.n_iter = n_iter
+        super(Entmax15Bisect, self).__init__()
+
+    def forward(self, input):
+        return entmax15_bisect(input, self.dim, self.n_iter)
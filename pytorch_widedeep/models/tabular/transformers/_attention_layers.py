@@ -95,36 +95,56 @@ class MultiHeadedAttention(nn.Module):
             nn.Linear(input_dim, query_dim, bias=use_bias) if n_heads > 1 else None
         )
 
-    def forward(self, X_Q: Tensor, X_KV: Optional[Tensor] = None) -> Tensor:
+        # see 'pytorch_widedeep.models.capture_attention_weights'
+        self.store_attn_weights = False
+        self.attn_weights: Optional[Tensor] = None
+
+    def forward(
+        self,
+        X_Q: Tensor,
+        X_KV: Optional[Tensor] = None,
+        kv: Optional[Tuple[Tensor, Tensor]] = None,
+        key_padding_mask: Optional[Tensor] = None,
+    ) -> Tensor:
+        # 'key_padding_mask' is a boolean tensor of shape (b, l) that is True
+        # for the keys that must be ignored (e.g. padding tokens)
+
         # b: batch size
         # s: seq length
         # l: target sequence length
         # m: used to refer indistinctively to s or l
         # h: number of attention heads,
         # d and e: head_dim
-        q = self.q_proj(X_Q)
-        X_KV = X_KV if X_KV is not None else X_Q
-        k, v = self.kv_proj(X_KV).chunk(2, dim=-1)
-        q, k, v = map(
-            lambda t: einops.rearrange(t, "b m (h d) -> b h m d", h=self.n_heads),
-            (q, k, v),
-        )
-
-        if self.use_flash_attention:
+        q = einops.rearrange(self.q_proj(X_Q), "b m (h d) -> b h m d", h=self.n_heads)
+        if kv is None:
+            kv = self.project_kv(X_KV if X_KV is not None else X_Q)
+        k, v = kv
+        # the queries can be shared by all observations in the batch (e.g. the
+        # latents in the TabPerceiver), in which case they are broadcast
+        q = q.expand(k.shape[0], -1, -1, -1)
+
+        if self.use_linear_attention:
+            attn_output = self._linear_attention(q, k, v, key_padding_mask)
+            self.attn_weights = None
+        elif self.store_attn_weights and not self.use_flash_attention:
+            self.attn_weights, attn_output = self._standard_attention(
+                q, k, v, key_padding_mask
+            )
+        else:
+            # the fused kernel never materializes the attention weights
             attn_output = F.scaled_dot_product_attention(
                 q,
                 k,
                 v,
-                attn_mask=None,
+                attn_mask=(
+                    ~key_padding_mask[:, None, None, :]
+                    if key_padding_mask is not None
+                    else None
+                ),
                 dropout_p=self.dropout_p if self.training else 0,
                 is_causal=False,
             )
-            self.attn_weights: Optional[Tensor] = None
-        elif self.use_linear_attention:
-            attn_output = self._linear_attention(q, k, v)
             self.attn_weights = None
-        else:
-            self.attn_weights, attn_output = self._standard_attention(q, k, v)
 
         output = einops.rearrange(attn_output, "b h s d -> b s (h d)", h=self.n_heads)
 
@@ -133,8 +153,23 @@ class MultiHeadedAttention(nn.Module):
 
         return output
 
+    def project_kv(self, X_KV: Tensor) -> Tuple[Tensor, Tensor]:
+        """Keys and values, in the '(b, h, m, d)' layout used by the
+        attention, so that they can be computed once and passed to
+        `forward` via the `kv` argument
+        """
+        k, v = self.kv_proj(X_KV).chunk(2, dim=-1)
+        return (
+            einops.rearrange(k, "b m (h d) -> b h m d", h=self.n_heads),
+            einops.rearrange(v, "b m (h d) -> b h m d", h=self.n_heads),
+        )
+
     def _standard_attention(
-        self, q: Tensor, k: Tensor, v: Tensor
+        self,
+        q: Tensor,
+        k: Tensor,
+        v: Tensor,
+        key_padding_mask: Optional[Tensor] = None,
     ) -> Tuple[Tensor, Tensor]:
         """'Standard' multihead attention implemenation from [Attention Is All You
         Need](https://arxiv.org/abs/1706.03762)
@@ -149,6 +184,10 @@ class MultiHeadedAttention(nn.Module):
         # Normalised Query, Key dot product + softmax. Fraction in brackets in
         # their Eq 1
         scores = einsum("b h s d, b h l d -> b h s l", q, k) / math.sqrt(self.head_dim)
+        if key_padding_mask is not None:
+            scores = scores.masked_fill(
+                key_padding_mask[:, None, None, :], float("-inf")
+            )
         attn_weights = scores.softmax(dim=-1)
 
         # Attention(Q, K, V ) (with dropout) in their Eq 1
@@ -159,7 +198,9 @@ class MultiHeadedAttention(nn.Module):
         return attn_weights, attn_output
 
     @staticmethod
-    def _linear_attention(q: Tensor, k: Tensor, v: Tensor) -> Tensor:
+    def _linear_attention(
+        q: Tensor, k: Tensor, v: Tensor, key_padding_mask: Optional[Tensor] = None
+    ) -> Tensor:
         """Liner attention implemenation from [Transformers are RNNs: Fast
         Autoregressive Transformers with Linear Attention]
         (https://arxiv.org/abs/2006.16236)
@@ -174,6 +215,11 @@ class MultiHeadedAttention(nn.Module):
             nn.functional.elu(q) + 1,
             nn.functional.elu(k) + 1,
         )
+        if key_padding_mask is not None:
+            # the masked keys and values do not contribute to the numerator
+            # or the denominator
+            k = k.masked_fill(key_padding_mask[:, None, :, None], 0.0)
+            v = v.masked_fill(key_padding_mask[:, None, :, None], 0.0)
 
         # Term within the summation in the numerator of their Eq 5
         scores = einsum("b h s e, b h l d -> b h e d", k, v)
@@ -226,6 +272,10 @@ class LinearAttentionLinformer(nn.Module):
             nn.Linear(input_dim, input_dim, bias=use_bias) if n_heads > 1 else None
         )
 
+        # see 'pytorch_widedeep.models.capture_attention_weights'
+        self.store_attn_weights = False
+        self.attn_weights: Optional[Tensor] = None
+
     def forward(self, X: Tensor) -> Tensor:
         # b: batch size
         # s: seq length
@@ -242,10 +292,20 @@ class LinearAttentionLinformer(nn.Module):
         k = einops.rearrange(k, "b k (h d) -> b h k d", d=self.head_dim)
         v = einops.rearrange(v, "b k (h d) -> b h k d", d=self.head_dim)
 
-        scores = einsum("b h s d, b h k d -> b h s k", q, k) / math.sqrt(self.head_dim)
-        attn_weights = scores.softmax(dim=-1)
-        self.attn_weights = attn_weights
-        output = einsum("b h s k, b h k d -> b h s d", self.dropout(attn_weights), v)
+        if self.store_attn_weights:
+            scores = einsum("b h s d, b h k d -> b h s k", q, k) / math.sqrt(
+                self.head_dim
+            )
+            attn_weights = scores.softmax(dim=-1)
+            self.attn_weights = attn_weights
+            output = einsum(
+                "b h s k, b h k d -> b h s d", self.dropout(attn_weights), v
+            )
+        else:
+            output = F.scaled_dot_product_attention(
+                q, k, v, dropout_p=self.dropout.p if self.training else 0
+            )
+            self.attn_weights = None
         output = einops.rearrange(output, "b h s d -> b s (h d)")
 
         if self.out_proj is not None:
@@ -291,6 +351,10 @@ class AdditiveAttention(nn.Module):
 
         self.r_out = nn.Linear(input_dim, input_dim)
 
+        # see 'pytorch_widedeep.models.capture_attention_weights'
+        self.store_attn_weights = False
+        self.attn_weights: Optional[Tuple[Tensor, Tensor]] = None
+
     def forward(self, X: Tensor) -> Tensor:
         # b: batch size
         # s: seq length
@@ -317,8 +381,12 @@ class AdditiveAttention(nn.Module):
         # for consistency with all other transformer-based models, rearrange
         # the attn_weights
         self.attn_weights = (
-            einops.rearrange(alphas, "b s h -> b h s"),
-            einops.rearrange(betas, "b s h -> b h s"),
+            (
+                einops.rearrange(alphas, "b s h -> b h s"),
+                einops.rearrange(betas, "b s h -> b h s"),
+            )
+            if self.store_attn_weights
+            else None
         )
 
         output = q + self.dropout(self.r_out(u))
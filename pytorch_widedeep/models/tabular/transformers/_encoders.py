@@ -1,7 +1,11 @@
+from functools import partial
+
+import torch
 import einops
+import torch.nn.functional as F
 from torch import nn
 
-from pytorch_widedeep.wdtypes import Tensor, Optional
+from pytorch_widedeep.wdtypes import Tuple, Tensor, Optional
 from pytorch_widedeep.models.tabular.transformers._attention_layers import (
     AddNorm,
     NormAdd,
@@ -41,8 +45,13 @@ class TransformerEncoder(nn.Module):
         self.attn_addnorm = AddNorm(input_dim, attn_dropout)
         self.ff_addnorm = AddNorm(input_dim, ff_dropout)
 
-    def forward(self, X: Tensor) -> Tensor:
-        x = self.attn_addnorm(X, self.attn)
+    def forward(self, X: Tensor, key_padding_mask: Optional[Tensor] = None) -> Tensor:
+        if key_padding_mask is None:
+            x = self.attn_addnorm(X, self.attn)
+        else:
+            x = self.attn_addnorm(
+                X, partial(self.attn, key_padding_mask=key_padding_mask)
+            )
         return self.ff_addnorm(x, self.ff)
 
 
@@ -57,10 +66,13 @@ class SaintEncoder(nn.Module):
         ff_factor: int,
         activation: str,
         n_feat: int,
+        row_attn_chunksize: Optional[int] = None,
     ):
         super(SaintEncoder, self).__init__()
 
         self.n_feat = n_feat
+        self.n_heads = n_heads
+        self.row_attn_chunksize = row_attn_chunksize
 
         self.col_attn = MultiHeadedAttention(
             input_dim,
@@ -87,15 +99,86 @@ class SaintEncoder(nn.Module):
         self.row_attn_addnorm = AddNorm(n_feat * input_dim, attn_dropout)
         self.row_attn_ff_addnorm = AddNorm(n_feat * input_dim, ff_dropout)
 
+        # keys and values of the reference rows for the row attention at
+        # inference, see 'set_row_attn_reference'
+        self.register_buffer("row_attn_kv", None, persistent=False)
+
     def forward(self, X: Tensor) -> Tensor:
-        x = self.col_attn_addnorm(X, self.col_attn)
-        x = self.col_attn_ff_addnorm(x, self.col_attn_ff)
-        x = einops.rearrange(x, "b n d -> 1 b (n d)")
-        x = self.row_attn_addnorm(x, self.row_attn)
+        x = self._col_attention(X)
+        x = self.row_attn_addnorm(x, self._row_attention)
         x = self.row_attn_ff_addnorm(x, self.row_attn_ff)
-        x = einops.rearrange(x, "1 b (n d) -> b n d", n=self.n_feat)
+        x = einops.rearrange(x, "b (n d) -> b n d", n=self.n_feat)
         return x
 
+    def set_row_attn_reference(self, X: Tensor) -> Tensor:
+        r"""Caches the keys and values of the row attention for a set of
+        reference rows, which, in eval mode, are then attended by the rows
+        in the batch instead of each other. Returns the output of the block
+        for the reference rows, which attend to the whole reference set
+        """
+        chunksize = (
+            self.row_attn_chunksize if self.row_attn_chunksize is not None else len(X)
+        )
+        x = torch.cat([self._col_attention(x_c) for x_c in X.split(chunksize)])
+
+        k, v = self.row_attn.kv_proj(x).chunk(2, dim=-1)
+        self.row_attn_kv = torch.stack(
+            [einops.rearrange(t, "r (h d) -> 1 h r d", h=self.n_heads) for t in (k, v)]
+        )
+
+        x = self.row_attn_addnorm(x, self._row_attention)
+        x = self.row_attn_ff_addnorm(x, self.row_attn_ff)
+        x = einops.rearrange(x, "b (n d) -> b n d", n=self.n_feat)
+        return x
+
+    def _col_attention(self, X: Tensor) -> Tensor:
+        x = self.col_attn_addnorm(X, self.col_attn)
+        x = self.col_attn_ff_addnorm(x, self.col_attn_ff)
+        return einops.rearrange(x, "b n d -> b (n d)")
+
+    def _row_attention(self, X: Tensor) -> Tensor:
+        if self.row_attn_kv is not None and not self.training:
+            return self._reference_row_attention(X)
+
+        b = X.shape[0]
+        if self.row_attn_chunksize is None or b <= self.row_attn_chunksize:
+            return self.row_attn(X.unsqueeze(0)).squeeze(0)
+
+        # the rows attend only to those within their own window of
+        # 'row_attn_chunksize' rows. The incomplete window, if any, goes
+        # first so that the attention weights kept are those of the rest
+        n_full = b // self.row_attn_chunksize * self.row_attn_chunksize
+        out = []
+        if n_full < b:
+            out.append(self.row_attn(X[n_full:].unsqueeze(0)).squeeze(0))
+        windows = einops.rearrange(
+            X[:n_full], "(w c) e -> w c e", c=self.row_attn_chunksize
+        )
+        out.insert(0, self.row_attn(windows).flatten(0, 1))
+        return torch.cat(out)
+
+    def _reference_row_attention(self, X: Tensor) -> Tensor:
+        # the output of each row depends only on the row itself and the
+        # reference rows, so the rows can be processed in chunks
+        k, v = self.row_attn_kv
+        chunksize = (
+            self.row_attn_chunksize if self.row_attn_chunksize is not None else len(X)
+        )
+        out = []
+        for x_c in X.split(chunksize):
+            q = einops.rearrange(
+                self.row_attn.q_proj(x_c), "b (h d) -> 1 h b d", h=self.n_heads
+            )
+            attn_output = F.scaled_dot_product_attention(q, k, v)
+            out.append(einops.rearrange(attn_output, "1 h b d -> b (h d)"))
+        output = torch.cat(out)
+
+        if self.row_attn.out_proj is not None:
+            output = self.row_attn.out_proj(output)
+        self.row_attn.attn_weights = None
+
+        return output
+
 
 class FTTransformerEncoder(nn.Module):
     def __init__(
@@ -169,12 +252,21 @@ class PerceiverEncoder(nn.Module):
         self.ff_norm = nn.LayerNorm(attn_dim_out)
         self.norm_ff_dropout = nn.Dropout(ff_dropout)
 
-    def forward(self, X_Q: Tensor, X_KV: Optional[Tensor] = None) -> Tensor:
+    def forward(
+        self,
+        X_Q: Tensor,
+        X_KV: Optional[Tensor] = None,
+        kv: Optional[Tuple[Tensor, Tensor]] = None,
+    ) -> Tensor:
         x = self.ln_q(X_Q)
-        y = None if X_KV is None else self.ln_kv(X_KV)
-        x = x + self.norm_attn_dropout(self.attn(x, y))
+        if kv is None and X_KV is not None:
+            kv = self.project_kv(X_KV)
+        x = x + self.norm_attn_dropout(self.attn(x, kv=kv))
         return x + self.norm_ff_dropout(self.ff(self.ff_norm(x)))
 
+    def project_kv(self, X_KV: Tensor) -> Tuple[Tensor, Tensor]:
+        return self.attn.project_kv(self.ln_kv(X_KV))
+
 
 class FastFormerEncoder(nn.Module):
     def __init__(
@@ -355,5 +355,9 @@ class FTTransformer(BaseTabularModelWithAttention):
         the batch size, $H$ is the number of attention heads, $F$ is the
         number of features/columns and $k$ is the reduced sequence length or
         dimension, i.e. $k = int(kv_{compression \space factor} \times s)$
+
+        :information_source: **NOTE**: the attention weights are only stored
+        for the forward passes run within the `capture_attention_weights`
+        context manager (see `pytorch_widedeep.models`)
         """
         return [blk.attn.attn_weights for blk in self.encoder]
@@ -1,3 +1,4 @@
+import torch
 from torch import nn
 
 from pytorch_widedeep.wdtypes import (
@@ -131,6 +132,14 @@ class SAINT(BaseTabularModelWithAttention):
     transformer_activation: str, default = "gelu"
         Transformer Encoder activation function. _'tanh'_, _'relu'_,
         _'leaky_relu'_, _'gelu'_, _'geglu'_ and _'reglu'_ are supported
+    row_attn_chunksize: int, Optional, default = None
+        If not `None`, the rows in a batch are split in windows of
+        `row_attn_chunksize` rows, and the row attention is computed within
+        each window. In this way, the memory required by the row attention
+        grows linearly (and not quadratically) with the batch size, so that
+        larger batches can be used. This is also the number of rows processed
+        at once when attending to a reference set of rows (see the
+        `set_row_attention_reference` method)
     mlp_hidden_dims: List, Optional, default = None
         List with the number of neurons per dense layer in the MLP. e.g:
         _[64, 32]_. If not provided no MLP on top of the final
@@ -212,6 +221,7 @@ class SAINT(BaseTabularModelWithAttention):
         ff_dropout: float = 0.2,
         ff_factor: int = 4,
         transformer_activation: str = "gelu",
+        row_attn_chunksize: Optional[int] = None,
         mlp_hidden_dims: Optional[List[int]] = None,
         mlp_activation: Optional[str] = None,
         mlp_dropout: Optional[float] = None,
@@ -249,6 +259,7 @@ class SAINT(BaseTabularModelWithAttention):
         self.ff_dropout = ff_dropout
         self.ff_factor = ff_factor
         self.transformer_activation = transformer_activation
+        self.row_attn_chunksize = row_attn_chunksize
 
         self.mlp_hidden_dims = mlp_hidden_dims
         self.mlp_activation = mlp_activation
@@ -277,6 +288,7 @@ class SAINT(BaseTabularModelWithAttention):
                     ff_factor,
                     transformer_activation,
                     self.n_feats,
+                    row_attn_chunksize,
                 ),
             )
 
@@ -317,6 +329,40 @@ class SAINT(BaseTabularModelWithAttention):
             x = self.mlp(x)
         return x
 
+    def set_row_attention_reference(self, X_ref: Tensor) -> None:
+        r"""Sets a fixed set of reference rows (for example, a sample of the
+        training rows) for the row attention. Once set, and while the model
+        is in eval mode, each row attends to the reference rows instead of
+        to the other rows in the batch. Therefore, the predictions for a
+        given row do not depend on the rest of the batch, and datasets of any
+        size (or single rows) can be scored with bounded memory.
+
+        The keys and values of the reference rows are computed and cached
+        for every block, so this method must be called again if the model is
+        trained further. The model is in eval mode when the method returns
+
+        Parameters
+        ----------
+        X_ref: Tensor
+            Input tensor with the reference rows, i.e. with the same format
+            as the input to the `forward` method
+        """
+        self.eval()
+        with torch.no_grad():
+            device = next(self.parameters()).device
+            x = self._get_embeddings(X_ref.to(device))
+            for blk in self.encoder:
+                # the rows in the reference set attend to the whole set
+                x = blk.set_row_attn_reference(x)  # type: ignore[operator]
+
+    def clear_row_attention_reference(self) -> None:
+        r"""Removes the reference rows for the row attention (see
+        `set_row_attention_reference`), so that the rows attend to the other
+        rows in the batch again
+        """
+        for blk in self.encoder:
+            blk.row_attn_kv = None
+
     @property
     def output_dim(self) -> int:
         r"""The output dimension of the model. This is a required property
@@ -341,7 +387,15 @@ class SAINT(BaseTabularModelWithAttention):
         - row attention: $(1, H, N, N)$
 
         where $N$ is the batch size, $H$ is the number of heads and $F$ is the
-        number of features/columns in the dataset
+        number of features/columns in the dataset. If `row_attn_chunksize` is
+        not `None`, the shape of the row attention weights is $(W, H, C, C)$,
+        where $W$ is the number of complete windows of $C$ rows. When
+        attending to a reference set of rows, the row attention weights are
+        not computed and are `None`
+
+        :information_source: **NOTE**: the attention weights are only stored
+        for the forward passes run within the `capture_attention_weights`
+        context manager (see `pytorch_widedeep.models`)
         """
         attention_weights = []
         for blk in self.encoder:
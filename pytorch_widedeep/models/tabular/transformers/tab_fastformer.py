@@ -373,9 +373,13 @@ class TabFastFormer(BaseTabularModelWithAttention):
         The shape of the attention weights is $(N, H, F)$ where $N$ is the
         batch size, $H$ is the number of attention heads and $F$ is the
         number of features/columns in the dataset
+
+        :information_source: **NOTE**: the attention weights are only stored
+        for the forward passes run within the `capture_attention_weights`
+        context manager (see `pytorch_widedeep.models`)
         """
         if self.share_weights:
-            attention_weights = [self.encoder[0].attn.attn_weight]
+            attention_weights = [self.encoder[0].attn.attn_weights]
         else:
             attention_weights = [blk.attn.attn_weights for blk in self.encoder]
         return attention_weights
@@ -1,5 +1,4 @@
 import torch
-import einops
 from torch import nn
 
 from pytorch_widedeep.wdtypes import (
@@ -342,15 +341,24 @@ class TabPerceiver(BaseTabularModelWithAttention):
     def forward(self, X: Tensor) -> Tensor:
         x_emb = self._get_embeddings(X)
 
-        x = einops.repeat(self.latents, "n d -> b n d", b=X.shape[0])
+        # the latents are the same for all observations, so they are not
+        # repeated along the batch dimension. Their projection (the queries
+        # of the first cross attention) is computed once and then broadcast
+        x = self.latents.unsqueeze(0)
 
+        # with shared weights, all perceiver blocks apply the same cross
+        # attention layers to the same embeddings, so their keys and values
+        # are computed only once
+        kvs: Dict[int, Tuple[Tensor, Tensor]] = {}
         for n in range(self.n_perceiver_blocks):
             cross_attns = self.encoder["perceiver_block" + str(n)]["cross_attns"]
             latent_transformer = self.encoder["perceiver_block" + str(n)][
                 "latent_transformer"
             ]
-            for cross_attn in cross_attns:
-                x = cross_attn(x, x_emb)
+            for i, cross_attn in enumerate(cross_attns):
+                if i not in kvs or not self.share_weights:
+                    kvs[i] = cross_attn.project_kv(x_emb)
+                x = cross_attn(x, kv=kvs[i])
             x = latent_transformer(x)
 
         # average along the latent index axis
@@ -389,6 +397,10 @@ class TabPerceiver(BaseTabularModelWithAttention):
         heads, $L$ is the number of Latents, $F$ is the number of
         features/columns in the dataset and $T$ is the number of Latent
         Attention heads
+
+        :information_source: **NOTE**: the attention weights are only stored
+        for the forward passes run within the `capture_attention_weights`
+        context manager (see `pytorch_widedeep.models`)
         """
         if self.share_weights:
             cross_attns = self.encoder["perceiver_block0"]["cross_attns"]
@@ -377,10 +377,10 @@ class TabTransformer(BaseTabularModelWithAttention):
         batch size, $H$ is the number of attention heads and $F$ is the
         number of features/columns in the dataset
 
-        :information_source: **NOTE**:
-        if flash attention or linear attention
-        are used, no attention weights are saved during the training process
-        and calling this property will throw a ValueError
+        :information_source: **NOTE**: the attention weights are only stored
+        for the forward passes run within the `capture_attention_weights`
+        context manager (see `pytorch_widedeep.models`). If flash attention
+        or linear attention are used, no attention weights are stored at all
         """
         if self.use_flash_attention or self.use_linear_attention:
             raise ValueError(
@@ -2,7 +2,7 @@ import warnings
 
 import torch
 
-from pytorch_widedeep.wdtypes import List, Tensor, Optional
+from pytorch_widedeep.wdtypes import List, Tuple, Tensor, Optional
 from pytorch_widedeep.utils.hf_utils import (
     get_model_class,
     get_config_and_model,
@@ -54,6 +54,14 @@ class HFModel(BaseWDModelComponent):
         Boolean indicating whether the order of the operations in the dense
         layer. If `True: [LIN -> ACT -> BN -> DP]`. If `False: [BN -> DP ->
         LIN -> ACT]`
+    dynamic_truncation: bool, default = False
+        Boolean indicating whether to drop, at every forward pass, the
+        trailing columns that are padding for all the sequences in the batch.
+        This way, batches of short texts do not pay for the padding up to the
+        tokenizer's `max_length`. Note that the results will differ from
+        those without truncation if `use_cls_token` is False, since the
+        padding tokens are included when computing the mean of the hidden
+        states
     verbose: bool, default = False
         If True, it will print information about the model
     **kwargs
@@ -86,6 +94,7 @@ class HFModel(BaseWDModelComponent):
         head_batchnorm: bool = False,
         head_batchnorm_last: bool = False,
         head_linear_first: bool = False,
+        dynamic_truncation: bool = False,
         verbose: bool = False,
         **kwargs,
     ):
@@ -102,6 +111,7 @@ class HFModel(BaseWDModelComponent):
         self.head_batchnorm = head_batchnorm
         self.head_batchnorm_last = head_batchnorm_last
         self.head_linear_first = head_linear_first
+        self.dynamic_truncation = dynamic_truncation
         self.verbose = verbose
         self.kwargs = kwargs
 
@@ -134,14 +144,31 @@ class HFModel(BaseWDModelComponent):
                 head_linear_first,
             )
 
-    def forward(self, X: Tensor) -> Tensor:
+    def forward(
+        self,
+        X: Tensor,
+        attention_mask: Optional[Tensor] = None,
+        lengths: Optional[Tensor] = None,
+    ) -> Tensor:
+        # the attention mask returned by the tokenizer can be passed alongside
+        # the input ids (see the 'HFPreprocessor' and the 'WideDeepDataset'),
+        # or built from the lengths of sequences padded at the end (ragged
+        # text inputs). If not, it is inferred from the model's padding index
+        if attention_mask is None and lengths is not None:
+            positions = torch.arange(X.shape[1], device=X.device)
+            attention_mask = (positions.unsqueeze(0) < lengths.unsqueeze(1)).type(
+                torch.int8
+            )
+        elif attention_mask is None:
+            pad_token_id = (
+                self.config.pad_token_id if self.config.pad_token_id is not None else 0
+            )
+            attention_mask = (X != pad_token_id).type(torch.int8)
 
-        # this is inefficient since the attention mask is returned by the
-        # tokenizer, but all models in this library use a forward pass that
-        # takes ONLY an input tensor. A fix will be addressed in a future
-        attn_mask = (X != 0).type(torch.int8)
+        if self.dynamic_truncation:
+            X, attention_mask = self._truncate(X, attention_mask)
 
-        output = self.model(input_ids=X, attention_mask=attn_mask, **self.kwargs)
+        output = self.model(input_ids=X, attention_mask=attention_mask, **self.kwargs)
 
         if self.output_attention_weights:
             # TO CONSIDER: attention weights as a returned object and not an
@@ -161,6 +188,13 @@ class HFModel(BaseWDModelComponent):
 
         return output
 
+    @staticmethod
+    def _truncate(X: Tensor, attention_mask: Tensor) -> Tuple[Tensor, Tensor]:
+        # position of the last column with at least one real token
+        is_real_col = attention_mask.bool().any(dim=0)
+        seq_len = int(is_real_col.nonzero().max()) + 1 if is_real_col.any() else 1
+        return X[:, :seq_len], attention_mask[:, :seq_len]
+
     @property
     def output_dim(self) -> int:
         return (
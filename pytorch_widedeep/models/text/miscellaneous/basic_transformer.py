@@ -1,10 +1,12 @@
 import math
 
 import torch
+import torch.nn.functional as F
 from torch import nn
 
 from pytorch_widedeep.wdtypes import Union, Tensor, Optional
 from pytorch_widedeep.utils.general_utils import alias
+from pytorch_widedeep.models.text.rnns._packing import lengths_to_mask
 from pytorch_widedeep.models.tabular.transformers._encoders import (
     TransformerEncoder,
 )
@@ -154,10 +156,20 @@ class Transformer(nn.Module):
                 ),
             )
 
-    def forward(self, X: Tensor) -> Tensor:
+    def forward(self, X: Tensor, lengths: Optional[Tensor] = None) -> Tensor:
+        # the lengths are passed for ragged text inputs (see the
+        # 'WideDeepDataset'), whose sequences are padded at the end only up to
+        # the longest sequence in the batch. They are padded up to
+        # 'seq_length' and the padding tokens are masked in the attention
+        key_padding_mask: Optional[Tensor] = None
+        if lengths is not None:
+            X = F.pad(X, (0, self.seq_length - X.shape[1]), value=self.padding_idx)
+            key_padding_mask = ~lengths_to_mask(lengths, self.seq_length)
+
         x = self.embedding(X.long())
         x = self.pos_encoder(x)
-        x = self.encoder(x)
+        for blk in self.encoder:
+            x = blk(x, key_padding_mask)
         if self.with_cls_token:
             x = x[:, 0, :]
         else:
@@ -1,7 +1,13 @@
+from functools import partial
+
 import torch
 from torch import nn
 
-from pytorch_widedeep.wdtypes import Tuple, Tensor
+from pytorch_widedeep.wdtypes import Tuple, Tensor, Optional
+from pytorch_widedeep.models.text.rnns._packing import (
+    run_packed_rnn,
+    lengths_to_mask,
+)
 from pytorch_widedeep.models.tabular.mlp._attention_layers import (
     ContextAttention,
 )
@@ -32,11 +38,20 @@ class ContextAttentionEncoder(nn.Module):
 
         self.attn = ContextAttention(input_dim, attn_dropout, sum_along_seq)
 
-    def forward(self, X: Tensor, h: Tensor, c: Tensor) -> Tuple[Tensor, Tensor, Tensor]:
-        if isinstance(self.rnn, nn.LSTM):
+    def forward(
+        self, X: Tensor, h: Tensor, c: Tensor, lengths: Optional[Tensor] = None
+    ) -> Tuple[Tensor, Tensor, Tensor]:
+        if lengths is not None and isinstance(self.rnn, (nn.LSTM, nn.GRU)):
+            o, h, c = run_packed_rnn(
+                self.rnn, X, lengths, (h, c) if isinstance(self.rnn, nn.LSTM) else h
+            )
+            mask: Optional[Tensor] = lengths_to_mask(lengths, X.shape[1])
+        elif isinstance(self.rnn, nn.LSTM):
             o, (h, c) = self.rnn(X, (h, c))
+            mask = None
         elif isinstance(self.rnn, nn.GRU):
             o, h = self.rnn(X, h)
+            mask = None
         else:
             raise ValueError(
                 "rnn should be either nn.LSTM or nn.GRU. Got {}".format(type(self.rnn))
@@ -45,9 +60,9 @@ class ContextAttentionEncoder(nn.Module):
         attn_inp = self._process_rnn_outputs(o, h)
 
         if self.with_addnorm:
-            out = self.attn_addnorm(attn_inp, self.attn)
+            out = self.attn_addnorm(attn_inp, partial(self.attn, mask=mask))
         else:
-            out = self.attn(attn_inp)
+            out = self.attn(attn_inp, mask)
 
         return out, c, h
 
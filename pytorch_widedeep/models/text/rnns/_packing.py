@@ -0,0 +1,64 @@
+import torch
+from torch import nn
+from torch.nn.utils.rnn import pad_packed_sequence, pack_padded_sequence
+
+from pytorch_widedeep.wdtypes import Tuple, Union, Tensor, Optional
+
+
+def left_align(X: Tensor, padding_idx: int) -> Tuple[Tensor, Tensor]:
+    r"""Moves the tokens of each sequence to the beginning of the row (so
+    that sequences padded at the beginning, as the `TextPreprocessor` does
+    by default, can be packed) and trims the columns that are padding for
+    all sequences.
+
+    Returns
+    -------
+    Tuple[Tensor, Tensor]
+        The aligned and trimmed sequences and the length of each sequence
+    """
+    is_pad = X == padding_idx
+    lengths = (~is_pad).sum(dim=1)
+
+    # a stable sort of the padding indicator moves the tokens to the front,
+    # keeping their order
+    order = torch.sort(is_pad.int(), dim=1, stable=True).indices
+    max_len = max(int(lengths.max()), 1) if X.shape[0] > 0 else 1
+
+    return X.gather(1, order[:, :max_len]), lengths
+
+
+def run_packed_rnn(
+    rnn: Union[nn.LSTM, nn.GRU],
+    X: Tensor,
+    lengths: Tensor,
+    hx: Optional[Union[Tensor, Tuple[Tensor, Tensor]]] = None,
+) -> Tuple[Tensor, Tensor, Optional[Tensor]]:
+    r"""Runs a (batch first) RNN over packed sequences, so that no
+    computation is spent on padding
+
+    Returns
+    -------
+    Tuple[Tensor, Tensor, Optional[Tensor]]
+        The output, padded with zeros to the input sequence length, the last
+        hidden state and, for LSTMs, the last cell state
+    """
+    # empty sequences are not allowed when packing
+    packed = pack_padded_sequence(
+        X, lengths.clamp(min=1).cpu(), batch_first=True, enforce_sorted=False
+    )
+
+    if isinstance(rnn, nn.LSTM):
+        o, (h, c) = rnn(packed, hx)
+    else:
+        o, h = rnn(packed, hx)
+        c = None
+
+    o, _ = pad_packed_sequence(o, batch_first=True, total_length=X.shape[1])
+
+    return o, h, c
+
+
+def lengths_to_mask(lengths: Tensor, max_len: int) -> Tensor:
+    # as in 'run_packed_rnn', empty sequences are treated as one token long
+    positions = torch.arange(max_len, device=lengths.device)
+    return positions.unsqueeze(0) < lengths.clamp(min=1).unsqueeze(1)
@@ -2,6 +2,7 @@ import numpy as np
 import torch
 
 from pytorch_widedeep.wdtypes import List, Tensor, Literal, Optional
+from pytorch_widedeep.models.text.rnns._packing import lengths_to_mask
 from pytorch_widedeep.models.tabular.mlp._layers import MLP
 from pytorch_widedeep.models.text.rnns.basic_rnn import BasicRNN
 from pytorch_widedeep.models.tabular.mlp._attention_layers import (
@@ -47,6 +48,17 @@ class AttentiveRNN(BasicRNN):
         `TextPreprocessor` class within this library uses fastai's
         tokenizer where the token index 0 is reserved for the _'unknown'_
         word token. Therefore, the default value is set to 1.
+    use_packed_sequences: bool, default = False
+        Boolean indicating whether to run the RNN over packed sequences
+        (see `torch.nn.utils.rnn.pack_padded_sequence`) so that no computation
+        is spent on the padding tokens. The length of each sequence is
+        inferred from `padding_idx`, and the sequences can be padded either
+        at the beginning or at the end. This works best combined with the
+        `DataLoaderBucketed` (see `pytorch_widedeep.dataloaders`), so that
+        the sequences in a batch have similar lengths. Note that if the
+        lengths of the sequences are passed to the forward pass (as it
+        happens when the text input is a `RaggedText` object) the sequences
+        are always packed
     attn_concatenate: bool, default = True
         Boolean indicating if the input to the attention mechanism will be the
         output of the RNN or the output of the RNN concatenated with the last
@@ -103,6 +115,7 @@ class AttentiveRNN(BasicRNN):
         bidirectional: bool = False,
         use_hidden_state: bool = True,
         padding_idx: int = 1,
+        use_packed_sequences: bool = False,
         attn_concatenate: bool = True,
         attn_dropout: float = 0.1,
         head_hidden_dims: Optional[List[int]] = None,
@@ -124,6 +137,7 @@ class AttentiveRNN(BasicRNN):
             bidirectional=bidirectional,
             use_hidden_state=use_hidden_state,
             padding_idx=padding_idx,
+            use_packed_sequences=use_packed_sequences,
             head_hidden_dims=head_hidden_dims,
             head_activation=head_activation,
             head_dropout=head_dropout,
@@ -160,7 +174,9 @@ class AttentiveRNN(BasicRNN):
                 head_linear_first,
             )
 
-    def _process_rnn_outputs(self, output: Tensor, hidden: Tensor) -> Tensor:
+    def _process_rnn_outputs(
+        self, output: Tensor, hidden: Tensor, lengths: Optional[Tensor] = None
+    ) -> Tensor:
         if self.attn_concatenate:
             if self.bidirectional:
                 bi_hidden = torch.cat((hidden[-2], hidden[-1]), dim=1)
@@ -174,13 +190,22 @@ class AttentiveRNN(BasicRNN):
         else:
             attn_inp = output
 
-        return self.attn(attn_inp)
+        # with packed sequences, the padding is not attended
+        mask = (
+            lengths_to_mask(lengths, output.shape[1]) if lengths is not None else None
+        )
+
+        return self.attn(attn_inp, mask)
 
     @property
-    def attention_weights(self) -> List:
-        r"""List with the attention weights
+    def attention_weights(self) -> Tensor:
+        r"""Tensor with the attention weights
 
         The shape of the attention weights is $(N, S)$, where $N$ is the batch
         size and $S$ is the length of the sequence
+
+        :information_source: **NOTE**: the attention weights are only stored
+        for the forward passes run within the `capture_attention_weights`
+        context manager (see `pytorch_widedeep.models`)
         """
         return self.attn.attn_weights
@@ -12,6 +12,10 @@ from pytorch_widedeep.wdtypes import (
     Literal,
     Optional,
 )
+from pytorch_widedeep.models.text.rnns._packing import (
+    left_align,
+    run_packed_rnn,
+)
 from pytorch_widedeep.models.tabular.mlp._layers import MLP
 from pytorch_widedeep.models._base_wd_model_component import (
     BaseWDModelComponent,
@@ -55,6 +59,17 @@ class BasicRNN(BaseWDModelComponent):
         `TextPreprocessor` class within this library uses fastai's tokenizer
         where the token index 0 is reserved for the _'unknown'_ word token.
         Therefore, the default value is set to 1.
+    use_packed_sequences: bool, default = False
+        Boolean indicating whether to run the RNN over packed sequences
+        (see `torch.nn.utils.rnn.pack_padded_sequence`) so that no computation
+        is spent on the padding tokens. The length of each sequence is
+        inferred from `padding_idx`, and the sequences can be padded either
+        at the beginning or at the end. This works best combined with the
+        `DataLoaderBucketed` (see `pytorch_widedeep.dataloaders`), so that
+        the sequences in a batch have similar lengths. Note that if the
+        lengths of the sequences are passed to the forward pass (as it
+        happens when the text input is a `RaggedText` object) the sequences
+        are always packed
     head_hidden_dims: List, Optional, default = None
         List with the sizes of the dense layers in the head e.g: _[128, 64]_
     head_activation: str, default = "relu"
@@ -105,6 +120,7 @@ class BasicRNN(BaseWDModelComponent):
         bidirectional: bool = False,
         use_hidden_state: bool = True,
         padding_idx: int = 1,
+        use_packed_sequences: bool = False,
         head_hidden_dims: Optional[List[int]] = None,
         head_activation: str = "relu",
         head_dropout: Optional[float] = None,
@@ -150,6 +166,7 @@ class BasicRNN(BaseWDModelComponent):
         self.bidirectional = bidirectional
         self.use_hidden_state = use_hidden_state
         self.padding_idx = padding_idx
+        self.use_packed_sequences = use_packed_sequences
 
         self.head_hidden_dims = head_hidden_dims
         self.head_activation = head_activation
@@ -202,7 +219,18 @@ class BasicRNN(BaseWDModelComponent):
             # simple hack to add readability in the forward pass
             self.rnn_mlp = nn.Identity()
 
-    def forward(self, X: Tensor) -> Tensor:
+    def forward(self, X: Tensor, lengths: Optional[Tensor] = None) -> Tensor:
+        # 'lengths' are passed alongside sequences padded at the end when
+        # using ragged text inputs (see the 'WideDeepDataset')
+        if lengths is None and self.use_packed_sequences:
+            X, lengths = left_align(X, self.padding_idx)
+
+        if lengths is not None:
+            embed = self.word_embed(X.long())
+            o, h, _ = run_packed_rnn(self.rnn, embed, lengths)
+            processed_outputs = self._process_rnn_outputs(o, h, lengths)
+            return self.rnn_mlp(processed_outputs)
+
         embed = self.word_embed(X.long())
 
         if self.rnn_type.lower() == "lstm":
@@ -259,15 +287,24 @@ class BasicRNN(BaseWDModelComponent):
 
         return word_embed, embed_dim
 
-    def _process_rnn_outputs(self, output: Tensor, hidden: Tensor) -> Tensor:
-        output = output.permute(1, 0, 2)
+    def _process_rnn_outputs(
+        self, output: Tensor, hidden: Tensor, lengths: Optional[Tensor] = None
+    ) -> Tensor:
+        if lengths is not None:
+            # the last output of packed sequences is at 'length - 1'
+            last_output = output[
+                torch.arange(output.shape[0], device=output.device),
+                lengths.clamp(min=1) - 1,
+            ]
+        else:
+            last_output = output.permute(1, 0, 2)[-1]
         if self.bidirectional:
             processed_outputs = (
                 torch.cat((hidden[-2], hidden[-1]), dim=1)
                 if self.use_hidden_state
-                else output[-1]
+                else last_output
             )
         else:
-            processed_outputs = hidden[-1] if self.use_hidden_state else output[-1]
+            processed_outputs = hidden[-1] if self.use_hidden_state else last_output
 
         return processed_outputs
@@ -13,6 +13,7 @@ from pytorch_widedeep.wdtypes import (
     Literal,
     Optional,
 )
+from pytorch_widedeep.models.text.rnns._packing import left_align
 from pytorch_widedeep.models.tabular.mlp._layers import MLP
 from pytorch_widedeep.models.text.rnns._encoders import ContextAttentionEncoder
 from pytorch_widedeep.models._base_wd_model_component import (
@@ -50,6 +51,17 @@ class StackedAttentiveRNN(BaseWDModelComponent):
         `TextPreprocessor` class within this library uses fastai's
         tokenizer where the token index 0 is reserved for the _'unknown'_
         word token. Therefore, the default value is set to 1.
+    use_packed_sequences: bool, default = False
+        Boolean indicating whether to run the RNN over packed sequences
+        (see `torch.nn.utils.rnn.pack_padded_sequence`) so that no computation
+        is spent on the padding tokens. The length of each sequence is
+        inferred from `padding_idx`, and the sequences can be padded either
+        at the beginning or at the end. This works best combined with the
+        `DataLoaderBucketed` (see `pytorch_widedeep.dataloaders`), so that
+        the sequences in a batch have similar lengths. Note that if the
+        lengths of the sequences are passed to the forward pass (as it
+        happens when the text input is a `RaggedText` object) the sequences
+        are always packed
     n_blocks: int, default = 3
         Number of attention blocks. Each block is comprised by an RNN and a
         Context Attention Encoder
@@ -109,6 +121,7 @@ class StackedAttentiveRNN(BaseWDModelComponent):
         hidden_dim: int = 64,
         bidirectional: bool = False,
         padding_idx: int = 1,
+        use_packed_sequences: bool = False,
         n_blocks: int = 3,
         attn_concatenate: bool = False,
         attn_dropout: float = 0.1,
@@ -149,6 +162,7 @@ class StackedAttentiveRNN(BaseWDModelComponent):
         self.hidden_dim = hidden_dim
         self.bidirectional = bidirectional
         self.padding_idx = padding_idx
+        self.use_packed_sequences = use_packed_sequences
 
         self.n_blocks = n_blocks
         self.attn_concatenate = attn_concatenate
@@ -222,7 +236,12 @@ class StackedAttentiveRNN(BaseWDModelComponent):
             # simple hack to add readability in the forward pass
             self.rnn_mlp = nn.Identity()
 
-    def forward(self, X: Tensor) -> Tensor:  # type: ignore
+    def forward(self, X: Tensor, lengths: Optional[Tensor] = None) -> Tensor:  # type: ignore
+        # 'lengths' are passed alongside sequences padded at the end when
+        # using ragged text inputs (see the 'WideDeepDataset')
+        if lengths is None and self.use_packed_sequences:
+            X, lengths = left_align(X, self.padding_idx)
+
         x = self.embed_proj(self.word_embed(X.long()))
 
         h = nn.init.zeros_(
@@ -238,7 +257,7 @@ class StackedAttentiveRNN(BaseWDModelComponent):
             c = None
 
         for blk in self.attention_blks:
-            x, h, c = blk(x, h, c)
+            x, h, c = blk(x, h, c, lengths)
 
         return self.rnn_mlp(x)
 
@@ -259,6 +278,10 @@ class StackedAttentiveRNN(BaseWDModelComponent):
 
         The shape of the attention weights is $(N, S)$ Where $N$ is the batch
         size and $S$ is the length of the sequence
+
+        :information_source: **NOTE**: the attention weights are only stored
+        for the forward passes run within the `capture_attention_weights`
+        context manager (see `pytorch_widedeep.models`)
         """
         return [blk.attn.attn_weights for blk in self.attention_blks]
 
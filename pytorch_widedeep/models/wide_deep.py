@@ -1,3 +1,4 @@
+import inspect
 import warnings
 
 import torch
@@ -384,10 +385,13 @@ class WideDeep(nn.Module):
     ) -> Tensor:
         if isinstance(component, nn.ModuleList):
             component_out = torch.add(  # type: ignore[call-overload]
-                *[cp(X[component_type][i]) for i, cp in enumerate(component)]
+                *[
+                    self._component_out(X, cp, component_type, i)
+                    for i, cp in enumerate(component)
+                ]
             )
         else:
-            component_out = component(X[component_type])
+            component_out = self._component_out(X, component, component_type)
 
         return wide_out.add_(component_out)
 
@@ -400,13 +404,68 @@ class WideDeep(nn.Module):
     ) -> Tensor:
         if isinstance(component, nn.ModuleList):
             component_out = torch.cat(  # type: ignore[call-overload]
-                [cp(X[component_type][i]) for i, cp in enumerate(component)], axis=1
+                [
+                    self._component_out(X, cp, component_type, i)
+                    for i, cp in enumerate(component)
+                ],
+                axis=1,
             )
         else:
-            component_out = component(X[component_type])
+            component_out = self._component_out(X, component, component_type)
 
         return torch.cat([deepside, component_out], axis=1)  # type: ignore[call-overload]
 
+    def _component_out(
+        self,
+        X: Dict[str, Union[Tensor, List[Tensor]]],
+        component: nn.Module,
+        component_type: Literal["deeptabular", "deeptext", "deepimage"],
+        idx: Optional[int] = None,
+    ) -> Tensor:
+        X_c = X[component_type] if idx is None else X[component_type][idx]
+
+        # the attention mask of the text inputs and the lengths of the ragged
+        # text inputs, if present (see the 'WideDeepDataset'), are handed to
+        # the text models
+        kwargs: Dict[str, Tensor] = {}
+        for suffix, arg_name in [("_mask", "attention_mask"), ("_lengths", "lengths")]:
+            arg = X.get(component_type + suffix)
+            if arg is not None and idx is not None:
+                arg = arg[idx]
+            if arg is not None and arg.numel() > 0:  # type: ignore[union-attr]
+                kwargs[arg_name] = arg  # type: ignore[assignment]
+        if not kwargs:
+            return component(X_c)
+
+        if isinstance(component, nn.Sequential):
+            # i.e. the text model followed by the prediction layer
+            self._check_forward_args(component[0], kwargs, component_type)
+            return component[1:](component[0](X_c, **kwargs))
+        self._check_forward_args(component, kwargs, component_type)
+        return component(X_c, **kwargs)
+
+    @staticmethod
+    def _check_forward_args(
+        model: nn.Module,
+        kwargs: Dict[str, Tensor],
+        component_type: Literal["deeptabular", "deeptext", "deepimage"],
+    ):
+        params = inspect.signature(model.forward).parameters
+        if any(p.kind == inspect.Parameter.VAR_KEYWORD for p in params.values()):
+            return
+        for arg_name in kwargs:
+            if arg_name not in params:
+                input_type = (
+                    "ragged text inputs"
+                    if arg_name == "lengths"
+                    else "text inputs with an attention mask"
+                )
+                raise ValueError(
+                    f"The {component_type} component ({model.__class__.__name__}) "
+                    f"does not support {input_type}: its forward method must "
+                    f"accept a '{arg_name}' argument"
+                )
+
     def _set_model_component(
         self,
         component: Union[BaseWDModelComponent, List[BaseWDModelComponent]],
@@ -1,4 +1,8 @@
-from typing import Any, List, Union, Optional
+import os
+import copy
+from typing import Any, List, Union, Iterable, Optional
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 
 import pandas as pd
 from sklearn.exceptions import NotFittedError
@@ -57,3 +61,77 @@ def check_is_fitted(
             raise NotFittedError(error_msg)
     elif not condition:
         raise NotFittedError(error_msg)
+
+
+def fit_chunks_in_parallel(
+    preprocessor: Any,
+    chunk_iterator: Iterable[pd.DataFrame],
+    n_jobs: int = -1,
+    template: Optional[Any] = None,
+) -> Any:
+    r"""Fits a 'Chunk' preprocessor (e.g. `ChunkTabPreprocessor`) over the
+    chunks yielded by `chunk_iterator` using a pool of processes.
+
+    Each chunk is fitted, independently, by a copy of the (unfitted)
+    preprocessor in one of the processes, which returns its partial state.
+    These partial states are then merged in the main process, in the same
+    order as the chunks are yielded. Once all chunks have been seen,
+    `n_chunks` is set to the number of chunks and the fitting process is
+    finalised.
+
+    The preprocessor must implement the `_partial_fit_state`, `_merge_state`
+    and `_finalize_fit` methods.
+
+    Parameters
+    ----------
+    preprocessor: Any
+        unfitted 'Chunk' preprocessor
+    chunk_iterator: Iterable
+        iterable of pandas dataframes, e.g. `pd.read_csv(fname,
+        chunksize=chunksize)`
+    n_jobs: int, default = -1
+        number of processes. If -1 all available CPUs will be used. If 1 the
+        chunks are fitted sequentially in the current process
+    template: Any, Optional, default = None
+        object to be copied and fitted in each process. If `None` the
+        preprocessor itself is used
+
+    Returns
+    -------
+    Any
+        the fitted preprocessor
+    """
+    if preprocessor.chunk_counter != 0:
+        raise ValueError(
+            "'fit_parallel' must be run on a preprocessor that has not been "
+            "(partially) fitted"
+        )
+
+    template = template if template is not None else copy.deepcopy(preprocessor)
+    n_jobs = os.cpu_count() if n_jobs == -1 else n_jobs  # type: ignore[assignment]
+
+    if n_jobs == 1:
+        for chunk in chunk_iterator:
+            preprocessor._merge_state(_fit_chunk(copy.deepcopy(template), chunk))
+    else:
+        with ProcessPoolExecutor(n_jobs) as executor:
+            # bound the number of chunks in flight so that only a few chunks
+            # are held in memory at any given time
+            pending: deque = deque()
+            for chunk in chunk_iterator:
+                pending.append(executor.submit(_fit_chunk, template, chunk))
+                if len(pending) >= 2 * n_jobs:
+                    preprocessor._merge_state(pending.popleft().result())
+            while pending:
+                preprocessor._merge_state(pending.popleft().result())
+
+    preprocessor.n_chunks = preprocessor.chunk_counter
+    preprocessor._finalize_fit()
+
+    return preprocessor
+
+
+def _fit_chunk(preprocessor: Any, chunk: pd.DataFrame) -> Any:
+    preprocessor._partial_fit_state(chunk)
+    preprocessor.chunk_counter = 1
+    return preprocessor
@@ -1,14 +1,19 @@
 import os
+import copy
+import atexit
 import warnings
-from typing import Any, Dict, List, Callable, Optional
+import threading
+import multiprocessing
+from typing import Any, Dict, List, Tuple, Union, Callable, Iterable, Optional
 from functools import partial
-from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import ThreadPoolExecutor
 
 import numpy as np
 import pandas as pd
 import numpy.typing as npt
 
 from pytorch_widedeep.utils.hf_utils import get_tokenizer
+from pytorch_widedeep.utils.fastai_transforms import partition
 from pytorch_widedeep.preprocessing.base_preprocessor import BasePreprocessor
 
 num_processes = os.cpu_count()
@@ -38,14 +43,19 @@ class HFPreprocessor(BasePreprocessor):
         method, this argument is not needed since the input text is passed
         directly to the `encode` method.
     num_workers: Optional[int], default = None
-        Number of workers to use when preprocessing the text data. If not
-        None, and `use_fast_tokenizer` is False, the text data will be
-        preprocessed in parallel using the number of workers specified. If
-        `use_fast_tokenizer` is True, this argument is ignored.
+        Number of workers to use when preprocessing and encoding the text
+        data. If not None, the texts are split in chunks of `chunksize`
+        texts that are encoded in parallel by the number of workers
+        specified. If `use_fast_tokenizer` is True the workers are threads
+        (the fast tokenizers release the GIL), otherwise they are processes
+        that are kept alive between calls
     preprocessing_rules: Optional[List[Callable[[str], str]]], default = None
         A list of functions to be applied to the text data before encoding.
         This can be useful to clean the text data before encoding. For
         example, removing html tags, special characters, etc.
+    chunksize: int, default = 1000
+        Number of texts passed to each call to the tokenizer's
+        `batch_encode_plus` method
     tokenizer_params: Optional[Dict[str, Any]], default = None
         Additional parameters to be passed to the HuggingFace's
         `PreTrainedTokenizer`. Parameters to the `PreTrainedTokenizer`
@@ -90,6 +100,7 @@ class HFPreprocessor(BasePreprocessor):
         root_dir: Optional[str] = None,
         num_workers: Optional[int] = None,
         preprocessing_rules: Optional[List[Callable[[str], str]]] = None,
+        chunksize: int = 1000,
         tokenizer_params: Optional[Dict[str, Any]] = None,
         encode_params: Optional[Dict[str, Any]] = None,
         **kwargs,
@@ -100,13 +111,10 @@ class HFPreprocessor(BasePreprocessor):
         self.root_dir = root_dir
         self.num_workers = num_workers
         self.preprocessing_rules = preprocessing_rules
+        self.chunksize = chunksize
         self.tokenizer_params = tokenizer_params if tokenizer_params is not None else {}
         self.encode_params = encode_params if encode_params is not None else {}
 
-        self._multiprocessing = (
-            num_workers is not None and num_workers > 1 and not use_fast_tokenizer
-        )
-
         if kwargs:
             self.tokenizer_params.update(kwargs)
 
@@ -120,17 +128,27 @@ class HFPreprocessor(BasePreprocessor):
         # attribute elsewhere in the library, we simply set it to True
         self.is_fitted = True
 
-    def encode(self, texts: List[str], **kwargs) -> npt.NDArray[np.int64]:
+    def encode(
+        self, texts: List[str], return_attention_mask: bool = False, **kwargs
+    ) -> Union[npt.NDArray[np.int32], Tuple[npt.NDArray[np.int32], ...]]:
         """
         Encodes a list of texts. The method is a wrapper around the
         `batch_encode_plus` method of the HuggingFace's tokenizer.
 
-        if 'use_fast_tokenizer' is True, the method will use the `batch_encode_plus`
+        The texts are encoded in chunks of `chunksize` texts (in parallel if
+        `num_workers` > 1) and the resulting input ids are written into a
+        single int32 array
 
         Parameters
         ----------
         texts: List[str]
             List of texts to be encoded
+        return_attention_mask: bool, default = False
+            Boolean indicating whether to also return the attention mask
+            returned by the tokenizer. The mask can be passed to the `Trainer`
+            alongside the encoded texts (under the _'X_text_mask'_ key of the
+            `X_train`, `X_val` or `X_test` dictionaries) so that the `HFModel`
+            does not have to infer it from the padding index
         **kwargs
             Additional parameters to be passed to the `batch_encode_plus` method
             of the HuggingFace's tokenizer. If the 'encode_params' dict was passed
@@ -139,47 +157,21 @@ class HFPreprocessor(BasePreprocessor):
 
         Returns
         -------
-        np.array
-            The encoded texts
+        np.array or Tuple[np.array, np.array]
+            The encoded texts, and the attention mask if
+            `return_attention_mask` is True
         """
         if kwargs:
             self.encode_params.update(kwargs)
 
-        if self.preprocessing_rules:
-            if self._multiprocessing:
-                texts = self._process_text_parallel(texts)
-            else:
-                texts = [self._preprocess_text(text) for text in texts]
-
-        if self._multiprocessing:
-            input_ids = self._encode_paralell(texts, **self.encode_params)
-        else:
-            encoded_texts = self.tokenizer.batch_encode_plus(
-                texts,
-                **self.encode_params,
-            )
-            input_ids = encoded_texts.get("input_ids")
+        input_ids, attention_mask = self._encode_batched(texts)
 
         self.is_fitted = True
 
-        try:
-            output = np.array(input_ids)
-        except ValueError:
-            warnings.warn(
-                "Padding and Truncating parameters were not passed and all input arrays "
-                "do not have the same shape. Padding to the longest sequence. "
-                "Padding will be done with the index of the pad token for the model",
-                UserWarning,
-            )
-            max_len = max([len(ids) for ids in input_ids])
-            output = np.array(
-                [
-                    np.pad(ids, (self.tokenizer.pad_token_id, max_len - len(ids)))
-                    for ids in input_ids
-                ]
-            )
+        if return_attention_mask:
+            return input_ids, attention_mask
 
-        return output
+        return input_ids
 
     def decode(
         self, input_ids: npt.NDArray[np.int64], skip_special_tokens: bool
@@ -230,7 +222,9 @@ class HFPreprocessor(BasePreprocessor):
             )
         return self
 
-    def transform(self, df: pd.DataFrame) -> npt.NDArray[np.int64]:
+    def transform(
+        self, df: pd.DataFrame, return_attention_mask: bool = False
+    ) -> Union[npt.NDArray[np.int32], Tuple[npt.NDArray[np.int32], ...]]:
         """
         Encodes the text data in the input dataframe. This method simply
         calls the `encode` method under the hood. Similar to the `fit` method,
@@ -242,11 +236,15 @@ class HFPreprocessor(BasePreprocessor):
         df: pd.DataFrame
             The dataframe containing the text data in the column specified by
             the 'text_col' parameter
+        return_attention_mask: bool, default = False
+            Boolean indicating whether to also return the attention mask. See
+            the `encode` method
 
         Returns
         -------
-        np.array
-            The encoded texts
+        np.array or Tuple[np.array, np.array]
+            The encoded texts, and the attention mask if
+            `return_attention_mask` is True
         """
         if self.text_col is None:
             raise ValueError(
@@ -256,9 +254,9 @@ class HFPreprocessor(BasePreprocessor):
 
         texts = self._read_texts(df, self.root_dir)
 
-        return self.encode(texts)
+        return self.encode(texts, return_attention_mask=return_attention_mask)
 
-    def transform_sample(self, text: str) -> npt.NDArray[np.int64]:
+    def transform_sample(self, text: str) -> npt.NDArray[np.int32]:
         """
         Encodes a single text sample.
 
@@ -279,7 +277,9 @@ class HFPreprocessor(BasePreprocessor):
             )
         return self.encode([text])[0]
 
-    def fit_transform(self, df: pd.DataFrame) -> npt.NDArray[np.int64]:
+    def fit_transform(
+        self, df: pd.DataFrame, return_attention_mask: bool = False
+    ) -> Union[npt.NDArray[np.int32], Tuple[npt.NDArray[np.int32], ...]]:
         """
         Encodes the text data in the input dataframe.
 
@@ -288,13 +288,17 @@ class HFPreprocessor(BasePreprocessor):
         df: pd.DataFrame
             The dataframe containing the text data in the column specified by
             the 'text_col' parameter
+        return_attention_mask: bool, default = False
+            Boolean indicating whether to also return the attention mask. See
+            the `encode` method
 
         Returns
         -------
-        np.array
-            The encoded texts
+        np.array or Tuple[np.array, np.array]
+            The encoded texts, and the attention mask if
+            `return_attention_mask` is True
         """
-        return self.fit(df).transform(df)
+        return self.fit(df).transform(df, return_attention_mask=return_attention_mask)
 
     def inverse_transform(
         self, input_ids: npt.NDArray[np.int64], skip_special_tokens: bool
@@ -317,27 +321,104 @@ class HFPreprocessor(BasePreprocessor):
         """
         return self.decode(input_ids, skip_special_tokens)
 
-    def _process_text_parallel(self, texts: List[str]) -> List[str]:
-        num_processes = (
-            self.num_workers if self.num_workers is not None else os.cpu_count()
+    def _encode_batched(self, texts: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        # the (already numpy) arrays are built here, from the python lists
+        encode_params = {
+            k: v for k, v in self.encode_params.items() if k != "return_tensors"
+        }
+
+        chunks = partition(texts, self.chunksize)
+        n_workers = self.num_workers if self.num_workers is not None else 1
+        if n_workers <= 1 or len(chunks) <= 1:
+            encoded_chunks: Iterable = map(
+                partial(
+                    _encode_chunk,
+                    self.tokenizer,
+                    self.preprocessing_rules,
+                    encode_params,
+                ),
+                chunks,
+            )
+            return self._to_arrays(encoded_chunks, len(texts))
+
+        if self.use_fast_tokenizer:
+            with ThreadPoolExecutor(
+                max_workers=n_workers,
+                initializer=_init_thread_tokenizer,
+                initargs=(self.tokenizer,),
+            ) as executor:
+                encoded_chunks = executor.map(
+                    partial(
+                        _encode_chunk_in_thread,
+                        self.preprocessing_rules,
+                        encode_params,
+                    ),
+                    chunks,
+                )
+                return self._to_arrays(encoded_chunks, len(texts))
+
+        pool = _get_encoder_pool(self.tokenizer, self.preprocessing_rules, n_workers)
+        encoded_chunks = pool.imap(
+            partial(_encode_chunk_in_worker, encode_params), chunks
+        )
+        return self._to_arrays(encoded_chunks, len(texts))
+
+    def _to_arrays(
+        self, encoded_chunks: Iterable, n_texts: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        # if all sequences are padded to 'max_length' the chunks can be
+        # written as they are encoded. Otherwise the width of the arrays is
+        # only known once all chunks have been encoded
+        if self.encode_params.get("padding") == "max_length" and self.encode_params.get(
+            "max_length"
+        ):
+            width = self.encode_params["max_length"]
+        else:
+            encoded_chunks = list(encoded_chunks)
+            width = max([_chunk_width(ids) for ids, _ in encoded_chunks], default=0)
+
+        pad_token_id = self.tokenizer.pad_token_id
+        input_ids = np.full(
+            (n_texts, width),
+            pad_token_id if pad_token_id is not None else 0,
+            dtype=np.int32,
         )
-        with ProcessPoolExecutor(max_workers=num_processes) as executor:
-            processed_texts = list(executor.map(self._preprocess_text, texts))
-        return processed_texts
+        attention_mask = np.zeros((n_texts, width), dtype=np.int32)
 
-    def _preprocess_text(self, text: str) -> str:
-        for rule in self.preprocessing_rules:
-            text = rule(text)
-        return text
+        start, ragged = 0, False
+        for ids, mask in encoded_chunks:
+            if isinstance(ids, np.ndarray) and ids.shape[1] == width:
+                input_ids[start : start + len(ids)] = ids
+                attention_mask[start : start + len(ids)] = mask
+            else:
+                ragged = ragged or isinstance(ids, list)
+                self._write_rows(input_ids, attention_mask, start, ids, mask)
+            start += len(ids)
 
-    def _encode_paralell(self, texts: List[str], **kwargs) -> List[List[int]]:
-        num_processes = (
-            self.num_workers if self.num_workers is not None else os.cpu_count()
-        )
-        ptokenizer = partial(self.tokenizer.encode, **kwargs)
-        with ProcessPoolExecutor(max_workers=num_processes) as executor:
-            encoded_texts = list(executor.map(ptokenizer, texts))
-        return encoded_texts
+        if ragged:
+            warnings.warn(
+                "Padding and Truncating parameters were not passed and all input arrays "
+                "do not have the same shape. Padding to the longest sequence. "
+                "Padding will be done with the index of the pad token for the model",
+                UserWarning,
+            )
+
+        return input_ids, attention_mask
+
+    def _write_rows(
+        self,
+        input_ids: np.ndarray,
+        attention_mask: np.ndarray,
+        start: int,
+        ids: List,
+        mask: List,
+    ):
+        pad_left = self.tokenizer.padding_side == "left"
+        for i, (row_ids, row_mask) in enumerate(zip(ids, mask)):
+            row = slice(-len(row_ids), None) if pad_left else slice(0, len(row_ids))
+            if len(row_ids) > 0:
+                input_ids[start + i, row] = row_ids
+                attention_mask[start + i, row] = row_mask
 
     def _read_texts(
         self, df: pd.DataFrame, root_dir: Optional[str] = None
@@ -361,11 +442,130 @@ class HFPreprocessor(BasePreprocessor):
         return (
             f"HFPreprocessor(text_col={self.text_col}, model_name={self.model_name}, "
             f"use_fast_tokenizer={self.use_fast_tokenizer}, num_workers={self.num_workers}, "
-            f"preprocessing_rules={self.preprocessing_rules}, tokenizer_params={self.tokenizer_params}, "
+            f"preprocessing_rules={self.preprocessing_rules}, chunksize={self.chunksize}, "
+            f"tokenizer_params={self.tokenizer_params}, "
             f"encode_params={self.encode_params})"
         )
 
 
+def _preprocess_texts(
+    texts: List[str], preprocessing_rules: Optional[List[Callable[[str], str]]]
+) -> List[str]:
+    if not preprocessing_rules:
+        return texts
+    processed_texts = []
+    for text in texts:
+        for rule in preprocessing_rules:
+            text = rule(text)
+        processed_texts.append(text)
+    return processed_texts
+
+
+def _encode_chunk(
+    tokenizer: Any,
+    preprocessing_rules: Optional[List[Callable[[str], str]]],
+    encode_params: Dict[str, Any],
+    texts: List[str],
+) -> Tuple[Any, Any]:
+    encoded_texts = tokenizer.batch_encode_plus(
+        _preprocess_texts(texts, preprocessing_rules), **encode_params
+    )
+    input_ids = encoded_texts["input_ids"]
+    attention_mask = encoded_texts.get("attention_mask")
+    if attention_mask is None:
+        attention_mask = [[1] * len(ids) for ids in input_ids]
+
+    # when all sequences have the same length, arrays are cheaper to send
+    # between processes and to write into the output arrays
+    if len(set(len(ids) for ids in input_ids)) == 1:
+        return (
+            np.asarray(input_ids, dtype=np.int32),
+            np.asarray(attention_mask, dtype=np.int32),
+        )
+    return input_ids, attention_mask
+
+
+def _chunk_width(ids: Any) -> int:
+    if isinstance(ids, np.ndarray):
+        return ids.shape[1]
+    return max([len(row_ids) for row_ids in ids], default=0)
+
+
+# each thread encodes with its own copy of the (fast) tokenizer, since the
+# rust tokenizers can not be mutably borrowed by two threads at a time
+_thread_tokenizer = threading.local()
+
+
+def _init_thread_tokenizer(tokenizer: Any):
+    _thread_tokenizer.tokenizer = copy.deepcopy(tokenizer)
+
+
+def _encode_chunk_in_thread(
+    preprocessing_rules: Optional[List[Callable[[str], str]]],
+    encode_params: Dict[str, Any],
+    texts: List[str],
+) -> Tuple[Any, Any]:
+    return _encode_chunk(
+        _thread_tokenizer.tokenizer, preprocessing_rules, encode_params, texts
+    )
+
+
+# A single pool of processes is kept alive between calls, so the tokenizer
+# (and the preprocessing rules) are sent once to each process instead of
+# with every text
+_encoder_pool: Dict[str, Any] = {}
+_worker_encoder: Dict[str, Any] = {}
+
+
+def _init_encoder_worker(
+    tokenizer: Any, preprocessing_rules: Optional[List[Callable[[str], str]]]
+):
+    _worker_encoder["tokenizer"] = tokenizer
+    _worker_encoder["preprocessing_rules"] = preprocessing_rules
+
+
+def _encode_chunk_in_worker(
+    encode_params: Dict[str, Any], texts: List[str]
+) -> Tuple[Any, Any]:
+    return _encode_chunk(
+        _worker_encoder["tokenizer"],
+        _worker_encoder["preprocessing_rules"],
+        encode_params,
+        texts,
+    )
+
+
+def _get_encoder_pool(
+    tokenizer: Any,
+    preprocessing_rules: Optional[List[Callable[[str], str]]],
+    num_workers: int,
+) -> Any:
+    setup = (tuple(preprocessing_rules or []), num_workers)
+    if _encoder_pool.get("tokenizer") is not tokenizer or (
+        _encoder_pool.get("setup") != setup
+    ):
+        _close_encoder_pool()
+        _encoder_pool["pool"] = multiprocessing.Pool(
+            num_workers,
+            initializer=_init_encoder_worker,
+            initargs=(tokenizer, preprocessing_rules),
+        )
+        _encoder_pool["tokenizer"] = tokenizer
+        _encoder_pool["setup"] = setup
+    return _encoder_pool["pool"]
+
+
+def _close_encoder_pool():
+    pool = _encoder_pool.pop("pool", None)
+    _encoder_pool.pop("tokenizer", None)
+    _encoder_pool.pop("setup", None)
+    if pool is not None:
+        pool.terminate()
+
+
+atexit.register(_close_encoder_pool)
+
+
 class ChunkHFPreprocessor(HFPreprocessor):
     """Text processor to prepare the ``deeptext`` input dataset that is a
     wrapper around HuggingFace's tokenizers.
@@ -395,14 +595,19 @@ class ChunkHFPreprocessor(HFPreprocessor):
     use_fast_tokenizer: bool, default = False
         Whether to use the fast tokenizer from HuggingFace or not
     num_workers: Optional[int], default = None
-        Number of workers to use when preprocessing the text data. If not
-        None, and `use_fast_tokenizer` is False, the text data will be
-        preprocessed in parallel using the number of workers specified. If
-        `use_fast_tokenizer` is True, this argument is ignored.
+        Number of workers to use when preprocessing and encoding the text
+        data. If not None, the texts are split in chunks of `chunksize`
+        texts that are encoded in parallel by the number of workers
+        specified. If `use_fast_tokenizer` is True the workers are threads
+        (the fast tokenizers release the GIL), otherwise they are processes
+        that are kept alive between calls
     preprocessing_rules: Optional[List[Callable[[str], str]]], default = None
         A list of functions to be applied to the text data before encoding.
         This can be useful to clean the text data before encoding. For
         example, removing html tags, special characters, etc.
+    chunksize: int, default = 1000
+        Number of texts passed to each call to the tokenizer's
+        `batch_encode_plus` method
     tokenizer_params: Optional[Dict[str, Any]], default = None
         Additional parameters to be passed to the HuggingFace's
         `PreTrainedTokenizer`.
@@ -433,6 +638,7 @@ class ChunkHFPreprocessor(HFPreprocessor):
         use_fast_tokenizer: bool = True,
         num_workers: Optional[int] = None,
         preprocessing_rules: Optional[List[Callable[[str], str]]] = None,
+        chunksize: int = 1000,
         tokenizer_params: Optional[Dict[str, Any]] = None,
         encode_params: Optional[Dict[str, Any]] = None,
     ):
@@ -442,6 +648,7 @@ class ChunkHFPreprocessor(HFPreprocessor):
             text_col=text_col,
             num_workers=num_workers,
             preprocessing_rules=preprocessing_rules,
+            chunksize=chunksize,
             tokenizer_params=tokenizer_params,
             encode_params=encode_params,
         )
@@ -469,6 +676,7 @@ class ChunkHFPreprocessor(HFPreprocessor):
         return (
             f"ChunkHFPreprocessor(text_col={self.text_col}, model_name={self.model_name}, "
             f"use_fast_tokenizer={self.use_fast_tokenizer}, num_workers={self.num_workers}, "
-            f"preprocessing_rules={self.preprocessing_rules}, tokenizer_params={self.tokenizer_params}, "
+            f"preprocessing_rules={self.preprocessing_rules}, chunksize={self.chunksize}, "
+            f"tokenizer_params={self.tokenizer_params}, "
             f"encode_params={self.encode_params}, root_dir={self.root_dir})"
         )
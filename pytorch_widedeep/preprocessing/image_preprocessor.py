@@ -1,4 +1,6 @@
-from typing import List
+import os
+from typing import Set, List, Tuple, Optional
+from concurrent.futures import ThreadPoolExecutor
 
 import cv2
 import numpy as np
@@ -16,7 +18,10 @@ class ImagePreprocessor(BasePreprocessor):
     r"""Preprocessor to prepare the ``deepimage`` input dataset.
 
     The Preprocessing consists simply on resizing according to their
-    aspect ratio
+    aspect ratio. Images are read and resized in parallel using a pool of
+    threads and written, one chunk at a time, into a preallocated `uint8`
+    array (or memory-mapped file) of shape `(n_images, height, width, 3)`.
+    Therefore, at no point all the original images are held in memory.
 
     Parameters
     ----------
@@ -30,6 +35,21 @@ class ImagePreprocessor(BasePreprocessor):
         width of the resulting processed image.
     verbose: int, default 1
         Enable verbose output.
+    n_cpus: int, Optional, default = None
+        number of threads used to read and resize the images. If `None`
+        `os.cpu_count()` threads will be used.
+    memmap_path: str, Optional, default = None
+        If not `None`, path to a `.npy` file where the resized images will be
+        written as a memory-mapped array (see `numpy.lib.format.open_memmap`).
+        The `transform` method will then return the memory-mapped array,
+        which can be loaded later via `np.load(memmap_path, mmap_mode="r")`.
+        This is useful for image datasets that do not fit in memory. A file
+        is never overwritten by the same preprocessor once its array has
+        been returned. Therefore, subsequent calls to `transform` (e.g. for a
+        test set) write to a new file, named after `memmap_path` with a
+        numeric suffix (e.g. _'images_1.npy'_), unless they are passed their
+        own `memmap_path`. The path of the file is available through the
+        `filename` attribute of the returned array.
 
     Attributes
     ----------
@@ -39,7 +59,9 @@ class ImagePreprocessor(BasePreprocessor):
         an instance of `pytorch_widedeep.utils.image_utils.SimplePreprocessor`
     normalise_metrics: Dict
         Dict containing the normalisation metrics of the image dataset, i.e.
-        mean and std for the R, G and B channels
+        mean and std for the R, G and B channels. These are computed
+        incrementally, as the images are processed, using Welford's
+        (or Chan's parallel) algorithm.
 
     Examples
     --------
@@ -70,6 +92,8 @@ class ImagePreprocessor(BasePreprocessor):
         width: int = 224,
         height: int = 224,
         verbose: int = 1,
+        n_cpus: Optional[int] = None,
+        memmap_path: Optional[str] = None,
     ):
         super(ImagePreprocessor, self).__init__()
 
@@ -78,6 +102,9 @@ class ImagePreprocessor(BasePreprocessor):
         self.width = width
         self.height = height
         self.verbose = verbose
+        self.n_cpus = n_cpus if n_cpus is not None else os.cpu_count()
+        self.memmap_path = memmap_path
+        self._memmap_paths_returned: Set[str] = set()
 
         self.aap = AspectAwarePreprocessor(self.width, self.height)
         self.spp = SimplePreprocessor(self.width, self.height)
@@ -97,7 +124,9 @@ class ImagePreprocessor(BasePreprocessor):
             resized_img = self.spp.preprocess(img)
         return resized_img
 
-    def transform(self, df: pd.DataFrame) -> np.ndarray:
+    def transform(
+        self, df: pd.DataFrame, memmap_path: Optional[str] = None
+    ) -> np.ndarray:
         """Resizes the images to the input height and width.
 
 
@@ -105,6 +134,12 @@ class ImagePreprocessor(BasePreprocessor):
         ----------
         df: pd.DataFrame
             Input pandas dataframe with the `img_col`
+        memmap_path: str, Optional, default = None
+            path to the `.npy` file where the resized images will be written
+            as a memory-mapped array. If `None`, the `memmap_path` passed to
+            the constructor is used, if any (with a numeric suffix if its
+            array has already been returned). The file cannot be one whose
+            array has already been returned by this preprocessor
 
         Returns
         -------
@@ -113,70 +148,134 @@ class ImagePreprocessor(BasePreprocessor):
         """
         image_list = df[self.img_col].tolist()
         if self.verbose:
-            print("Reading Images from {}".format(self.img_path))
-        imgs = [cv2.imread("/".join([self.img_path, img])) for img in image_list]
+            print("Reading and resizing images from {}".format(self.img_path))
 
-        # finding images with different height and width
-        aspect = [(im.shape[0], im.shape[1]) for im in imgs]
-        aspect_r = [a[0] / a[1] for a in aspect]
-        diff_idx = [i for i, r in enumerate(aspect_r) if r != 1.0]
+        resized_imgs = self._allocate_output(
+            len(image_list),
+            memmap_path if memmap_path is not None else self._default_memmap_path(),
+        )
 
-        if self.verbose:
-            print("Resizing")
-        resized_imgs = []
-        for i, img in tqdm(enumerate(imgs), total=len(imgs), disable=self.verbose != 1):
-            if i in diff_idx:
-                resized_imgs.append(self.aap.preprocess(img))
-            else:
-                # if aspect ratio is 1:1, no need for AspectAwarePreprocessor
-                resized_imgs.append(self.spp.preprocess(img))
-
-        if not self.compute_normalising_computed:
-            if self.verbose:
-                print("Computing normalisation metrics")
+        compute_normalising_metrics = not self.compute_normalising_computed
+        if compute_normalising_metrics:
+            # per channel (B, G, R) number of pixels, mean and sum of squared
+            # differences from the mean
+            n_pixels, mean, m2 = 0, np.zeros(3), np.zeros(3)
+
+        # images are processed in chunks so that the number of decoded
+        # images waiting to be written is bounded
+        chunk_size = 16 * self.n_cpus  # type: ignore[operator]
+        with ThreadPoolExecutor(max_workers=self.n_cpus) as executor, tqdm(
+            total=len(image_list), disable=self.verbose != 1
+        ) as pbar:
+            for start in range(0, len(image_list), chunk_size):
+                chunk = image_list[start : start + chunk_size]
+                for i, rsz_img in enumerate(
+                    executor.map(self._read_and_resize, chunk), start=start
+                ):
+                    resized_imgs[i] = rsz_img
+                    if compute_normalising_metrics:
+                        n_pixels, mean, m2 = self._update_channel_stats(
+                            rsz_img, n_pixels, mean, m2
+                        )
+                pbar.update(len(chunk))
+
+        if isinstance(resized_imgs, np.memmap):
+            resized_imgs.flush()
+
+        if compute_normalising_metrics:
             # mean and std deviation will only be computed when the fit method
             # is called
-            mean_R, mean_G, mean_B = [], [], []
-            std_R, std_G, std_B = [], [], []
-            for rsz_img in resized_imgs:
-                (mean_b, mean_g, mean_r), (std_b, std_g, std_r) = cv2.meanStdDev(
-                    rsz_img
-                )
-                mean_R.append(mean_r)
-                mean_G.append(mean_g)
-                mean_B.append(mean_b)
-                std_R.append(std_r)
-                std_G.append(std_g)
-                std_B.append(std_b)
+            std = np.sqrt(m2 / max(n_pixels, 1))
+            (mean_b, mean_g, mean_r), (std_b, std_g, std_r) = mean, std
             self.normalise_metrics = dict(
                 mean={
-                    "R": np.mean(mean_R) / 255.0,
-                    "G": np.mean(mean_G) / 255.0,
-                    "B": np.mean(mean_B) / 255.0,
+                    "R": mean_r / 255.0,
+                    "G": mean_g / 255.0,
+                    "B": mean_b / 255.0,
                 },
                 std={
-                    "R": np.mean(std_R) / 255.0,
-                    "G": np.mean(std_G) / 255.0,
-                    "B": np.mean(std_B) / 255.0,
+                    "R": std_r / 255.0,
+                    "G": std_g / 255.0,
+                    "B": std_b / 255.0,
                 },
             )
             self.compute_normalising_computed = True
-        return np.asarray(resized_imgs)
+        return resized_imgs
+
+    def _read_and_resize(self, img_name: str) -> np.ndarray:
+        # cv2 releases the GIL when decoding and resizing, so these run
+        # concurrently in the thread pool
+        img = cv2.imread("/".join([self.img_path, img_name]))
+        return self.transform_sample(img)
+
+    def _default_memmap_path(self) -> Optional[str]:
+        # the constructor path is used for the first array and, after that,
+        # the same path with a numeric suffix, so that the arrays already
+        # returned are not overwritten
+        if self.memmap_path is None:
+            return None
+        root, ext = os.path.splitext(self.memmap_path)
+        path, suffix = self.memmap_path, 0
+        while os.path.abspath(path) in self._memmap_paths_returned:
+            suffix += 1
+            path = f"{root}_{suffix}{ext}"
+        return path
+
+    def _allocate_output(self, n_images: int, memmap_path: Optional[str]) -> np.ndarray:
+        shape = (n_images, self.height, self.width, 3)
+        if memmap_path is not None:
+            # re-opening the file in 'w+' mode would truncate it under the
+            # memory-mapped arrays already returned
+            abs_path = os.path.abspath(memmap_path)
+            if abs_path in self._memmap_paths_returned:
+                raise ValueError(
+                    f"The images have already been written to '{memmap_path}' "
+                    "and the returned array would be overwritten. Please pass a "
+                    "different 'memmap_path' to the 'transform' method"
+                )
+            self._memmap_paths_returned.add(abs_path)
+            return np.lib.format.open_memmap(
+                memmap_path, mode="w+", dtype="uint8", shape=shape
+            )
+        return np.empty(shape, dtype="uint8")
+
+    @staticmethod
+    def _update_channel_stats(
+        img: np.ndarray, n_pixels: int, mean: np.ndarray, m2: np.ndarray
+    ) -> Tuple[int, np.ndarray, np.ndarray]:
+        # Chan et al. parallel version of Welford's algorithm, merging the
+        # running statistics with those of a new image
+        img_mean, img_std = cv2.meanStdDev(img)
+        img_mean, img_m2 = img_mean.ravel(), img_std.ravel() ** 2
+        img_n_pixels = img.shape[0] * img.shape[1]
+        img_m2 = img_m2 * img_n_pixels
+
+        new_n_pixels = n_pixels + img_n_pixels
+        delta = img_mean - mean
+        mean = mean + delta * img_n_pixels / new_n_pixels
+        m2 = m2 + img_m2 + delta**2 * n_pixels * img_n_pixels / new_n_pixels
+
+        return new_n_pixels, mean, m2
 
-    def fit_transform(self, df: pd.DataFrame) -> np.ndarray:
+    def fit_transform(
+        self, df: pd.DataFrame, memmap_path: Optional[str] = None
+    ) -> np.ndarray:
         """Combines `fit` and `transform`
 
         Parameters
         ----------
         df: pd.DataFrame
             Input pandas dataframe
+        memmap_path: str, Optional, default = None
+            see the `transform` method
 
         Returns
         -------
         np.ndarray
             Resized images to the input height and width
         """
-        return self.fit(df).transform(df)
+        self.fit(df)
+        return self.transform(df, memmap_path)
 
     def inverse_transform(self, transformed_image):
         raise NotImplementedError(
@@ -190,5 +289,7 @@ class ImagePreprocessor(BasePreprocessor):
         list_of_params.append("width={width}")
         list_of_params.append("height={height}")
         list_of_params.append("verbose={verbose}")
+        if self.memmap_path is not None:
+            list_of_params.append("memmap_path={memmap_path}")
         all_params = ", ".join(list_of_params)
         return f"ImagePreprocessor({all_params.format(**self.__dict__)})"
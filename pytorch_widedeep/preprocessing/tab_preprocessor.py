@@ -10,13 +10,19 @@ from pytorch_widedeep.wdtypes import (
     Tuple,
     Union,
     Literal,
+    Iterable,
     Optional,
 )
 from pytorch_widedeep.utils.general_utils import alias
-from pytorch_widedeep.utils.deeptabular_utils import LabelEncoder
+from pytorch_widedeep.utils.deeptabular_utils import (
+    LabelEncoder,
+    QuantileSketch,
+    inverted_cdf_quantiles,
+)
 from pytorch_widedeep.preprocessing.base_preprocessor import (
     BasePreprocessor,
     check_is_fitted,
+    fit_chunks_in_parallel,
 )
 
 
@@ -56,25 +62,139 @@ class Quantizer:
         Dictionary where the keys are the column names to quantize and the
         values are the either integers indicating the number of bins or a
         list of scalars indicating the bin edges.
+    strategy: str, default = 'uniform'
+        Strategy used to define the bins when the number of bins is given.
+        Choices are _'uniform'_ (equal-width bins, as in `pd.cut`) and
+        _'quantile'_ (equal-frequency bins).
     """
 
     def __init__(
         self,
         quantization_setup: Dict[str, Union[int, List[float]]],
+        strategy: Literal["uniform", "quantile"] = "uniform",
         **kwargs,
     ):
         self.quantization_setup = quantization_setup
+        self.strategy = strategy
         self.quant_args = kwargs
 
+        if self.strategy not in ["uniform", "quantile"]:
+            raise ValueError(
+                "'strategy' must be one of 'uniform' or 'quantile'. "
+                f"Got {self.strategy}"
+            )
+
         self.is_fitted = False
 
     def fit(self, df: pd.DataFrame) -> "Quantizer":
-        self.bins: Dict[str, List[float]] = {}
+        self.bins: Dict[str, Union[List[float], np.ndarray]] = {}
         for col, bins in self.quantization_setup.items():
-            _, self.bins[col] = pd.cut(
-                df[col], bins, retbins=True, labels=False, **self.quant_args
-            )
+            if isinstance(bins, int) and self.strategy == "quantile":
+                values = df[col].dropna().values
+                self.bins[col] = self._adjust_edges(
+                    inverted_cdf_quantiles(values, np.linspace(0, 1, bins + 1)),
+                )
+            else:
+                _, self.bins[col] = pd.cut(
+                    df[col], bins, retbins=True, labels=False, **self.quant_args
+                )
+
+        self._set_inversed_bins()
+
+        self.is_fitted = True
+
+        return self
+
+    def partial_fit(self, df: pd.DataFrame) -> "Quantizer":
+        r"""Updates the quantile sketches of the columns for which the number
+        of bins is given. The bins are computed once all the data has been
+        seen (see `finalize_fit`)
+        """
+        if not hasattr(self, "sketches"):
+            self.sketches: Dict[str, QuantileSketch] = {}
+
+        for col, bins in self.quantization_setup.items():
+            if isinstance(bins, int):
+                self.sketches.setdefault(col, QuantileSketch()).update(df[col].values)
+
+        return self
+
+    def merge(self, other: "Quantizer") -> "Quantizer":
+        r"""Merges the quantile sketches of another `Quantizer` partially
+        fitted on different chunks of the data
+        """
+        if not hasattr(other, "sketches"):
+            return self
+
+        if not hasattr(self, "sketches"):
+            self.sketches = {}
+
+        for col, sketch in other.sketches.items():
+            if col in self.sketches:
+                self.sketches[col].merge(sketch)
+            else:
+                self.sketches[col] = sketch
+
+        return self
+
+    def finalize_fit(
+        self, shift_and_scale: Optional[Dict[str, Tuple[float, float]]] = None
+    ) -> "Quantizer":
+        r"""Computes the bins from the quantile sketches
+
+        Parameters
+        ----------
+        shift_and_scale: Dict, Optional, default = None
+            Dictionary where the keys are column names and the values are
+            tuples with the mean and scale of a standardization that will be
+            applied to the columns before quantizing them. The bin edges
+            computed from the (non-standardized) values seen during
+            `partial_fit` are transformed accordingly
+        """
+        self.bins = {}
+        for col, bins in self.quantization_setup.items():
+            if not isinstance(bins, int):
+                self.bins[col] = bins
+                continue
+
+            sketch = self.sketches[col]
+            if self.strategy == "quantile":
+                edges = sketch.quantiles(np.linspace(0, 1, bins + 1))
+            else:
+                edges = np.linspace(sketch.min, sketch.max, bins + 1)
+            edges = self._adjust_edges(edges)
+
+            if shift_and_scale is not None and col in shift_and_scale:
+                mean, scale = shift_and_scale[col]
+                edges = (edges - mean) / scale
 
+            self.bins[col] = edges
+
+        self._set_inversed_bins()
+
+        self.is_fitted = True
+
+        return self
+
+    def _adjust_edges(self, edges: np.ndarray) -> np.ndarray:
+        # same adjustment as the one 'pd.cut' performs when the number of bins
+        # is passed, so that the extreme values fall within the bins
+        edges = np.unique(edges)
+        mn, mx = edges[0], edges[-1]
+        if mn == mx:
+            mn -= 0.001 * abs(mn) if mn != 0 else 0.001
+            mx += 0.001 * abs(mx) if mx != 0 else 0.001
+            return np.array([mn, mx])
+
+        adj = (mx - mn) * 0.001
+        if self.quant_args.get("right", True):
+            edges[0] -= adj
+        else:
+            edges[-1] += adj
+
+        return edges
+
+    def _set_inversed_bins(self):
         self.inversed_bins: Dict[str, Dict[int, float]] = {}
         for col, bins in self.bins.items():
             self.inversed_bins[col] = {
@@ -89,10 +209,6 @@ class Quantizer:
             # 0
             self.inversed_bins[col][0] = np.nan
 
-        self.is_fitted = True
-
-        return self
-
     def transform(self, df: pd.DataFrame) -> pd.DataFrame:
         check_is_fitted(self, condition=self.is_fitted)
 
@@ -111,7 +227,11 @@ class Quantizer:
         return self.fit(df).transform(df)
 
     def __repr__(self) -> str:
-        return f"Quantizer(quantization_setup={self.quantization_setup})"
+        list_of_params: List[str] = ["quantization_setup={quantization_setup}"]
+        if self.strategy != "uniform":
+            list_of_params.append("strategy='{strategy}'")
+        all_params = ", ".join(list_of_params)
+        return f"Quantizer({all_params.format(**self.__dict__)})"
 
 
 class TabPreprocessor(BasePreprocessor):
@@ -133,6 +253,10 @@ class TabPreprocessor(BasePreprocessor):
         dictionary where the keys are the column names to quantize and the
         values are the either integers indicating the number of bins or a
         list of scalars indicating the bin edges can also be used.
+    quantization_strategy: str, default = 'uniform'
+        Strategy used to define the bins when `quantization_setup` indicates
+        the number of bins. Choices are _'uniform'_ (equal-width bins, as in
+        `pd.cut`) and _'quantile'_ (equal-frequency bins).
     cols_to_scale: List or str, default = None,
         List with the names of the columns that will be standarised via
         sklearn's `StandardScaler`. It can also be the string `'all'` in
@@ -180,6 +304,21 @@ class TabPreprocessor(BasePreprocessor):
         columns'_. In other words, the idea is to let the model learn which
         column is embedded at the time. See: `pytorch_widedeep.models.transformers._layers.SharedEmbeddings`.
     verbose: int, default = 1
+    min_freq: int or float, Optional, default = None
+        If not `None`, categories that appear less than `min_freq` times (if
+        `int`) or in less than a fraction `min_freq` of the rows (if
+        `float`) are collapsed into a single, shared _'rare'_ category per
+        column, and therefore share the same embedding. This is useful to
+        shrink the embedding tables of long-tail, ID-like columns. If
+        `auto_embed_dim` is `True` the embedding dimensions are computed
+        using the number of categories after collapsing the rare ones.
+    embed_dim_by_freq: bool, default = False
+        If `True` and `auto_embed_dim` is `True`, the embedding dimension of
+        each categorical column is computed with the `embedding_rule` using
+        the _effective_ number of categories, i.e. the exponential of the
+        entropy of the categories' frequency distribution, instead of the
+        raw number of categories. Columns where a few categories accumulate
+        most of the observations are therefore allocated smaller embeddings.
     scale: bool, default = False
         :information_source: **note**: this arg will be removed in upcoming
          releases. Please use `cols_to_scale` instead. <br/> Bool indicating
@@ -257,6 +396,7 @@ class TabPreprocessor(BasePreprocessor):
         quantization_setup: Optional[
             Union[int, Dict[str, Union[int, List[float]]]]
         ] = None,
+        quantization_strategy: Literal["uniform", "quantile"] = "uniform",
         cols_to_scale: Optional[Union[List[str], str]] = None,
         auto_embed_dim: bool = True,
         embedding_rule: Literal["google", "fastai_old", "fastai_new"] = "fastai_new",
@@ -265,6 +405,8 @@ class TabPreprocessor(BasePreprocessor):
         with_cls_token: bool = False,
         shared_embed: bool = False,
         verbose: int = 1,
+        min_freq: Optional[Union[int, float]] = None,
+        embed_dim_by_freq: bool = False,
         *,
         scale: bool = False,
         already_standard: Optional[List[str]] = None,
@@ -274,6 +416,7 @@ class TabPreprocessor(BasePreprocessor):
 
         self.continuous_cols = continuous_cols
         self.quantization_setup = quantization_setup
+        self.quantization_strategy = quantization_strategy
         self.cols_to_scale = cols_to_scale
         self.scale = scale
         self.already_standard = already_standard
@@ -284,6 +427,8 @@ class TabPreprocessor(BasePreprocessor):
         self.with_cls_token = with_cls_token
         self.shared_embed = shared_embed
         self.verbose = verbose
+        self.min_freq = min_freq
+        self.embed_dim_by_freq = embed_dim_by_freq
 
         self.quant_args = {
             k: v for k, v in kwargs.items() if k in pd.cut.__code__.co_varnames
@@ -336,14 +481,22 @@ class TabPreprocessor(BasePreprocessor):
                 columns_to_encode=df_cat.columns.tolist(),
                 shared_embed=self.shared_embed,
                 with_attention=self.with_attention,
+                min_freq=self.min_freq,
+                with_value_counts=self.embed_dim_by_freq,
             )
             self.label_encoder.fit(df_cat)
 
+            if self._embed_dim_from_label_encoder():
+                cat_embed_dim = self._label_encoder_embed_dim()
+
             for k, v in self.label_encoder.encoding_dict.items():
+                # if rare categories are collapsed, several categories share
+                # the same index
+                n_cat = len(set(v.values()))
                 if self.with_attention:
-                    self.cat_embed_input.append((k, len(v)))
+                    self.cat_embed_input.append((k, n_cat))
                 else:
-                    self.cat_embed_input.append((k, len(v), cat_embed_dim[k]))
+                    self.cat_embed_input.append((k, n_cat, cat_embed_dim[k]))
 
             self.column_idx.update({k: v for v, k in enumerate(df_cat.columns)})
 
@@ -361,10 +514,19 @@ class TabPreprocessor(BasePreprocessor):
 
             # Quantization logic
             if self.cols_and_bins is not None:
-                # we do not run 'Quantizer.fit' here since in the wild case
-                # someone wants standardization and quantization for the same
-                # columns, the Quantizer will run on the scaled data
-                self.quantizer = Quantizer(self.cols_and_bins, **self.quant_args)
+                # in the wild case someone wants standardization and
+                # quantization for the same columns, the Quantizer runs on the
+                # scaled data
+                self.quantizer = Quantizer(
+                    self.cols_and_bins,
+                    strategy=self.quantization_strategy,
+                    **self.quant_args,
+                )
+                if self.standardize_cols is not None:
+                    df_cont[self.standardize_cols] = self.scaler.transform(
+                        df_cont[self.standardize_cols].values
+                    )
+                self.quantizer.fit(df_cont)
 
                 if self.with_attention:
                     for col, n_cat, _ in cont_embed_dim:
@@ -514,6 +676,32 @@ class TabPreprocessor(BasePreprocessor):
                 }  # type: ignore
         return df[self.cat_cols], cat_embed_dim
 
+    def _embed_dim_from_label_encoder(self) -> bool:
+        return (
+            self.auto_embed_dim
+            and not self.with_attention
+            and not isinstance(self.cat_embed_cols[0], tuple)
+            and (self.min_freq is not None or self.embed_dim_by_freq)
+        )
+
+    def _label_encoder_embed_dim(self) -> Dict[str, int]:
+        # embedding dims computed from the statistics accumulated by the
+        # LabelEncoder, i.e. after the rare categories have been collapsed
+        cat_embed_dim: Dict[str, int] = {}
+        for col, encoding in self.label_encoder.encoding_dict.items():
+            if self.embed_dim_by_freq:
+                value_counts = self.label_encoder.value_counts[col]
+                idx_counts: Dict[int, int] = {}
+                for o, idx in encoding.items():
+                    idx_counts[idx] = idx_counts.get(idx, 0) + value_counts.get(o, 0)
+                freqs = np.array(list(idx_counts.values()), dtype=float)
+                freqs = freqs[freqs > 0] / freqs.sum()
+                n_cat = max(1, int(round(np.exp(-(freqs * np.log(freqs)).sum()))))
+            else:
+                n_cat = len(set(encoding.values()))
+            cat_embed_dim[col] = embed_sz_rule(n_cat, self.embedding_rule)  # type: ignore[arg-type]
+        return cat_embed_dim
+
     def _prepare_continuous(
         self, df: pd.DataFrame
     ) -> Tuple[pd.DataFrame, Optional[List[Tuple[str, int, int]]]]:
@@ -675,6 +863,8 @@ class TabPreprocessor(BasePreprocessor):
             list_of_params.append("continuous_cols={continuous_cols}")
         if self.quantization_setup is not None:
             list_of_params.append("quantization_setup={quantization_setup}")
+        if self.quantization_strategy != "uniform":
+            list_of_params.append("quantization_strategy='{quantization_strategy}'")
         if self.cols_to_scale is not None:
             list_of_params.append("cols_to_scale={cols_to_scale}")
         if not self.auto_embed_dim:
@@ -691,6 +881,10 @@ class TabPreprocessor(BasePreprocessor):
             list_of_params.append("shared_embed={shared_embed}")
         if self.verbose != 1:
             list_of_params.append("verbose={verbose}")
+        if self.min_freq is not None:
+            list_of_params.append("min_freq={min_freq}")
+        if self.embed_dim_by_freq:
+            list_of_params.append("embed_dim_by_freq={embed_dim_by_freq}")
         if self.scale:
             list_of_params.append("scale={scale}")
         if self.already_standard is not None:
@@ -724,8 +918,16 @@ class ChunkTabPreprocessor(TabPreprocessor):
     cols_and_bins: Dict, default = None
         Continuous columns can be turned into categorical via
         `pd.cut`. 'cols_and_bins' is dictionary where the keys are the column
-        names to quantize and the values are a list of scalars indicating the
-        bin edges.
+        names to quantize and the values are either integers indicating the
+        number of bins or a list of scalars indicating the bin edges. When the
+        number of bins is given, the bins are computed from streaming quantile
+        sketches (see `pytorch_widedeep.utils.deeptabular_utils.QuantileSketch`)
+        that are updated with every chunk, so that they represent the whole
+        dataset.
+    quantization_strategy: str, default = 'uniform'
+        Strategy used to define the bins when `cols_and_bins` indicates the
+        number of bins. Choices are _'uniform'_ (equal-width bins, as in
+        `pd.cut`) and _'quantile'_ (equal-frequency bins).
     cols_to_scale: List, default = None,
         List with the names of the columns that will be standarised via
         sklearn's `StandardScaler`
@@ -759,6 +961,32 @@ class ChunkTabPreprocessor(TabPreprocessor):
         columns'_. In other words, the idea is to let the model learn which
         column is embedded at the time. See: `pytorch_widedeep.models.transformers._layers.SharedEmbeddings`.
     verbose: int, default = 1
+    min_freq: int or float, Optional, default = None
+        If not `None`, categories that appear less than `min_freq` times (if
+        `int`) or in less than a fraction `min_freq` of the rows (if
+        `float`) are collapsed into a single, shared _'rare'_ category per
+        column. The frequencies are accumulated over all chunks and the
+        rare categories are collapsed once the last chunk has been seen.
+    auto_embed_dim: bool, default = False
+        Boolean indicating whether the embedding dimensions will be
+        automatically defined via rule of thumb. The number of categories per
+        column is accumulated by the `LabelEncoder` over all chunks, and the
+        embedding dimensions are computed once the last chunk has been seen.
+        See `embedding_rule` below.
+    embedding_rule: str, default = 'fastai_new'
+        If `auto_embed_dim=True`, this is the choice of embedding rule of
+        thumb. Choices are:
+
+        - _fastai_new_: $min(600, round(1.6 \times n_{cat}^{0.56}))$
+
+        - _fastai_old_: $min(50, (n_{cat}//{2})+1)$
+
+        - _google_: $min(600, round(n_{cat}^{0.24}))$
+    embed_dim_by_freq: bool, default = False
+        If `True` and `auto_embed_dim` is `True`, the embedding dimension of
+        each categorical column is computed using the _effective_ number of
+        categories (see `TabPreprocessor`), based on the frequencies
+        accumulated over all chunks.
     scale: bool, default = False
         :information_source: **note**: this arg will be removed in upcoming
          releases. Please use `cols_to_scale` instead. <br/> Bool indicating
@@ -831,13 +1059,18 @@ class ChunkTabPreprocessor(TabPreprocessor):
         n_chunks: int,
         cat_embed_cols: Optional[Union[List[str], List[Tuple[str, int]]]] = None,
         continuous_cols: Optional[List[str]] = None,
-        cols_and_bins: Optional[Dict[str, List[float]]] = None,
+        cols_and_bins: Optional[Dict[str, Union[int, List[float]]]] = None,
+        quantization_strategy: Literal["uniform", "quantile"] = "uniform",
         cols_to_scale: Optional[Union[List[str], str]] = None,
         default_embed_dim: int = 16,
         with_attention: bool = False,
         with_cls_token: bool = False,
         shared_embed: bool = False,
         verbose: int = 1,
+        min_freq: Optional[Union[int, float]] = None,
+        auto_embed_dim: bool = False,
+        embedding_rule: Literal["google", "fastai_old", "fastai_new"] = "fastai_new",
+        embed_dim_by_freq: bool = False,
         *,
         scale: bool = False,
         already_standard: Optional[List[str]] = None,
@@ -847,14 +1080,17 @@ class ChunkTabPreprocessor(TabPreprocessor):
             cat_embed_cols=cat_embed_cols,
             continuous_cols=continuous_cols,
             quantization_setup=None,
+            quantization_strategy=quantization_strategy,
             cols_to_scale=cols_to_scale,
-            auto_embed_dim=False,
-            embedding_rule="google",  # does not matter, irrelevant
+            auto_embed_dim=auto_embed_dim,
+            embedding_rule=embedding_rule,
             default_embed_dim=default_embed_dim,
             with_attention=with_attention,
             with_cls_token=with_cls_token,
             shared_embed=shared_embed,
             verbose=verbose,
+            min_freq=min_freq,
+            embed_dim_by_freq=embed_dim_by_freq,
             scale=scale,
             already_standard=already_standard,
             **kwargs,
@@ -865,15 +1101,76 @@ class ChunkTabPreprocessor(TabPreprocessor):
 
         self.cols_and_bins = cols_and_bins  # type: ignore[assignment]
         if self.cols_and_bins is not None:
-            self.quantizer = Quantizer(self.cols_and_bins, **self.quant_args)
+            self.quantizer = Quantizer(
+                self.cols_and_bins,
+                strategy=self.quantization_strategy,
+                **self.quant_args,
+            )
 
         self.embed_prepared = False
         self.continuous_prepared = False
 
-    def partial_fit(self, df: pd.DataFrame) -> "ChunkTabPreprocessor":  # noqa: C901
+    def partial_fit(self, df: pd.DataFrame) -> "ChunkTabPreprocessor":
         # df here, and throughout the class, is a chunk of the original df
         self.chunk_counter += 1
 
+        self._partial_fit_state(df)
+
+        if self.chunk_counter == self.n_chunks:
+            self._finalize_fit()
+
+        return self
+
+    def merge(self, other: "ChunkTabPreprocessor") -> "ChunkTabPreprocessor":
+        r"""Merges the state of another `ChunkTabPreprocessor` that has been
+        partially fitted on different chunks of the data (i.e. the label
+        encoder's categories and counts and the scaler's moments). If, after
+        merging, all `n_chunks` chunks have been seen, the fitting process is
+        finalised.
+
+        Parameters
+        ----------
+        other: ChunkTabPreprocessor
+            `ChunkTabPreprocessor` partially fitted on other chunks
+
+        Returns
+        -------
+        ChunkTabPreprocessor
+            `ChunkTabPreprocessor` with the merged state
+        """
+        self._merge_state(other)
+
+        if self.chunk_counter == self.n_chunks:
+            self._finalize_fit()
+
+        return self
+
+    def fit_parallel(
+        self, chunk_iterator: Iterable[pd.DataFrame], n_jobs: int = -1
+    ) -> "ChunkTabPreprocessor":
+        r"""Fits the preprocessor over the chunks yielded by `chunk_iterator`
+        using a pool of processes. Each process fits one chunk at a time and
+        the resulting partial states are merged in the main process (see
+        `merge`). The resulting encodings are identical to those obtained
+        running `partial_fit` sequentially over the chunks. Once all chunks
+        have been seen, `n_chunks` is set to the number of chunks.
+
+        Parameters
+        ----------
+        chunk_iterator: Iterable
+            iterable of pandas dataframes, e.g. `pd.read_csv(fname,
+            chunksize=chunksize)`
+        n_jobs: int, default = -1
+            number of processes. If -1 all available CPUs will be used
+
+        Returns
+        -------
+        ChunkTabPreprocessor
+            `ChunkTabPreprocessor` fitted object
+        """
+        return fit_chunks_in_parallel(self, chunk_iterator, n_jobs)
+
+    def _partial_fit_state(self, df: pd.DataFrame):
         df_adj = self._insert_cls_token(df) if self.with_cls_token else df.copy()
 
         self.column_idx: Dict[str, int] = {}
@@ -886,6 +1183,8 @@ class ChunkTabPreprocessor(TabPreprocessor):
                     columns_to_encode=df_cat.columns.tolist(),
                     shared_embed=self.shared_embed,
                     with_attention=self.with_attention,
+                    min_freq=self.min_freq,
+                    with_value_counts=self.embed_dim_by_freq,
                 )
                 self.label_encoder.partial_fit(df_cat)
             else:
@@ -908,30 +1207,85 @@ class ChunkTabPreprocessor(TabPreprocessor):
             if self.standardize_cols is not None:
                 self.scaler.partial_fit(df_cont[self.standardize_cols].values)
 
-        if self.chunk_counter == self.n_chunks:
-            if self.cat_embed_cols is not None or self.cols_and_bins is not None:
-                self.cat_embed_input: List[
-                    Union[Tuple[str, int], Tuple[str, int, int]]
-                ] = []
-
+            if self.cols_and_bins is not None:
+                self.quantizer.partial_fit(df_cont)
+
+    def _merge_state(self, other: "ChunkTabPreprocessor"):
+        if other.chunk_counter == 0:
+            return
+
+        if self.chunk_counter == 0:
+            # nothing to merge with, simply take the other's state
+            for attr in [
+                "column_idx",
+                "cat_cols",
+                "cat_embed_dim",
+                "label_encoder",
+                "embed_prepared",
+                "standardize_cols",
+                "scaler",
+                "cont_embed_dim",
+                "continuous_prepared",
+                "quantizer",
+            ]:
+                if hasattr(other, attr):
+                    setattr(self, attr, getattr(other, attr))
+        else:
             if self.cat_embed_cols is not None:
-                for k, v in self.label_encoder.encoding_dict.items():
-                    if self.with_attention:
-                        self.cat_embed_input.append((k, len(v)))
-                    else:
-                        self.cat_embed_input.append((k, len(v), self.cat_embed_dim[k]))
-
+                self.label_encoder.merge(other.label_encoder)
+            if self.continuous_cols is not None and self.standardize_cols is not None:
+                _merge_scalers(self.scaler, other.scaler)
             if self.cols_and_bins is not None:
-                assert self.cont_embed_dim is not None  # just to make mypy happy
+                self.quantizer.merge(other.quantizer)
+
+        self.chunk_counter += other.chunk_counter
+
+    def _finalize_fit(self):
+        if self.cat_embed_cols is not None or self.cols_and_bins is not None:
+            self.cat_embed_input: List[Union[Tuple[str, int], Tuple[str, int, int]]] = (
+                []
+            )
+
+        if self.cat_embed_cols is not None:
+            if self.min_freq is not None:
+                self.label_encoder.collapse_rare_categories()
+            if self._auto_embed_dim_at_finalization():
+                # the cardinalities (and frequencies) have been accumulated
+                # by the label encoder over all chunks
+                self.cat_embed_dim = self._label_encoder_embed_dim()
+            for k, v in self.label_encoder.encoding_dict.items():
+                n_cat = len(set(v.values()))
                 if self.with_attention:
-                    for col, n_cat, _ in self.cont_embed_dim:
-                        self.cat_embed_input.append((col, n_cat))
+                    self.cat_embed_input.append((k, n_cat))
                 else:
-                    self.cat_embed_input.extend(self.cont_embed_dim)
+                    self.cat_embed_input.append((k, n_cat, self.cat_embed_dim[k]))
 
-            self.is_fitted = True
+        if self.cols_and_bins is not None:
+            # the sketches are built with the raw values, while the quantizer
+            # runs on the scaled ones
+            shift_and_scale: Optional[Dict[str, Tuple[float, float]]] = None
+            if self.standardize_cols is not None:
+                shift_and_scale = {
+                    col: (
+                        self.scaler.mean_[i] if self.scaler.mean_ is not None else 0.0,
+                        (
+                            self.scaler.scale_[i]
+                            if self.scaler.scale_ is not None
+                            else 1.0
+                        ),
+                    )
+                    for i, col in enumerate(self.standardize_cols)
+                }
+            self.quantizer.finalize_fit(shift_and_scale)
 
-        return self
+            assert self.cont_embed_dim is not None  # just to make mypy happy
+            if self.with_attention:
+                for col, n_cat, _ in self.cont_embed_dim:
+                    self.cat_embed_input.append((col, n_cat))
+            else:
+                self.cat_embed_input.extend(self.cont_embed_dim)
+
+        self.is_fitted = True
 
     def fit(self, df: pd.DataFrame) -> "ChunkTabPreprocessor":
         # just to override the fit method in the base class. This class is not
@@ -941,9 +1295,9 @@ class ChunkTabPreprocessor(TabPreprocessor):
     def _prepare_categorical(
         self, df: pd.DataFrame
     ) -> Tuple[pd.DataFrame, Dict[str, int]]:
-        # When dealing with chunks we will NOT support the option of
-        # automatically define embeddings as this implies going through the
-        # entire dataset
+        # When dealing with chunks, if the embedding dims are automatically
+        # defined, these are computed once all chunks have been seen (see
+        # '_finalize_fit'). Until then, the default embed dim is used
         if isinstance(self.cat_embed_cols[0], tuple):
             self.cat_cols: List[str] = [emb[0] for emb in self.cat_embed_cols]
             cat_embed_dim: Dict[str, int] = dict(self.cat_embed_cols)  # type: ignore
@@ -957,6 +1311,13 @@ class ChunkTabPreprocessor(TabPreprocessor):
 
         return df[self.cat_cols], cat_embed_dim
 
+    def _auto_embed_dim_at_finalization(self) -> bool:
+        return (
+            self.auto_embed_dim
+            and not self.with_attention
+            and not isinstance(self.cat_embed_cols[0], tuple)
+        )
+
     def _prepare_continuous(
         self, df: pd.DataFrame
     ) -> Tuple[pd.DataFrame, Optional[List[Tuple[str, int, int]]]]:
@@ -989,22 +1350,18 @@ class ChunkTabPreprocessor(TabPreprocessor):
             # the quantized columns are then treated as categorical
             quant_cont_embed_input: Optional[List[Tuple[str, int, int]]] = []
             for col, val in self.cols_and_bins.items():
-                if isinstance(val, int):
-                    quant_cont_embed_input.append(
+                n_bins = val if isinstance(val, int) else len(val) - 1
+                quant_cont_embed_input.append(
+                    (
+                        col,
+                        n_bins,
                         (
-                            col,
-                            val,
-                            self.default_embed_dim,
-                        )
-                    )
-                else:
-                    quant_cont_embed_input.append(
-                        (
-                            col,
-                            len(val) - 1,
-                            self.default_embed_dim,
-                        )
+                            embed_sz_rule(n_bins + 1, self.embedding_rule)  # type: ignore[arg-type]
+                            if self.auto_embed_dim
+                            else self.default_embed_dim
+                        ),
                     )
+                )
         else:
             quant_cont_embed_input = None
 
@@ -1022,6 +1379,8 @@ class ChunkTabPreprocessor(TabPreprocessor):
             list_of_params.append("continuous_cols={continuous_cols}")
         if self.cols_and_bins is not None:
             list_of_params.append("cols_and_bins={cols_and_bins}")
+        if self.quantization_strategy != "uniform":
+            list_of_params.append("quantization_strategy='{quantization_strategy}'")
         if self.cols_to_scale is not None:
             list_of_params.append("cols_to_scale={cols_to_scale}")
         if self.default_embed_dim != 16:
@@ -1034,6 +1393,14 @@ class ChunkTabPreprocessor(TabPreprocessor):
             list_of_params.append("shared_embed={shared_embed}")
         if self.verbose != 1:
             list_of_params.append("verbose={verbose}")
+        if self.min_freq is not None:
+            list_of_params.append("min_freq={min_freq}")
+        if self.auto_embed_dim:
+            list_of_params.append("auto_embed_dim={auto_embed_dim}")
+        if self.embedding_rule != "fastai_new":
+            list_of_params.append("embedding_rule='{embedding_rule}'")
+        if self.embed_dim_by_freq:
+            list_of_params.append("embed_dim_by_freq={embed_dim_by_freq}")
         if self.scale:
             list_of_params.append("scale={scale}")
         if self.already_standard is not None:
@@ -1048,3 +1415,23 @@ class ChunkTabPreprocessor(TabPreprocessor):
             )
         all_params = ", ".join(list_of_params)
         return f"ChunkTabPreprocessor({all_params.format(**self.__dict__)})"
+
+
+def _merge_scalers(scaler: StandardScaler, other: StandardScaler) -> StandardScaler:
+    # Chan et al. parallel algorithm to combine the moments computed over two
+    # different sets of samples
+    n_a, n_b = scaler.n_samples_seen_, other.n_samples_seen_
+    n = n_a + n_b
+
+    if scaler.mean_ is not None:
+        delta = other.mean_ - scaler.mean_
+        mean = scaler.mean_ + delta * n_b / n
+        if scaler.var_ is not None:
+            m2 = scaler.var_ * n_a + other.var_ * n_b + delta**2 * n_a * n_b / n
+            scaler.var_ = m2 / n
+            scaler.scale_ = np.where(scaler.var_ == 0.0, 1.0, np.sqrt(scaler.var_))
+        scaler.mean_ = mean
+
+    scaler.n_samples_seen_ = n
+
+    return scaler
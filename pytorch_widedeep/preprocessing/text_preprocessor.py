@@ -1,12 +1,14 @@
 import os
-from typing import List, Union, Optional
+import copy
+from typing import List, Union, Literal, Iterable, Optional
 
 import numpy as np
 import pandas as pd
 
 from pytorch_widedeep.utils.text_utils import (
+    RaggedText,
     get_texts,
-    pad_sequences,
+    pad_sequences_batch,
     build_embeddings_matrix,
 )
 from pytorch_widedeep.utils.general_utils import alias
@@ -14,6 +16,7 @@ from pytorch_widedeep.utils.fastai_transforms import Vocab, ChunkVocab
 from pytorch_widedeep.preprocessing.base_preprocessor import (
     BasePreprocessor,
     check_is_fitted,
+    fit_chunks_in_parallel,
 )
 
 TVocab = Union[Vocab, ChunkVocab]
@@ -47,11 +50,19 @@ class TextPreprocessor(BasePreprocessor):
         This parameter is thought for those cases where the input sequences
         are already fully processed or are directly not text (e.g. IDs)
     word_vectors_path: str, Optional
-        Path to the pretrained word vectors
+        Path to the pretrained word vectors, either in text format or a
+        binary store created with
+        `pytorch_widedeep.utils.convert_word_vectors`
     n_cpus: int, Optional, default = None
         number of CPUs to used during the tokenization process
     verbose: int, default 1
         Enable verbose output.
+    tokenizer_engine: str, default = 'spacy'
+        Engine used to split the texts into tokens. Choices are _'spacy'_
+        (`Spacy`'s language specific tokenizer) and _'regex'_ (a much faster
+        tokenizer that splits the texts into words and punctuation symbols
+        via a regular expression). The latter is meant to be used when the
+        text is already clean.
 
     Attributes
     ----------
@@ -89,6 +100,7 @@ class TextPreprocessor(BasePreprocessor):
         word_vectors_path: Optional[str] = None,
         n_cpus: Optional[int] = None,
         verbose: int = 1,
+        tokenizer_engine: Literal["spacy", "regex"] = "spacy",
     ):
         super(TextPreprocessor, self).__init__()
 
@@ -102,10 +114,11 @@ class TextPreprocessor(BasePreprocessor):
         self.word_vectors_path = word_vectors_path
         self.verbose = verbose
         self.n_cpus = n_cpus if n_cpus is not None else os.cpu_count()
+        self.tokenizer_engine = tokenizer_engine
 
         self.is_fitted = False
 
-    def fit(self, df: pd.DataFrame) -> BasePreprocessor:
+    def fit(self, df: pd.DataFrame) -> "TextPreprocessor":
         """Builds the vocabulary
 
         Parameters
@@ -120,7 +133,9 @@ class TextPreprocessor(BasePreprocessor):
         """
         texts = self._read_texts(df)
 
-        tokens = get_texts(texts, self.already_processed, self.n_cpus)
+        tokens = get_texts(
+            texts, self.already_processed, self.n_cpus, self.tokenizer_engine
+        )
 
         self.vocab: TVocab = Vocab(
             max_vocab=self.max_vocab,
@@ -141,22 +156,38 @@ class TextPreprocessor(BasePreprocessor):
 
         return self
 
-    def transform(self, df: pd.DataFrame) -> np.ndarray:
+    def transform(
+        self, df: pd.DataFrame, return_ragged: bool = False
+    ) -> Union[np.ndarray, RaggedText]:
         """Returns the padded, _'numericalised'_ sequences
 
         Parameters
         ----------
         df: pd.DataFrame
             Input pandas dataframe
+        return_ragged: bool, default = False
+            Boolean indicating whether to return the sequences, truncated to
+            `maxlen`, without padding, as a `RaggedText` object (see
+            `pytorch_widedeep.utils.RaggedText`). This can be passed to the
+            `Trainer` so that each batch is padded only up to its longest
+            sequence
 
         Returns
         -------
-        np.ndarray
-            Padded, _'numericalised'_ sequences
+        np.ndarray or RaggedText
+            Padded, _'numericalised'_ sequences, or the unpadded sequences if
+            `return_ragged = True`
         """
         check_is_fitted(self, attributes=["vocab"])
         texts = self._read_texts(df)
-        tokens = get_texts(texts, self.already_processed, self.n_cpus)
+        tokens = get_texts(
+            texts, self.already_processed, self.n_cpus, self.tokenizer_engine
+        )
+        if return_ragged:
+            seqs, lengths = self.vocab.transform_batch(tokens)
+            return RaggedText.from_lengths(seqs, lengths, self.pad_idx).truncate(
+                self.maxlen
+            )
         return self._pad_sequences(tokens)
 
     def transform_sample(self, text: str) -> np.ndarray:
@@ -173,31 +204,41 @@ class TextPreprocessor(BasePreprocessor):
             Padded, _'numericalised'_ sequence
         """
         check_is_fitted(self, attributes=["vocab"])
-        tokens = get_texts([text], self.already_processed, self.n_cpus)
+        tokens = get_texts(
+            [text], self.already_processed, self.n_cpus, self.tokenizer_engine
+        )
         return self._pad_sequences(tokens)[0]
 
-    def fit_transform(self, df: pd.DataFrame) -> np.ndarray:
+    def fit_transform(
+        self, df: pd.DataFrame, return_ragged: bool = False
+    ) -> Union[np.ndarray, RaggedText]:
         """Combines `fit` and `transform`
 
         Parameters
         ----------
         df: pd.DataFrame
             Input pandas dataframe
+        return_ragged: bool, default = False
+            Boolean indicating whether to return the sequences without
+            padding, as a `RaggedText` object (see the `transform` method)
 
         Returns
         -------
-        np.ndarray
-            Padded, _'numericalised'_ sequences
+        np.ndarray or RaggedText
+            Padded, _'numericalised'_ sequences, or the unpadded sequences if
+            `return_ragged = True`
         """
-        return self.fit(df).transform(df)
+        return self.fit(df).transform(df, return_ragged=return_ragged)
 
-    def inverse_transform(self, padded_seq: np.ndarray) -> pd.DataFrame:
+    def inverse_transform(
+        self, padded_seq: Union[np.ndarray, RaggedText]
+    ) -> pd.DataFrame:
         """Returns the original text plus the added 'special' tokens
 
         Parameters
         ----------
-        padded_seq: np.ndarray
-            array with the output of the `transform` method
+        padded_seq: np.ndarray or RaggedText
+            the output of the `transform` method
 
         Returns
         -------
@@ -208,19 +249,16 @@ class TextPreprocessor(BasePreprocessor):
         return pd.DataFrame({self.text_col: texts})
 
     def _pad_sequences(self, tokens: List[List[str]]) -> np.ndarray:
-        sequences = [self.vocab.transform(t) for t in tokens]
-        padded_seq = np.array(
-            [
-                pad_sequences(
-                    s,
-                    maxlen=self.maxlen,
-                    pad_first=self.pad_first,
-                    pad_idx=self.pad_idx,
-                )
-                for s in sequences
-            ]
+        # all tokens are numericalised at once and then scattered into a
+        # single, preallocated array
+        seqs, lengths = self.vocab.transform_batch(tokens)
+        return pad_sequences_batch(
+            seqs,
+            lengths,
+            maxlen=self.maxlen,
+            pad_first=self.pad_first,
+            pad_idx=self.pad_idx,
         )
-        return padded_seq
 
     def _read_texts(
         self, df: pd.DataFrame, root_dir: Optional[str] = None
@@ -257,6 +295,8 @@ class TextPreprocessor(BasePreprocessor):
             list_of_params.append("n_cpus={n_cpus}")
         if self.verbose is not None:
             list_of_params.append("verbose={verbose}")
+        if self.tokenizer_engine != "spacy":
+            list_of_params.append("tokenizer_engine='{tokenizer_engine}'")
         all_params = ", ".join(list_of_params)
         return f"TextPreprocessor({all_params.format(**self.__dict__)})"
 
@@ -286,11 +326,19 @@ class ChunkTextPreprocessor(TextPreprocessor):
     pad_idx: int, default = 1
         padding index. Fastai's Tokenizer leaves 0 for the 'unknown' token.
     word_vectors_path: str, Optional
-        Path to the pretrained word vectors
+        Path to the pretrained word vectors, either in text format or a
+        binary store created with
+        `pytorch_widedeep.utils.convert_word_vectors`
     n_cpus: int, Optional, default = None
         number of CPUs to used during the tokenization process
     verbose: int, default 1
         Enable verbose output.
+    tokenizer_engine: str, default = 'spacy'
+        Engine used to split the texts into tokens. Choices are _'spacy'_
+        (`Spacy`'s language specific tokenizer) and _'regex'_ (a much faster
+        tokenizer that splits the texts into words and punctuation symbols
+        via a regular expression). The latter is meant to be used when the
+        text is already clean.
 
     Attributes
     ----------
@@ -324,6 +372,7 @@ class ChunkTextPreprocessor(TextPreprocessor):
         word_vectors_path: Optional[str] = None,
         n_cpus: Optional[int] = None,
         verbose: int = 1,
+        tokenizer_engine: Literal["spacy", "regex"] = "spacy",
     ):
         super(ChunkTextPreprocessor, self).__init__(
             text_col=text_col,
@@ -336,6 +385,7 @@ class ChunkTextPreprocessor(TextPreprocessor):
             word_vectors_path=word_vectors_path,
             n_cpus=n_cpus,
             verbose=verbose,
+            tokenizer_engine=tokenizer_engine,
         )
 
         self.n_chunks = n_chunks
@@ -349,32 +399,110 @@ class ChunkTextPreprocessor(TextPreprocessor):
         # df is a chunk of the original dataframe
         self.chunk_counter += 1
 
-        texts = self._read_texts(df, self.root_dir)
+        self._partial_fit_state(df)
 
-        tokens = get_texts(texts, self.already_processed, self.n_cpus)
+        if self.chunk_counter == self.n_chunks:
+            self._finalize_fit()
 
-        if not hasattr(self, "vocab"):
-            self.vocab = ChunkVocab(
-                max_vocab=self.max_vocab,
-                min_freq=self.min_freq,
-                pad_idx=self.pad_idx,
-                n_chunks=self.n_chunks,
-            )
+        return self
 
-        self.vocab.fit(tokens)
+    def merge(self, other: "ChunkTextPreprocessor") -> "ChunkTextPreprocessor":
+        r"""Merges the state (i.e. the token frequencies) of another
+        `ChunkTextPreprocessor` that has been partially fitted on different
+        chunks of the data. If, after merging, all `n_chunks` chunks have been
+        seen, the vocabulary is built.
 
-        if self.chunk_counter == self.n_chunks:
-            if self.verbose:
-                print("The vocabulary contains {} tokens".format(len(self.vocab.stoi)))
-            if self.word_vectors_path is not None:
-                self.embedding_matrix = build_embeddings_matrix(
-                    self.vocab, self.word_vectors_path, self.min_freq
-                )
+        Parameters
+        ----------
+        other: ChunkTextPreprocessor
+            `ChunkTextPreprocessor` partially fitted on other chunks
+
+        Returns
+        -------
+        ChunkTextPreprocessor
+            `ChunkTextPreprocessor` with the merged state
+        """
+        self._merge_state(other)
 
-            self.is_fitted = True
+        if self.chunk_counter == self.n_chunks:
+            self._finalize_fit()
 
         return self
 
+    def fit_parallel(
+        self, chunk_iterator: Iterable[pd.DataFrame], n_jobs: int = -1
+    ) -> "ChunkTextPreprocessor":
+        r"""Fits the preprocessor over the chunks yielded by `chunk_iterator`
+        using a pool of processes. Each process tokenizes one chunk at a time
+        and the resulting token frequencies are merged in the main process
+        (see `merge`). Once all chunks have been seen, `n_chunks` is set to
+        the number of chunks and the vocabulary is built.
+
+        Parameters
+        ----------
+        chunk_iterator: Iterable
+            iterable of pandas dataframes, e.g. `pd.read_csv(fname,
+            chunksize=chunksize)`
+        n_jobs: int, default = -1
+            number of processes. If -1 all available CPUs will be used
+
+        Returns
+        -------
+        ChunkTextPreprocessor
+            `ChunkTextPreprocessor` fitted object
+        """
+        # the parallelism happens across chunks, so each process tokenizes
+        # its chunk using a single CPU
+        template = copy.deepcopy(self)
+        template.n_cpus = 1
+        return fit_chunks_in_parallel(self, chunk_iterator, n_jobs, template)
+
+    def _partial_fit_state(self, df: pd.DataFrame):
+        texts = self._read_texts(df, self.root_dir)
+
+        tokens = get_texts(
+            texts, self.already_processed, self.n_cpus, self.tokenizer_engine
+        )
+
+        # the vocabulary is built once all chunks have been seen
+        self._chunk_vocab()._count_tokens(tokens)
+
+    def _merge_state(self, other: "ChunkTextPreprocessor"):
+        if other.chunk_counter == 0:
+            return
+
+        self._chunk_vocab()._merge_state(other._chunk_vocab())
+
+        self.chunk_counter += other.chunk_counter
+
+    def _finalize_fit(self):
+        if not self.vocab.is_fitted:
+            self.vocab.n_chunks = self.n_chunks
+            self.vocab._build_vocab()
+
+        if self.verbose:
+            print("The vocabulary contains {} tokens".format(len(self.vocab.stoi)))
+        if self.word_vectors_path is not None:
+            self.embedding_matrix = build_embeddings_matrix(
+                self.vocab, self.word_vectors_path, self.min_freq
+            )
+
+        self.is_fitted = True
+
+    def _chunk_vocab(self) -> ChunkVocab:
+        if not hasattr(self, "vocab"):
+            self.vocab = self._new_vocab()
+        assert isinstance(self.vocab, ChunkVocab)
+        return self.vocab
+
+    def _new_vocab(self) -> ChunkVocab:
+        return ChunkVocab(
+            max_vocab=self.max_vocab,
+            min_freq=self.min_freq,
+            pad_idx=self.pad_idx,
+            n_chunks=self.n_chunks,
+        )
+
     def fit(self, df: pd.DataFrame) -> "ChunkTextPreprocessor":
         # df is a chunk of the original dataframe
         return self.partial_fit(df)
@@ -395,5 +523,7 @@ class ChunkTextPreprocessor(TextPreprocessor):
         if self.n_cpus is not None:
             list_of_params.append("n_cpus={n_cpus}")
         list_of_params.append("verbose={verbose}")
+        if self.tokenizer_engine != "spacy":
+            list_of_params.append("tokenizer_engine='{tokenizer_engine}'")
         all_params = ", ".join(list_of_params)
         return f"ChunkTextPreprocessor({all_params.format(**self.__dict__)})"
@@ -1,5 +1,5 @@
 import sys
-from typing import List, Tuple, Optional
+from typing import List, Tuple, Iterable, Optional
 
 import numpy as np
 import pandas as pd
@@ -7,6 +7,7 @@ import pandas as pd
 from pytorch_widedeep.preprocessing.base_preprocessor import (
     BasePreprocessor,
     check_is_fitted,
+    fit_chunks_in_parallel,
 )
 
 
@@ -278,10 +279,67 @@ class ChunkWidePreprocessor(WidePreprocessor):
         ChunkWidePreprocessor
             `ChunkWidePreprocessor` fitted object
         """
+        self._partial_fit_state(chunk)
+
+        self.chunk_counter += 1
+
+        if self.chunk_counter == self.n_chunks:
+            self._finalize_fit()
+
+        return self
+
+    def merge(self, other: "ChunkWidePreprocessor") -> "ChunkWidePreprocessor":
+        r"""Merges the state (i.e. the set of features) of another
+        `ChunkWidePreprocessor` that has been partially fitted on different
+        chunks of the data. If, after merging, all `n_chunks` chunks have been
+        seen, the fitting process is finalised.
+
+        Parameters
+        ----------
+        other: ChunkWidePreprocessor
+            `ChunkWidePreprocessor` partially fitted on other chunks
+
+        Returns
+        -------
+        ChunkWidePreprocessor
+            `ChunkWidePreprocessor` with the merged state
+        """
+        self._merge_state(other)
+
+        if self.chunk_counter == self.n_chunks:
+            self._finalize_fit()
+
+        return self
+
+    def fit_parallel(
+        self, chunk_iterator: Iterable[pd.DataFrame], n_jobs: int = -1
+    ) -> "ChunkWidePreprocessor":
+        r"""Fits the preprocessor over the chunks yielded by `chunk_iterator`
+        using a pool of processes. Each process fits one chunk at a time and
+        the resulting partial states are merged in the main process (see
+        `merge`). Once all chunks have been seen, `n_chunks` is set to the
+        number of chunks.
+
+        Parameters
+        ----------
+        chunk_iterator: Iterable
+            iterable of pandas dataframes, e.g. `pd.read_csv(fname,
+            chunksize=chunksize)`
+        n_jobs: int, default = -1
+            number of processes. If -1 all available CPUs will be used
+
+        Returns
+        -------
+        ChunkWidePreprocessor
+            `ChunkWidePreprocessor` fitted object
+        """
+        return fit_chunks_in_parallel(self, chunk_iterator, n_jobs)
+
+    def _partial_fit_state(self, chunk: pd.DataFrame):
         df_wide = self._prepare_wide(chunk)
         self.wide_crossed_cols = df_wide.columns.tolist()
 
-        if self.chunk_counter == 0:
+        if not hasattr(self, "glob_feature_set"):
             self.glob_feature_set = set(
                 self._make_global_feature_list(df_wide[self.wide_crossed_cols])
             )
@@ -290,17 +348,24 @@ class ChunkWidePreprocessor(WidePreprocessor):
                 self._make_global_feature_list(df_wide[self.wide_crossed_cols])
             )
 
-        self.chunk_counter += 1
+    def _merge_state(self, other: "ChunkWidePreprocessor"):
+        if other.chunk_counter == 0:
+            return
 
-        if self.chunk_counter == self.n_chunks:
-            self.encoding_dict = {v: i + 1 for i, v in enumerate(self.glob_feature_set)}
-            self.wide_dim = len(self.encoding_dict)
-            self.inverse_encoding_dict = {k: v for v, k in self.encoding_dict.items()}
-            self.inverse_encoding_dict[0] = "unseen"
+        if not hasattr(self, "glob_feature_set"):
+            self.wide_crossed_cols = other.wide_crossed_cols
+            self.glob_feature_set = set()
+        self.glob_feature_set.update(other.glob_feature_set)
 
-            self.is_fitted = True
+        self.chunk_counter += other.chunk_counter
 
-        return self
+    def _finalize_fit(self):
+        self.encoding_dict = {v: i + 1 for i, v in enumerate(self.glob_feature_set)}
+        self.wide_dim = len(self.encoding_dict)
+        self.inverse_encoding_dict = {k: v for v, k in self.encoding_dict.items()}
+        self.inverse_encoding_dict[0] = "unseen"
+
+        self.is_fitted = True
 
     def fit(self, df: pd.DataFrame) -> "ChunkWidePreprocessor":
         """
@@ -1,6 +1,9 @@
 from pytorch_widedeep.self_supervised_training.encoder_decoder_trainer import (
     EncoderDecoderTrainer,
 )
+from pytorch_widedeep.models.tabular.self_supervised.cached_encoder_head import (
+    CachedEncoderHead,
+)
 from pytorch_widedeep.self_supervised_training.contrastive_denoising_trainer import (
     ContrastiveDenoisingTrainer,
 )
@@ -31,6 +31,9 @@ from pytorch_widedeep.models.tabular.self_supervised import (
     ContrastiveDenoisingModel,
 )
 from pytorch_widedeep.preprocessing.tab_preprocessor import TabPreprocessor
+from pytorch_widedeep.self_supervised_training._encoder_outputs_cache import (
+    cache_encoder_outputs,
+)
 
 
 # There is quite a lot of code repetition between the
@@ -50,8 +53,8 @@ class BaseContrastiveDenoisingTrainer(ABC):
         projection_head1_dims: Optional[List[int]],
         projection_head2_dims: Optional[List[int]],
         projection_heads_activation: str,
-        cat_mlp_type: Literal["single", "multiple"],
-        cont_mlp_type: Literal["single", "multiple"],
+        cat_mlp_type: Literal["single", "multiple", "grouped"],
+        cont_mlp_type: Literal["single", "multiple", "grouped"],
         denoise_mlps_activation: str,
         verbose: int,
         seed: int,
@@ -77,6 +80,7 @@ class BaseContrastiveDenoisingTrainer(ABC):
             cat_mlp_type,
             cont_mlp_type,
             denoise_mlps_activation,
+            seed,
         )
         self.cd_model.to(self.device)
 
@@ -132,6 +136,42 @@ class BaseContrastiveDenoisingTrainer(ABC):
             path, save_state_dict, save_optimizer, model_filename
         )
 
+    def cache_encoder_outputs(
+        self, X_tab: np.ndarray, path: str, batch_size: int = 256
+    ) -> np.memmap:
+        r"""Computes the outputs of the (pre-trained) encoder, i.e. the
+        output of the model's embeddings followed by the model's encoder, and
+        writes them to disk as a `.npy` file. The file is written batch by
+        batch, so the full set of outputs is never held in memory.
+
+        The returned array can be used as the `X_tab` input of a `WideDeep`
+        model whose `deeptabular` component is a `CachedEncoderHead`, so that
+        the supervised training that follows the pre-training only runs the
+        layers after the (frozen) encoder.
+
+        Parameters
+        ----------
+        X_tab: np.ndarray,
+            tabular dataset
+        path: str
+            path to the `.npy` file where the encoder outputs will be written
+        batch_size: int, default=256
+            batch size
+
+        Returns
+        -------
+        np.memmap
+            read-only memory map of the file with the encoder outputs
+        """
+        return cache_encoder_outputs(
+            self.cd_model.model,
+            X_tab,
+            path,
+            batch_size,
+            self.device,
+            self.num_workers,
+        )
+
     def _save_history(self, path: str):
         # 'history' here refers to both, the training/evaluation history and
         #  the lr history
@@ -281,7 +321,11 @@ class BaseContrastiveDenoisingTrainer(ABC):
         if self.loss_type in ["contrastive", "both"]:
             temperature = kwargs.get("temperature", 0.1)
             reduction = kwargs.get("reduction", "mean")
-            self.contrastive_loss = InfoNCELoss(temperature, reduction)
+            chunk_size = kwargs.get("infonce_chunk_size", None)
+            max_negatives = kwargs.get("infonce_max_negatives", None)
+            self.contrastive_loss = InfoNCELoss(
+                temperature, reduction, chunk_size, max_negatives
+            )
 
         if self.loss_type in ["denoising", "both"]:
             lambda_cat = kwargs.get("lambda_cat", 1.0)
@@ -296,7 +340,7 @@ class BaseContrastiveDenoisingTrainer(ABC):
         x_cont_and_cont_: Optional[Tuple[Tensor, Tensor]],
     ) -> Tensor:
         contrastive_loss = (
-            self.contrastive_loss(g_projs)
+            self.contrastive_loss(g_projs, self.cd_model.generator)
             if self.loss_type in ["contrastive", "both"]
             else torch.tensor(0.0)
         )
@@ -26,6 +26,9 @@ from pytorch_widedeep.callbacks import (
     LRShedulerCallback,
 )
 from pytorch_widedeep.models.tabular.self_supervised import EncoderDecoderModel
+from pytorch_widedeep.self_supervised_training._encoder_outputs_cache import (
+    cache_encoder_outputs,
+)
 
 
 class BaseEncoderDecoderTrainer(ABC):
@@ -51,6 +54,7 @@ class BaseEncoderDecoderTrainer(ABC):
             encoder,
             decoder,
             masked_prob,
+            seed,
         )
         self.ed_model.to(self.device)
 
@@ -105,6 +109,42 @@ class BaseEncoderDecoderTrainer(ABC):
             path, save_state_dict, save_optimizer, model_filename
         )
 
+    def cache_encoder_outputs(
+        self, X_tab: np.ndarray, path: str, batch_size: int = 256
+    ) -> np.memmap:
+        r"""Computes the outputs of the (pre-trained) encoder, i.e. the
+        output of the model's embeddings followed by the model's encoder, and
+        writes them to disk as a `.npy` file. The file is written batch by
+        batch, so the full set of outputs is never held in memory.
+
+        The returned array can be used as the `X_tab` input of a `WideDeep`
+        model whose `deeptabular` component is a `CachedEncoderHead`, so that
+        the supervised training that follows the pre-training only runs the
+        layers after the (frozen) encoder.
+
+        Parameters
+        ----------
+        X_tab: np.ndarray,
+            tabular dataset
+        path: str
+            path to the `.npy` file where the encoder outputs will be written
+        batch_size: int, default=256
+            batch size
+
+        Returns
+        -------
+        np.memmap
+            read-only memory map of the file with the encoder outputs
+        """
+        return cache_encoder_outputs(
+            self.ed_model.encoder,
+            X_tab,
+            path,
+            batch_size,
+            self.device,
+            self.num_workers,
+        )
+
     def _save_history(self, path: str):
         # 'history' here refers to both, the training/evaluation history and
         #  the lr history
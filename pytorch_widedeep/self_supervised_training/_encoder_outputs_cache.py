@@ -0,0 +1,67 @@
+from pathlib import Path
+
+import numpy as np
+import torch
+from torch.utils.data import DataLoader, TensorDataset
+
+from pytorch_widedeep.wdtypes import (
+    Union,
+    ModelWithAttention,
+    ModelWithoutAttention,
+)
+from pytorch_widedeep.models.tabular.self_supervised.cached_encoder_head import (
+    encoder_outputs,
+)
+
+
+def cache_encoder_outputs(
+    model: Union[ModelWithAttention, ModelWithoutAttention],
+    X_tab: np.ndarray,
+    path: str,
+    batch_size: int,
+    device: str,
+    num_workers: int,
+) -> np.memmap:
+    r"""Computes the encoder outputs of a tabular model for a dataset, batch
+    by batch, and writes them to a `.npy` file, so that the full set of
+    outputs never needs to be held in memory
+
+    Returns
+    -------
+    np.memmap
+        read-only memory map of the file with the encoder outputs
+    """
+    file_path = Path(path)
+    file_path.parent.mkdir(exist_ok=True, parents=True)
+
+    loader = DataLoader(
+        dataset=TensorDataset(torch.from_numpy(X_tab)),
+        batch_size=batch_size,
+        num_workers=num_workers,
+        shuffle=False,
+    )
+
+    was_training = model.training
+    model.eval()
+
+    cache = None
+    start = 0
+    with torch.no_grad():
+        for (X,) in loader:
+            out = encoder_outputs(model, X.to(device)).float().cpu().numpy()
+            if cache is None:
+                cache = np.lib.format.open_memmap(
+                    file_path,
+                    mode="w+",
+                    dtype=np.float32,
+                    shape=(len(X_tab),) + out.shape[1:],
+                )
+            cache[start : start + len(out)] = out
+            start += len(out)
+
+    model.train(was_training)
+
+    cache.flush()  # type: ignore[union-attr]
+    del cache
+
+    return np.load(file_path, mmap_mode="r")
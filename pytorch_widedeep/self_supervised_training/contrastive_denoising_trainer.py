@@ -75,9 +75,12 @@ class ContrastiveDenoisingTrainer(BaseContrastiveDenoisingTrainer):
         If '_denoising_' loss is used, one can choose two types of 'stacked'
         MLPs to process the output from the transformer-based encoder that
         receives 'corrupted' (cut-mixed and mixed-up) features. These
-        are '_single_' or '_multiple_'. The former approach will apply a single
-        MLP to all the categorical features while the latter will use one MLP
-        per categorical feature
+        are '_single_', '_multiple_' or '_grouped_'. The first approach will
+        apply a single MLP to all the categorical features while the second
+        will use one MLP per categorical feature. '_grouped_' is equivalent to
+        '_multiple_', but the weights of all MLPs are stacked and the MLPs are
+        run at once with batched matrix multiplications, which is faster for
+        datasets with many columns
     cont_mlp_type: str, default = "multiple"
         Same as 'cat_mlp_type' but for the continuous features
     denoise_mlps_activation: str, default = "relu"
@@ -85,7 +88,10 @@ class ContrastiveDenoisingTrainer(BaseContrastiveDenoisingTrainer):
     verbose: int, default=1
         Setting it to 0 will print nothing during training.
     seed: int, default=1
-        Random seed to be used internally for train_test_split
+        Random seed to be used internally for train_test_split and for the
+        random number generator of the cut_mix and mix_up augmentations (and
+        of the groups of observations of the contrastive loss, if
+        `infonce_max_negatives` is not None)
 
     Other Parameters
     ----------------
@@ -103,6 +109,16 @@ class ContrastiveDenoisingTrainer(BaseContrastiveDenoisingTrainer):
             take a step: One of _'loss'_ or _'metric'_. The ReduceLROnPlateau
             learning rate is a bit particular.
 
+        - **infonce_chunk_size**: `int`<br/>
+            if passed, the similarity matrix of the contrastive loss is
+            computed in blocks of this number of rows, so that memory grows
+            linearly with the batch size. See `InfoNCELoss`
+
+        - **infonce_max_negatives**: `int`<br/>
+            if passed, each observation is contrasted with at most this
+            number of (randomly selected) in-batch negatives. See
+            `InfoNCELoss`
+
     """
 
     def __init__(
@@ -116,8 +132,8 @@ class ContrastiveDenoisingTrainer(BaseContrastiveDenoisingTrainer):
         projection_head1_dims: Optional[List[int]] = None,
         projection_head2_dims: Optional[List[int]] = None,
         projection_heads_activation: str = "relu",
-        cat_mlp_type: Literal["single", "multiple"] = "multiple",
-        cont_mlp_type: Literal["single", "multiple"] = "multiple",
+        cat_mlp_type: Literal["single", "multiple", "grouped"] = "multiple",
+        cont_mlp_type: Literal["single", "multiple", "grouped"] = "multiple",
         denoise_mlps_activation: str = "relu",
         verbose: int = 1,
         seed: int = 1,
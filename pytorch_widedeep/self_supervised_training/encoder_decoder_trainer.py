@@ -57,7 +57,8 @@ class EncoderDecoderTrainer(BaseEncoderDecoderTrainer):
     verbose: int, default=1
         Setting it to 0 will print nothing during training.
     seed: int, default=1
-        Random seed to be used internally for train_test_split
+        Random seed to be used internally for train_test_split and for the
+        random number generator of the masks of the features to reconstruct
 
     Other Parameters
     ----------------
@@ -1,10 +1,12 @@
 from abc import ABC, abstractmethod
+from itertools import chain
 
 import numpy as np
 import torch
 from scipy.sparse import csc_matrix
 from torch.utils.data import DataLoader
 
+from pytorch_widedeep.models import capture_attention_weights
 from pytorch_widedeep.wdtypes import (
     Any,
     Dict,
@@ -54,20 +56,21 @@ __all__ = ["FeatureImportance", "Explainer"]
 
 
 class FeatureImportance:
-    def __init__(self, device: str, n_samples: int = 1000):
+    def __init__(self, device: str, n_samples: int = 1000, seed: int = 1):
         self.device = device
         self.n_samples = n_samples
+        self.seed = seed
 
     def feature_importance(
         self, loader: DataLoader, model: WideDeep
     ) -> Dict[str, float]:
         if model.is_tabnet:
             model_feat_importance: ModelFeatureImportance = TabNetFeatureImportance(
-                self.device, self.n_samples
+                self.device, self.n_samples, self.seed
             )
         elif isinstance(model.deeptabular._modules["0"], TransformerBasedModels):
             model_feat_importance = TransformerBasedFeatureImportance(
-                self.device, self.n_samples
+                self.device, self.n_samples, self.seed
             )
         else:
             raise ValueError(
@@ -78,9 +81,22 @@ class FeatureImportance:
 
 
 class Explainer:
+    """Computes the per-row explanations and caches them.
+
+    The results are cached per row and per 'model version'. The model version
+    changes every time any parameter or buffer of the model is modified (e.g.
+    after an optimizer step or when loading a state dict), in which case the
+    cache is emptied. Therefore, repeated calls on the same rows are free and
+    only the rows that have not been explained yet are passed through the
+    model.
+    """
+
     def __init__(self, device: str):
         self.device = device
 
+        self._cache: Dict[Tuple[bytes, bool], Any] = {}
+        self._model_version: Optional[Tuple[int, int]] = None
+
     def explain(
         self,
         model: WideDeep,
@@ -88,6 +104,42 @@ class Explainer:
         num_workers: int,
         batch_size: Optional[int] = None,
         save_step_masks: Optional[bool] = None,
+    ) -> Union[Tuple, np.ndarray]:
+        model_version = self._get_model_version(model)
+        if model_version != self._model_version:
+            self._cache = {}
+            self._model_version = model_version
+
+        keys = [
+            (row.tobytes(), bool(save_step_masks))
+            for row in np.ascontiguousarray(X_tab)
+        ]
+
+        # rows not seen before (and not duplicated within X_tab)
+        missing: Dict[Tuple[bytes, bool], int] = {}
+        for i, key in enumerate(keys):
+            if key not in self._cache and key not in missing:
+                missing[key] = i
+
+        if len(missing) > 0:
+            res = self._explain(
+                model,
+                X_tab[list(missing.values())],
+                num_workers,
+                batch_size,
+                save_step_masks,
+            )
+            self._update_cache(list(missing.keys()), res, save_step_masks)
+
+        return self._from_cache(keys, save_step_masks)
+
+    def _explain(
+        self,
+        model: WideDeep,
+        X_tab: np.ndarray,
+        num_workers: int,
+        batch_size: Optional[int] = None,
+        save_step_masks: Optional[bool] = None,
     ) -> Union[Tuple, np.ndarray]:
         if model.is_tabnet:
             assert (
@@ -116,11 +168,50 @@ class Explainer:
 
         return res
 
+    def _update_cache(
+        self,
+        keys: List[Tuple[bytes, bool]],
+        res: Union[Tuple, np.ndarray],
+        save_step_masks: Optional[bool],
+    ):
+        if save_step_masks:
+            m_explain, m_explain_step = res
+            for i, key in enumerate(keys):
+                self._cache[key] = (
+                    m_explain[i],
+                    {k: v[i] for k, v in m_explain_step.items()},
+                )
+        else:
+            for i, key in enumerate(keys):
+                self._cache[key] = res[i]
+
+    def _from_cache(
+        self, keys: List[Tuple[bytes, bool]], save_step_masks: Optional[bool]
+    ) -> Union[Tuple, np.ndarray]:
+        cached = [self._cache[key] for key in keys]
+        if save_step_masks:
+            m_explain, m_explain_step = zip(*cached)
+            return np.vstack(m_explain), {
+                k: np.vstack([step[k] for step in m_explain_step])
+                for k in m_explain_step[0].keys()
+            }
+        else:
+            return np.vstack(cached)
+
+    @staticmethod
+    def _get_model_version(model: WideDeep) -> Tuple[int, int]:
+        # every in-place modification of a tensor (optimizer steps,
+        # 'load_state_dict', etc) increments its version counter
+        return id(model), sum(
+            t._version for t in chain(model.parameters(), model.buffers())
+        )
+
 
 class BaseFeatureImportance(ABC):
-    def __init__(self, device: str, n_samples: int = 1000):
+    def __init__(self, device: str, n_samples: int = 1000, seed: int = 1):
         self.device = device
         self.n_samples = n_samples
+        self.seed = seed
 
     @abstractmethod
     def feature_importance(
@@ -131,23 +222,40 @@ class BaseFeatureImportance(ABC):
         )
 
     def _sample_data(self, loader: DataLoader) -> Tensor:
-        n_iterations = self.n_samples // loader.batch_size
-
-        batches = []
-        for i, (data, _) in enumerate(loader):
-            if i < n_iterations:
-                batches.append(data["deeptabular"].to(self.device))
-            else:
+        # if the dataset holds the tabular array, the rows are sampled
+        # directly, without iterating over the (possibly shuffled and
+        # worker-backed) loader
+        X_tab = getattr(loader.dataset, "X_tab", None)
+        if isinstance(X_tab, np.ndarray):
+            n_samples = min(self.n_samples, len(X_tab))
+            idx = np.random.default_rng(self.seed).choice(
+                len(X_tab), n_samples, replace=False
+            )
+            return torch.from_numpy(X_tab[np.sort(idx)])
+
+        batches: List[Tensor] = []
+        n_rows = 0
+        for data, _ in loader:
+            batches.append(data["deeptabular"])
+            n_rows += batches[-1].size(0)
+            if n_rows >= self.n_samples:
                 break
 
-        return torch.cat(batches, dim=0)
+        return torch.cat(batches, dim=0)[: self.n_samples]
+
+    def _chunks(self, loader: DataLoader) -> Tuple[Tensor, ...]:
+        # the sampled data is passed through the model in chunks of
+        # 'batch_size' rows so that the memory footprint is bounded
+        chunk_size = loader.batch_size if loader.batch_size is not None else 1
+        return self._sample_data(loader).split(chunk_size)
 
 
 class TabNetFeatureImportance(BaseFeatureImportance):
-    def __init__(self, device: str, n_samples: int = 1000):
+    def __init__(self, device: str, n_samples: int = 1000, seed: int = 1):
         super().__init__(
             device=device,
             n_samples=n_samples,
+            seed=seed,
         )
 
     def feature_importance(
@@ -159,9 +267,10 @@ class TabNetFeatureImportance(BaseFeatureImportance):
         model_backbone = list(model.deeptabular.children())[0]
         feat_imp = np.zeros((model_backbone.embed_out_dim))  # type: ignore[arg-type]
 
-        X = self._sample_data(loader)
-        M_explain, _ = model_backbone.forward_masks(X)  # type: ignore[operator]
-        feat_imp += M_explain.sum(dim=0).cpu().detach().numpy()
+        with torch.no_grad():
+            for X in self._chunks(loader):
+                M_explain, _ = model_backbone.forward_masks(X.to(self.device))  # type: ignore[operator]
+                feat_imp += M_explain.sum(dim=0).cpu().numpy()
         feat_imp = csc_matrix.dot(feat_imp, reducing_matrix)
         feat_imp = feat_imp / np.sum(feat_imp)
 
@@ -169,10 +278,11 @@ class TabNetFeatureImportance(BaseFeatureImportance):
 
 
 class TransformerBasedFeatureImportance(BaseFeatureImportance):
-    def __init__(self, device: str, n_samples: int = 1000):
+    def __init__(self, device: str, n_samples: int = 1000, seed: int = 1):
         super().__init__(
             device=device,
             n_samples=n_samples,
+            seed=seed,
         )
 
     def feature_importance(
@@ -181,14 +291,18 @@ class TransformerBasedFeatureImportance(BaseFeatureImportance):
         self._check_inputs(model)
         self.model_type = self._model_type(model)
 
-        X = self._sample_data(loader)
-
         model.eval()
-        _ = model.deeptabular(X)
 
-        feature_importance, column_idx = self._feature_importance(model)
+        feat_imp_sum: Union[int, Tensor] = 0
+        n_rows = 0
+        with torch.no_grad(), capture_attention_weights(model.deeptabular):
+            for X in self._chunks(loader):
+                _ = model.deeptabular(X.to(self.device))
+                feature_importance, column_idx = self._feature_importance(model)
+                feat_imp_sum = feat_imp_sum + feature_importance.sum(0)
+                n_rows += feature_importance.size(0)
 
-        agg_feature_importance = feature_importance.mean(0).cpu().detach().numpy()
+        agg_feature_importance = (feat_imp_sum / n_rows).cpu().numpy()  # type: ignore[union-attr]
 
         return {k: v for k, v in zip(column_idx, agg_feature_importance)}
 
@@ -308,7 +422,8 @@ class TabNetExplainer:
         m_explain_l = []
         for batch_nb, data in enumerate(loader):
             X = data["deeptabular"].to(self.device)
-            M_explain, masks = model_backbone.forward_masks(X)  # type: ignore[operator]
+            with torch.no_grad():
+                M_explain, masks = model_backbone.forward_masks(X)  # type: ignore[operator]
             m_explain_l.append(
                 csc_matrix.dot(M_explain.cpu().detach().numpy(), reducing_matrix)
             )
@@ -364,7 +479,8 @@ class TransformerBasedExplainer(TransformerBasedFeatureImportance):
         batch_feat_imp: Any = []
         for _, data in enumerate(loader):
             X = data["deeptabular"].to(self.device)
-            _ = model.deeptabular(X)
+            with torch.no_grad(), capture_attention_weights(model.deeptabular):
+                _ = model.deeptabular(X)
 
             feat_imp, _ = self._feature_importance(model)
 
@@ -203,6 +203,10 @@ def wd_train_val_split(  # noqa: C901
             X_tr, X_val = _wd_train_val_split_component(
                 X_train, X_tr, X_val, idx_tr, idx_val, "X_text"
             )
+        if "X_text_mask" in X_train.keys():
+            X_tr, X_val = _wd_train_val_split_component(
+                X_train, X_tr, X_val, idx_tr, idx_val, "X_text_mask"
+            )
         if "X_img" in X_train.keys():
             X_tr, X_val = _wd_train_val_split_component(
                 X_train, X_tr, X_val, idx_tr, idx_val, "X_img"
@@ -225,15 +229,15 @@ def _wd_train_val_split_component(
     X_val: Dict[str, Union[np.ndarray, List[np.ndarray]]],
     idx_tr: Any,  # is a numpy array but sklearn's train_test_split returns a non-sensical type
     idx_val: Any,
-    component_type: Literal["X_wide", "X_tab", "X_text", "X_img"],
+    component_type: Literal["X_wide", "X_tab", "X_text", "X_text_mask", "X_img"],
 ) -> Tuple[
     Dict[str, Union[np.ndarray, List[np.ndarray]]],
     Dict[str, Union[np.ndarray, List[np.ndarray]]],
 ]:
     if isinstance(X[component_type], list):
         X_tr[component_type], X_val[component_type] = (
-            [X[component_type][i][idx_tr] for i in range(len(X[component_type]))],
-            [X[component_type][i][idx_val] for i in range(len(X[component_type]))],
+            [X_c[idx_tr] if X_c is not None else None for X_c in X[component_type]],
+            [X_c[idx_val] if X_c is not None else None for X_c in X[component_type]],
         )
     else:
         X_tr[component_type], X_val[component_type] = (
@@ -1,12 +1,14 @@
 from typing import List, Union
+from functools import partial
 
 import numpy as np
 import torch
 from sklearn.utils import Bunch
-from torch.utils.data import Dataset
+from torch.utils.data import Dataset, default_collate
 from torchvision.transforms import Compose
 
-from pytorch_widedeep.wdtypes import Optional, Transforms
+from pytorch_widedeep.wdtypes import Any, Callable, Optional, Transforms
+from pytorch_widedeep.utils.text_utils import RaggedText
 
 
 class WideDeepDataset(Dataset):
@@ -19,29 +21,49 @@ class WideDeepDataset(Dataset):
         wide input
     X_tab: np.ndarray or List[np.ndarray]
         deeptabular input
-    X_text: np.ndarray or List[np.ndarray]
-        deeptext input
+    X_text: np.ndarray, RaggedText or List[np.ndarray | RaggedText]
+        deeptext input. If a `RaggedText` object is passed, the sequences in
+        each batch are padded (at the end) only up to the length of the
+        longest sequence in the batch, and the length of each sequence is
+        included in the batch under the _'deeptext_lengths'_ key (see the
+        `collate_fn` attribute)
     X_img: np.ndarray or List[np.ndarray]
         deepimage input
     target: np.ndarray
         target array
     transforms: Optional[Transforms | Compose]
         torchvision Compose object. See models/_multiple_transforms.py
+    X_text_mask: np.ndarray or List[np.ndarray], Optional
+        attention mask of the deeptext input (e.g. as returned by the
+        `HFPreprocessor`). If `X_text` is a list, this must be a list of the
+        same length, where the elements corresponding to text inputs without
+        a mask can be `None`
+
+    Attributes
+    ----------
+    collate_fn: Callable, Optional
+        function to collate the samples into batches when the text input
+        includes `RaggedText` objects (see `collate_ragged_text`). `None`
+        otherwise, i.e. the default collate function is used
     """
 
     def __init__(
         self,
         X_wide: Optional[np.ndarray] = None,
         X_tab: Optional[Union[np.ndarray, List[np.ndarray]]] = None,
-        X_text: Optional[Union[np.ndarray, List[np.ndarray]]] = None,
+        X_text: Optional[
+            Union[np.ndarray, RaggedText, List[Union[np.ndarray, RaggedText]]]
+        ] = None,
         X_img: Optional[Union[np.ndarray, List[np.ndarray]]] = None,
         target: Optional[np.ndarray] = None,
         transforms: Optional[Union[Transforms, Compose]] = None,
+        X_text_mask: Optional[Union[np.ndarray, List[Optional[np.ndarray]]]] = None,
     ):
         super(WideDeepDataset, self).__init__()
         self.X_wide = X_wide
         self.X_tab = X_tab
         self.X_text = X_text
+        self.X_text_mask = X_text_mask
         self.X_img = X_img
         self.transforms = transforms
         if self.transforms:
@@ -54,6 +76,7 @@ class WideDeepDataset(Dataset):
         else:
             self.transforms_names = []
         self.Y = target
+        self.collate_fn = self._set_collate_fn()
 
     def __getitem__(self, idx: int):  # noqa: C901
         x = Bunch()
@@ -69,6 +92,16 @@ class WideDeepDataset(Dataset):
                 x.deeptext = [self.X_text[i][idx] for i in range(len(self.X_text))]
             else:
                 x.deeptext = self.X_text[idx]
+        if self.X_text_mask is not None:
+            if isinstance(self.X_text_mask, list):
+                # text inputs without a mask get an empty one, which the
+                # model ignores, so that all samples can be collated
+                x.deeptext_mask = [
+                    m[idx] if m is not None else np.empty(0, dtype=np.int8)
+                    for m in self.X_text_mask
+                ]
+            else:
+                x.deeptext_mask = self.X_text_mask[idx]
         if self.X_img is not None:
             if isinstance(self.X_img, list):
                 x.deepimage = [
@@ -111,6 +144,22 @@ class WideDeepDataset(Dataset):
             xdi = self.transforms(torch.tensor(xdi))
         return xdi
 
+    def _set_collate_fn(self) -> Optional[Callable]:
+        if isinstance(self.X_text, list):
+            padding_idx: Any = [
+                X_t.padding_idx if isinstance(X_t, RaggedText) else None
+                for X_t in self.X_text
+            ]
+            is_ragged = any(p is not None for p in padding_idx)
+        else:
+            is_ragged = isinstance(self.X_text, RaggedText)
+            padding_idx = (
+                self.X_text.padding_idx if isinstance(self.X_text, RaggedText) else None
+            )
+        return (
+            partial(collate_ragged_text, padding_idx=padding_idx) if is_ragged else None
+        )
+
     def __len__(self):
         if self.X_wide is not None:
             return len(self.X_wide)
@@ -129,3 +178,65 @@ class WideDeepDataset(Dataset):
                 return len(self.X_img[0])
             else:
                 return len(self.X_img)
+
+
+def collate_ragged_text(
+    batch: List, padding_idx: Union[Optional[int], List[Optional[int]]]
+) -> Any:
+    r"""Collates a list of samples where (some of) the text inputs are
+    sequences of different lengths (see `RaggedText`). These are padded, at
+    the end, up to the length of the longest sequence in the batch and the
+    lengths of the sequences are added to the batch under the
+    _'deeptext_lengths'_ key. The remaining inputs are collated as usual.
+
+    Parameters
+    ----------
+    batch: List
+        list of samples as returned by the `WideDeepDataset`
+    padding_idx: int or List[int], Optional
+        padding index of the text input. If the text input is a list, a list
+        with the padding index of each text input, where those that are not
+        ragged (i.e. are already padded) are `None`
+    """
+    has_target = isinstance(batch[0], tuple)
+    samples = [b[0] for b in batch] if has_target else batch
+
+    is_list = isinstance(padding_idx, list)
+    texts = [s.pop("deeptext") for s in samples]
+    out = default_collate(batch)
+    X = out[0] if has_target else out
+
+    if is_list:
+        X["deeptext"], X["deeptext_lengths"] = map(
+            list,
+            zip(
+                *[
+                    _collate_text_input([t[i] for t in texts], pad_idx)
+                    for i, pad_idx in enumerate(padding_idx)  # type: ignore[arg-type]
+                ]
+            ),
+        )
+    else:
+        X["deeptext"], X["deeptext_lengths"] = _collate_text_input(
+            texts, padding_idx  # type: ignore[arg-type]
+        )
+
+    return out
+
+
+def _collate_text_input(texts: List[np.ndarray], padding_idx: Optional[int]):
+    if padding_idx is None:
+        # not ragged: lengths are not needed, and an empty tensor (which the
+        # model ignores) is used, so that all text inputs can be collated
+        return default_collate(texts), torch.empty(0, dtype=torch.long)
+
+    lengths = torch.tensor([len(t) for t in texts], dtype=torch.long)
+    max_len = max(int(lengths.max()), 1)
+
+    flat_ids = torch.from_numpy(np.concatenate(texts))
+    padded = torch.full((len(texts), max_len), padding_idx, dtype=flat_ids.dtype)
+    # with the padding at the end, the positions of the tokens in the padded
+    # batch are, in row-major order, those in front of each sequence length
+    padded[torch.arange(max_len).unsqueeze(0) < lengths.unsqueeze(1)] = flat_ids
+
+    return padded, lengths
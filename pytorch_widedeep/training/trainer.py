@@ -1,4 +1,5 @@
 import json
+import warnings
 from pathlib import Path
 
 import numpy as np
@@ -10,8 +11,10 @@ from torchmetrics import Metric as TorchMetric
 from torch.utils.data import DataLoader
 
 from pytorch_widedeep.losses import ZILNLoss
+from pytorch_widedeep.models import tabnet_inference_mode
 from pytorch_widedeep.metrics import Metric
 from pytorch_widedeep.wdtypes import (
+    Any,
     Dict,
     List,
     Union,
@@ -24,6 +27,7 @@ from pytorch_widedeep.wdtypes import (
     LRScheduler,
 )
 from pytorch_widedeep.callbacks import Callback
+from pytorch_widedeep.dataloaders import DataLoaderBucketed
 from pytorch_widedeep.initializers import Initializer
 from pytorch_widedeep.training._finetune import FineTune
 from pytorch_widedeep.utils.general_utils import alias
@@ -305,7 +309,11 @@ class Trainer(BaseTrainer):
             Input for the `deeptext` model component.
             See `pytorch_widedeep.preprocessing.TextPreprocessor`.
             If multiple text columns/models are used, this should be a list of
-            numpy arrays
+            numpy arrays. The texts can also be passed as a
+            `pytorch_widedeep.utils.RaggedText` object (see the
+            `transform` method of the `TextPreprocessor`), in which case each
+            batch is padded only up to its longest text, and the lengths of
+            the texts are passed to the text model
         X_img: np.ndarray, Optional. default=None
             Input for the `deepimage` model component.
             See `pytorch_widedeep.preprocessing.ImagePreprocessor`.
@@ -316,7 +324,10 @@ class Trainer(BaseTrainer):
             _'X_wide'_, _'X_tab'_, _'X_text'_, _'X_img'_ and _'target'_. Values
             are the corresponding matrices. Note that of multiple text or image
             columns/models are used, the corresponding values should be lists
-            of numpy arrays
+            of numpy arrays. The dictionary can also include the attention
+            mask of the text inputs under the _'X_text_mask'_ key (see the
+            `encode` method of the `HFPreprocessor`), which will be passed to
+            the `HFModel`
         X_val: Dict, Optional. default=None
             The validation dataset can also be passed in a dictionary. Keys
             are _'X_wide'_, _'X_tab'_, _'X_text'_, _'X_img'_ and _'target'_.
@@ -419,6 +430,7 @@ class Trainer(BaseTrainer):
         """
 
         dataloader_args, finetune_args = self._extract_kwargs(kwargs)
+        self._drop_bucketing_args(dataloader_args, custom_dataloader)
 
         self.batch_size = batch_size
 
@@ -435,6 +447,9 @@ class Trainer(BaseTrainer):
             target,
             self.transforms,
         )
+        if train_set.collate_fn is not None:
+            # i.e. ragged text inputs, see the 'WideDeepDataset'
+            dataloader_args.setdefault("collate_fn", train_set.collate_fn)
         if custom_dataloader is not None:
             # make sure is callable (and HAS to be an subclass of DataLoader)
             assert isinstance(custom_dataloader, type)
@@ -458,6 +473,7 @@ class Trainer(BaseTrainer):
                 batch_size=batch_size,
                 num_workers=self.num_workers,
                 shuffle=False,
+                collate_fn=eval_set.collate_fn,
             )
             eval_steps = len(eval_loader)
 
@@ -523,7 +539,7 @@ class Trainer(BaseTrainer):
 
         if feature_importance_sample_size is not None:
             self.feature_importance = FeatureImportance(
-                self.device, feature_importance_sample_size
+                self.device, feature_importance_sample_size, self.seed
             ).feature_importance(train_loader, self.model)
         self._restore_best_weights()
         self.model.train()
@@ -739,9 +755,12 @@ class Trainer(BaseTrainer):
     def explain(self, X_tab: np.ndarray, save_step_masks: Optional[bool] = None):
         # TO DO: Add docs to this, to the feat imp parameter and the all
         # related classes
-        explainer = Explainer(self.device)
 
-        res = explainer.explain(
+        # the explainer is kept so that its cache persists across calls
+        if not hasattr(self, "explainer"):
+            self.explainer = Explainer(self.device)
+
+        res = self.explainer.explain(
             self.model, X_tab, self.num_workers, self.batch_size, save_step_masks
         )
 
@@ -1019,6 +1038,7 @@ class Trainer(BaseTrainer):
             batch_size=self.batch_size,
             num_workers=self.num_workers,
             shuffle=False,
+            collate_fn=test_set.collate_fn,
         )
         test_steps = (len(test_loader.dataset) // test_loader.batch_size) + 1  # type: ignore[arg-type]
 
@@ -1033,7 +1053,8 @@ class Trainer(BaseTrainer):
         else:
             prediction_iters = 1
 
-        with torch.no_grad():
+        # the sparsity regularization term of TabNet models is not needed
+        with torch.no_grad(), tabnet_inference_mode(self.model):
             with trange(uncertainty_granularity, disable=uncertainty is False) as t:
                 for _, _ in zip(t, range(prediction_iters)):
                     t.set_description("predict_UncertaintyIter")
@@ -1085,6 +1106,24 @@ class Trainer(BaseTrainer):
         ziln_preds = positive_probs * torch.exp(loc + 0.5 * torch.square(scale))
         return ziln_preds
 
+    @staticmethod
+    def _drop_bucketing_args(
+        dataloader_args: Dict[str, Any], custom_dataloader: Optional[DataLoader]
+    ):
+        # these are only accepted by the 'DataLoaderBucketed'
+        if isinstance(custom_dataloader, type) and issubclass(
+            custom_dataloader, DataLoaderBucketed
+        ):
+            return
+        for arg in ["padding_idx", "bucket_size_mul"]:
+            if arg in dataloader_args:
+                del dataloader_args[arg]
+                warnings.warn(
+                    f"'{arg}' is only used with 'custom_dataloader=DataLoaderBucketed' "
+                    "and will be ignored",
+                    UserWarning,
+                )
+
     @staticmethod
     def _extract_kwargs(kwargs):
         dataloader_params = [
@@ -1101,6 +1140,8 @@ class Trainer(BaseTrainer):
             "prefetch_factor",
             "persistent_workers",
             "oversample_mul",
+            "padding_idx",
+            "bucket_size_mul",
         ]
         finetune_params = [
             "n_epochs",
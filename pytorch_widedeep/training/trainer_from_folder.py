@@ -7,6 +7,7 @@ from torchmetrics import Metric as TorchMetric
 from torch.utils.data import DataLoader
 
 from pytorch_widedeep.losses import ZILNLoss
+from pytorch_widedeep.models import tabnet_inference_mode
 from pytorch_widedeep.metrics import Metric
 from pytorch_widedeep.wdtypes import (
     Dict,
@@ -656,7 +657,8 @@ class TrainerFromFolder(BaseTrainer):
         else:
             prediction_iters = 1
 
-        with torch.no_grad():
+        # the sparsity regularization term of TabNet models is not needed
+        with torch.no_grad(), tabnet_inference_mode(self.model):
             with trange(uncertainty_granularity, disable=uncertainty is False) as t:
                 for _, _ in zip(t, range(prediction_iters)):
                     t.set_description("predict_UncertaintyIter")
@@ -1,7 +1,10 @@
 from pytorch_widedeep.utils.text_utils import (
+    RaggedText,
     get_texts,
     pad_sequences,
     simple_preprocess,
+    pad_sequences_batch,
+    convert_word_vectors,
     build_embeddings_matrix,
 )
 from pytorch_widedeep.utils.image_utils import (
@@ -1,10 +1,11 @@
+import math
 import warnings
 
 import numpy as np
 import pandas as pd
 from sklearn.exceptions import NotFittedError
 
-from pytorch_widedeep.wdtypes import Dict, List, Optional
+from pytorch_widedeep.wdtypes import Dict, List, Union, Optional
 from pytorch_widedeep.utils.general_utils import alias
 
 warnings.filterwarnings("ignore")
@@ -35,6 +36,18 @@ class LabelEncoder:
         distinguish the classes in one column from those in the
         other columns_'. In other words, the idea is to let the model learn
         which column is embedded at the time. See: `pytorch_widedeep.models.transformers._layers.SharedEmbeddings`.
+    min_freq: int or float, Optional, default = None
+        If not `None`, categories that appear less than `min_freq` times (if
+        `int`) or in less than a fraction `min_freq` of the rows (if `float`)
+        are collapsed into a single, shared, _'rare'_ bucket per column. The
+        frequencies are accumulated through the successive calls to
+        `partial_fit` and the buckets are built when the fitting process
+        finishes (see `collapse_rare_categories`).
+    with_value_counts: bool, default = False
+        Boolean indicating whether to keep the number of times each category
+        has been seen (see the `value_counts` attribute). The counts are
+        always kept if `min_freq` is not `None`, since they are needed to
+        identify the rare categories.
 
     Attributes
     ----------
@@ -44,6 +57,15 @@ class LabelEncoder:
     inverse_encoding_dict : Dict
         Dictionary containing the inverse encoding mappings in the format, e.g. : <br/>
         `{'colname1': {1: 'cat1', 2: 'cat2', ...}, 'colname2': {1: 'cat1', 2: 'cat2', ...}, ...}`
+    value_counts : Dict
+        Dictionary containing the number of times each category has been
+        seen during the fitting process, e.g. : <br/>
+        `{'colname1': {'cat1': 120, 'cat2': 3, ...}, ...}`. Empty unless
+        `with_value_counts = True` or `min_freq` is not `None`
+    rare_idx : Dict
+        Dictionary with the index of the shared _'rare'_ bucket per column.
+        Only columns with at least one rare category are included. Only
+        generated if `min_freq` is not `None`
 
     """
 
@@ -53,14 +75,24 @@ class LabelEncoder:
         columns_to_encode: Optional[List[str]] = None,
         with_attention: bool = False,
         shared_embed: bool = False,
+        min_freq: Optional[Union[int, float]] = None,
+        with_value_counts: bool = False,
     ):
         self.columns_to_encode = columns_to_encode
 
         self.shared_embed = shared_embed
         self.with_attention = with_attention
+        self.min_freq = min_freq
+        self.with_value_counts = with_value_counts
 
         self.reset_embed_idx = not self.with_attention or self.shared_embed
 
+        self.value_counts: Dict[str, Dict[str, int]] = {}
+        self.n_samples_seen: int = 0
+        # cached so that it does not need to go through the whole encoding
+        # every time new categories are added
+        self._max_idx_per_col: Dict[str, int] = {}
+
     def partial_fit(self, df: pd.DataFrame) -> "LabelEncoder":  # noqa: C901
         """Main method. Creates encoding attributes.
 
@@ -84,6 +116,9 @@ class LabelEncoder:
         for c in self.columns_to_encode:
             unique_column_vals[c] = df[c].unique().tolist()
 
+        if self.with_value_counts or self.min_freq is not None:
+            self._update_value_counts(df)
+
         if not hasattr(self, "encoding_dict"):
             # we run the method 'partial_fit' for the 1st time
             self.encoding_dict: Dict[str, Dict[str, int]] = {}
@@ -104,36 +139,7 @@ class LabelEncoder:
             if "cls_token" in unique_column_vals and self.shared_embed:
                 del unique_column_vals["cls_token"]
 
-            # Classes in the new df/chunk of the dataset that have not been seen
-            # before
-            unseen_classes: Dict[str, List[str]] = {}
-            for c in self.columns_to_encode:
-                unseen_classes[c] = list(
-                    np.setdiff1d(
-                        unique_column_vals[c], list(self.encoding_dict[c].keys())
-                    )
-                )
-
-            # leave 0 for padding/"unseen" categories
-            for k, v in unique_column_vals.items():
-                # if we use attention we need to start encoding from the
-                # last 'overall' encoding index. Otherwise, we use the max
-                # encoding index per categorical col
-                _idx = (
-                    max(self.encoding_dict[k].values()) + 1
-                    if self.reset_embed_idx
-                    else self.cum_idx
-                )
-                if len(unseen_classes[k]) != 0:
-                    for i, o in enumerate(unseen_classes[k]):
-                        if o not in self.encoding_dict[k]:
-                            self.encoding_dict[k][o] = i + _idx
-                    # if self.reset_embed_idx is True it will be 1 anyway
-                    self.cum_idx = (
-                        1
-                        if self.reset_embed_idx
-                        else self.cum_idx + len(unseen_classes[k])
-                    )
+            self._add_unseen_categories(unique_column_vals)
 
         return self
 
@@ -149,6 +155,9 @@ class LabelEncoder:
         # we do not want to mutate the original df, so we copy it
         self.partial_fit(df.copy())
 
+        if self.min_freq is not None:
+            self.collapse_rare_categories()
+
         self.inverse_encoding_dict = self.create_inverse_encoding_dict()
 
         return self
@@ -206,13 +215,147 @@ class LabelEncoder:
         """
         return self.fit(df).transform(df)
 
+    def merge(self, other: "LabelEncoder") -> "LabelEncoder":
+        """Merges the state of another `LabelEncoder` that has been partially
+        fitted (via `partial_fit`) on a different chunk of the data. The
+        categories not seen before are appended to the encoding in the same
+        way as `partial_fit` does, and the value counts are added up. Merging
+        the encoders fitted on each chunk, in order, results in the same
+        encoding as running `partial_fit` sequentially over the chunks.
+
+        Parameters
+        ----------
+        other: LabelEncoder
+            `LabelEncoder` partially fitted on another chunk of the data
+
+        Returns
+        -------
+        LabelEncoder
+            `LabelEncoder` with the merged state
+        """
+        if not hasattr(other, "encoding_dict"):
+            return self
+
+        if not hasattr(self, "encoding_dict"):
+            self.columns_to_encode = other.columns_to_encode
+            self.encoding_dict = {k: v.copy() for k, v in other.encoding_dict.items()}
+            self.cum_idx = other.cum_idx
+            self.value_counts = {k: v.copy() for k, v in other.value_counts.items()}
+            self.n_samples_seen = other.n_samples_seen
+            return self
+
+        # the categories in the order they were seen by the other encoder
+        unique_column_vals: Dict[str, List[str]] = {
+            c: sorted(enc, key=enc.__getitem__)
+            for c, enc in other.encoding_dict.items()
+            if not (c == "cls_token" and self.shared_embed)
+        }
+        self._add_unseen_categories(unique_column_vals)
+
+        for c, counts in other.value_counts.items():
+            col_counts = self.value_counts.setdefault(c, {})
+            for o, n in counts.items():
+                col_counts[o] = col_counts.get(o, 0) + n
+        self.n_samples_seen += other.n_samples_seen
+
+        return self
+
+    def collapse_rare_categories(self) -> "LabelEncoder":
+        """Collapses the categories seen less than `min_freq` times into a
+        single _'rare'_ bucket per column and re-indexes the remaining ones
+        so that the encoding indexes remain contiguous. This method runs
+        automatically at the end of `fit`. When fitting in chunks via
+        `partial_fit`, it must run once all chunks have been seen.
+
+        Returns
+        -------
+        LabelEncoder
+            `LabelEncoder` fitted object
+        """
+        min_count = self._min_count()
+
+        self.rare_idx: Dict[str, int] = {}
+        self._max_idx_per_col = {}
+        cum_idx = 1
+        for col, encoding in self.encoding_dict.items():
+            # with 'shared_embed' the 'cls_token' col is not counted
+            if col not in self.value_counts:
+                continue
+            counts = self.value_counts[col]
+            # preserve the order in which the categories were first seen
+            categories = sorted(encoding, key=encoding.__getitem__)
+            frequent = [o for o in categories if counts.get(o, 0) >= min_count]
+            rare = [o for o in categories if counts.get(o, 0) < min_count]
+
+            _idx = 1 if self.reset_embed_idx else cum_idx
+            new_encoding = {o: i + _idx for i, o in enumerate(frequent)}
+            if len(rare) > 0:
+                self.rare_idx[col] = _idx + len(frequent)
+                new_encoding.update({o: self.rare_idx[col] for o in rare})
+            self.encoding_dict[col] = new_encoding
+
+            cum_idx += len(frequent) + int(len(rare) > 0)
+
+        self.cum_idx = 1 if self.reset_embed_idx else cum_idx
+
+        return self
+
     def create_inverse_encoding_dict(self) -> Dict[str, Dict[int, str]]:
         inverse_encoding_dict = dict()
         for c in self.encoding_dict:
             inverse_encoding_dict[c] = {v: k for k, v in self.encoding_dict[c].items()}
             inverse_encoding_dict[c][0] = "unseen"
+            if hasattr(self, "rare_idx") and c in self.rare_idx:
+                inverse_encoding_dict[c][self.rare_idx[c]] = "rare"
         return inverse_encoding_dict
 
+    def _add_unseen_categories(self, unique_column_vals: Dict[str, List[str]]):
+        # Classes in the new df/chunk of the dataset that have not been seen
+        # before, in the order they appear. Membership is checked against the
+        # encoding dict itself so the cost is proportional to the number of
+        # unique values in the chunk and not to the size of the encoding
+        unseen_classes: Dict[str, List[str]] = {}
+        for c in self.columns_to_encode:  # type: ignore[union-attr]
+            if c not in unique_column_vals:
+                continue
+            encoding = self.encoding_dict[c]
+            unseen_classes[c] = [o for o in unique_column_vals[c] if o not in encoding]
+
+        # leave 0 for padding/"unseen" categories
+        for k, v in unique_column_vals.items():
+            # if we use attention we need to start encoding from the
+            # last 'overall' encoding index. Otherwise, we use the max
+            # encoding index per categorical col
+            if len(unseen_classes[k]) != 0:
+                _idx = self._max_idx(k) + 1 if self.reset_embed_idx else self.cum_idx
+                for i, o in enumerate(unseen_classes[k]):
+                    self.encoding_dict[k][o] = i + _idx
+                if self.reset_embed_idx:
+                    self._max_idx_per_col[k] = _idx + len(unseen_classes[k]) - 1
+                # if self.reset_embed_idx is True it will be 1 anyway
+                self.cum_idx = (
+                    1 if self.reset_embed_idx else self.cum_idx + len(unseen_classes[k])
+                )
+
+    def _max_idx(self, col: str) -> int:
+        if col not in self._max_idx_per_col:
+            self._max_idx_per_col[col] = max(self.encoding_dict[col].values())
+        return self._max_idx_per_col[col]
+
+    def _update_value_counts(self, df: pd.DataFrame):
+        self.n_samples_seen += df.shape[0]
+        for c in self.columns_to_encode:  # type: ignore[union-attr]
+            if c == "cls_token" and self.shared_embed:
+                continue
+            col_counts = self.value_counts.setdefault(c, {})
+            for o, n in df[c].value_counts(dropna=False).items():
+                col_counts[o] = col_counts.get(o, 0) + n
+
+    def _min_count(self) -> int:
+        if isinstance(self.min_freq, float):
+            return math.ceil(self.min_freq * self.n_samples_seen)
+        return self.min_freq if self.min_freq is not None else 0
+
     def inverse_transform(self, df: pd.DataFrame) -> pd.DataFrame:
         """Returns the original categories
 
@@ -253,5 +396,137 @@ class LabelEncoder:
             list_of_params.append("with_attention={with_attention}")
         if self.shared_embed:
             list_of_params.append("shared_embed={shared_embed}")
+        if self.min_freq is not None:
+            list_of_params.append("min_freq={min_freq}")
+        if self.with_value_counts:
+            list_of_params.append("with_value_counts={with_value_counts}")
         all_params = ", ".join(list_of_params)
         return f"LabelEncoder({all_params.format(**self.__dict__)})"
+
+
+class QuantileSketch:
+    r"""Streaming and mergeable quantile sketch, following the ideas in
+    [KLL](https://arxiv.org/abs/1603.05346) (Karnin, Lang and Liberty).
+
+    The sketch keeps a hierarchy of 'compactors'. Values are added to the
+    first compactor and, when a compactor exceeds its capacity, it is
+    sorted and every other value (starting at a random offset) is promoted
+    to the next compactor, where it counts twice. The memory is therefore
+    $O(k \log(n/k))$ regardless of the number of values seen, and two
+    sketches are merged by simply concatenating their compactors level by
+    level. The exact minimum and maximum are kept as well.
+
+    This class is designed to run internally within the `Quantizer` class,
+    so that the bins of the continuous columns can be computed in a single
+    pass over data that does not fit in memory.
+
+    Parameters
+    ----------
+    k: int, default = 256
+        capacity of the highest compactor. The rank error is roughly
+        proportional to $1/k$
+    seed: int, default = 1
+        seed of the random generator used to choose the values promoted
+        during the compaction, so that results are reproducible
+    """
+
+    def __init__(self, k: int = 256, seed: int = 1):
+        self.k = k
+        self.seed = seed
+
+        self.compactors: List[np.ndarray] = [np.empty(0)]
+        self.n: int = 0
+        self.min: float = np.inf
+        self.max: float = -np.inf
+
+        self._rng = np.random.default_rng(seed)
+
+    def update(self, values: np.ndarray) -> "QuantileSketch":
+        values = np.asarray(values, dtype=float).ravel()
+        values = values[~np.isnan(values)]
+        if values.size == 0:
+            return self
+
+        self.n += values.size
+        self.min = min(self.min, values.min())
+        self.max = max(self.max, values.max())
+
+        self.compactors[0] = np.concatenate([self.compactors[0], values])
+        self._compress()
+
+        return self
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        while len(self.compactors) < len(other.compactors):
+            self.compactors.append(np.empty(0))
+        for h, compactor in enumerate(other.compactors):
+            self.compactors[h] = np.concatenate([self.compactors[h], compactor])
+
+        self.n += other.n
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+        self._compress()
+
+        return self
+
+    def quantiles(self, qs: np.ndarray) -> np.ndarray:
+        qs = np.asarray(qs, dtype=float)
+        values = np.concatenate(self.compactors)
+        weights = np.concatenate(
+            [np.full(c.size, 2**h) for h, c in enumerate(self.compactors)]
+        )
+
+        quantiles = inverted_cdf_quantiles(values, qs, weights)
+        # the extremes are known exactly
+        quantiles[qs <= 0.0] = self.min
+        quantiles[qs >= 1.0] = self.max
+
+        return quantiles
+
+    def _capacity(self, h: int) -> int:
+        depth = len(self.compactors) - h - 1
+        return max(int(np.ceil(self.k * (2.0 / 3.0) ** depth)), 2)
+
+    def _compress(self):
+        h = 0
+        while h < len(self.compactors):
+            compactor = self.compactors[h]
+            if compactor.size > self._capacity(h):
+                if h + 1 == len(self.compactors):
+                    self.compactors.append(np.empty(0))
+                compactor = np.sort(compactor)
+                # if odd, the largest value stays in this compactor
+                n_even = compactor.size - compactor.size % 2
+                offset = self._rng.integers(2)
+                self.compactors[h + 1] = np.concatenate(
+                    [self.compactors[h + 1], compactor[offset:n_even:2]]
+                )
+                self.compactors[h] = compactor[n_even:]
+            h += 1
+
+    def __len__(self) -> int:
+        return self.n
+
+    def __repr__(self) -> str:
+        return f"QuantileSketch(k={self.k}, seed={self.seed})"
+
+
+def inverted_cdf_quantiles(
+    values: np.ndarray, qs: np.ndarray, weights: Optional[np.ndarray] = None
+) -> np.ndarray:
+    r"""Quantiles via the inverse of the (weighted) empirical distribution
+    function, i.e. the smallest value whose cumulative weight is at least
+    `q` times the total weight. This is equivalent to numpy's
+    `method="inverted_cdf"`, which is not available in older numpy
+    versions.
+    """
+    values = np.asarray(values, dtype=float)
+    weights = np.ones_like(values) if weights is None else weights
+
+    order = np.argsort(values, kind="stable")
+    values, cum_weights = values[order], np.cumsum(weights[order])
+
+    idx = np.searchsorted(cum_weights, np.asarray(qs) * cum_weights[-1], side="left")
+
+    return values[np.clip(idx, 0, values.size - 1)]
@@ -11,17 +11,23 @@ Credit for the code here to Jeremy Howard and the fastai team
 import os
 import re
 import html
+import atexit
+import functools
+import multiprocessing
+from itertools import chain
 from collections import Counter, defaultdict
-from concurrent.futures import ProcessPoolExecutor
 
 import numpy as np
 import spacy
+import pandas as pd
 from spacy.symbols import ORTH
 
 from pytorch_widedeep.wdtypes import (
     Any,
+    Dict,
     List,
     Match,
+    Tuple,
     Union,
     Tokens,
     Callable,
@@ -63,6 +69,7 @@ defaults = SimpleNamespace(
 __all__ = [
     "BaseTokenizer",
     "SpacyTokenizer",
+    "RegexTokenizer",
     "Tokenizer",
     "Vocab",
     "fix_html",
@@ -98,6 +105,9 @@ class BaseTokenizer:
     def tokenizer(self, t: str) -> List[str]:
         return t.split(" ")
 
+    def tokenize_batch(self, texts: Collection[str]) -> List[List[str]]:
+        return [self.tokenizer(t) for t in texts]
+
     def add_special_cases(self, toks: Collection[str]):
         pass
 
@@ -123,6 +133,20 @@ class SpacyTokenizer(BaseTokenizer):
         """
         return [t.text for t in self.tok.tokenizer(t)]
 
+    def tokenize_batch(self, texts: Collection[str]) -> List[List[str]]:
+        """Runs ``Spacy``'s ``tokenizer`` over a batch of texts via its
+        ``pipe`` method
+
+        Parameters
+        ----------
+        texts: Collection
+            texts to be tokenized
+        """
+        return [
+            [t.text for t in doc]
+            for doc in self.tok.tokenizer.pipe(texts, batch_size=1000)  # type: ignore[union-attr]
+        ]
+
     def add_special_cases(self, toks: Collection[str]):
         """Runs ``Spacy``'s ``add_special_case`` method
 
@@ -136,6 +160,35 @@ class SpacyTokenizer(BaseTokenizer):
             self.tok.tokenizer.add_special_case(w, [{ORTH: w}])  # type: ignore[union-attr]
 
 
+class RegexTokenizer(BaseTokenizer):
+    def __init__(self, lang: str):
+        """Tokenizer that simply splits the text into words and punctuation
+        symbols using a regular expression. It is much faster than
+        :obj:`SpacyTokenizer` and it is meant to be used with text that is
+        already clean (e.g. the output of
+        `pytorch_widedeep.utils.text_utils.simple_preprocess`), where
+        `Spacy`'s language specific rules add little value.
+
+        Parameters
+        ----------
+        lang: str
+            Language of the text to be tokenized. Not used, kept for
+            consistency with the other tokenizers
+        """
+        self.lang = lang
+        self.re_tok = re.compile(r"\w+|[^\w\s]")
+
+    def tokenizer(self, t: str) -> List[str]:
+        """Splits ``t`` into words and punctuation symbols
+
+        Parameters
+        ----------
+        t: str
+            text to be tokenized
+        """
+        return self.re_tok.findall(t)
+
+
 def spec_add_spaces(t: str) -> str:
     "Add spaces around / and # in `t`. \n"
     return re.sub(r"([/#\n])", r" \1 ", t)
@@ -250,6 +303,15 @@ class Tokenizer:
         ``add_special_case`` method
     n_cpus: int, Optional, default = None
         number of CPUs to used during the tokenization process
+    chunksize: int, default = 1000
+        number of texts sent at once to each of the worker processes, where
+        they are tokenized as a batch. If the number of texts is not larger
+        than `chunksize`, these are tokenized in the current process
+
+    :information_source: **NOTE**: the worker processes are persistent, i.e.
+    they are re-used by subsequent calls to `process_all` (by this or any
+    other `Tokenizer` with the same setup), and the `tok_func` object is
+    instantiated only once per process.
     """
 
     def __init__(
@@ -260,6 +322,7 @@ class Tokenizer:
         post_rules: Optional[ListRules] = None,
         special_cases: Optional[Collection[str]] = None,
         n_cpus: Optional[int] = None,
+        chunksize: int = 1000,
     ):
         self.tok_func, self.lang, self.special_cases = tok_func, lang, special_cases
         self.pre_rules = ifnone(pre_rules, defaults.text_pre_rules)
@@ -268,6 +331,7 @@ class Tokenizer:
             special_cases if special_cases is not None else defaults.text_spec_tok
         )
         self.n_cpus = ifnone(n_cpus, defaults.cpus)
+        self.chunksize = chunksize
 
     def __repr__(self) -> str:
         res = f"Tokenizer {self.tok_func.__name__} in {self.lang} with the following rules:\n"
@@ -300,16 +364,49 @@ class Tokenizer:
             toks = rule(toks)
         return toks
 
+    def process_batch(
+        self, texts: Collection[str], tok: Optional[BaseTokenizer] = None
+    ) -> List[List[str]]:
+        r"""Process and tokenize a batch of texts with tokenizer ``tok``. The
+        tokenization runs via the tokenizer's ``tokenize_batch`` method (e.g.
+        ``Spacy``'s ``pipe``)
+
+        Parameters
+        ----------
+        texts: Collection
+            texts to be processed and tokenized
+        tok: ``BaseTokenizer``, Optional, default = None
+            Instance of `BaseTokenizer`. If `None` an instance of `tok_func`,
+            cached per process, will be used
+
+        Returns
+        -------
+        List[List[str]]
+            List containing lists of tokens. One list per "_document_"
+        """
+        tok = tok if tok is not None else self._base_tokenizer()
+
+        processed_texts: List[str] = []
+        for t in texts:
+            t = str(t)
+            for rule in self.pre_rules:
+                t = rule(t)
+            processed_texts.append(t)
+
+        all_toks: List[List[str]] = []
+        for toks in tok.tokenize_batch(processed_texts):
+            for rule in self.post_rules:
+                toks = rule(toks)
+            all_toks.append(toks)
+
+        return all_toks
+
     def _process_all_1(self, texts: Collection[str]) -> List[List[str]]:
         """Process a list of ``texts`` in one process."""
-
-        tok = self.tok_func(self.lang)
-        if self.special_cases:
-            tok.add_special_cases(self.special_cases)
-        return [self.process_text(str(t), tok) for t in texts]
+        return self.process_batch(texts)
 
     def process_all(self, texts: Collection[str]) -> List[List[str]]:
-        r"""Process a list of texts. Parallel execution of ``process_text``.
+        r"""Process a list of texts. Parallel execution of ``process_batch``.
 
         Examples
         --------
@@ -331,12 +428,104 @@ class Tokenizer:
 
         """
 
-        if self.n_cpus <= 1:
+        if self.n_cpus <= 1 or len(texts) <= self.chunksize:
             return self._process_all_1(texts)
-        with ProcessPoolExecutor(self.n_cpus) as e:
-            return sum(
-                e.map(self._process_all_1, partition_by_cores(texts, self.n_cpus)), []
+
+        pool = _get_tokenizer_pool(self)
+        # 'imap' returns the results in order, and 'chain' concatenates them
+        # in linear time
+        return list(
+            chain.from_iterable(
+                pool.imap(_process_batch_in_worker, partition(texts, self.chunksize))
             )
+        )
+
+    def _base_tokenizer(self) -> BaseTokenizer:
+        return _get_base_tokenizer(
+            self.tok_func, self.lang, tuple(self.special_cases)  # type: ignore[arg-type]
+        )
+
+    def _setup(self) -> Tuple:
+        # everything that defines the tokenization process
+        return (
+            self.n_cpus,
+            self.tok_func,
+            self.lang,
+            tuple(self.special_cases),  # type: ignore[arg-type]
+            tuple(self.pre_rules),
+            tuple(self.post_rules),
+        )
+
+
+@functools.lru_cache(maxsize=8)
+def _get_base_tokenizer(
+    tok_func: Callable, lang: str, special_cases: Tuple[str, ...]
+) -> BaseTokenizer:
+    # instantiating the tokenizer (e.g. loading Spacy) is expensive, so it is
+    # done only once per process and setup
+    tok = tok_func(lang)
+    if special_cases:
+        tok.add_special_cases(special_cases)
+    return tok
+
+
+# A single pool of worker processes is kept alive, and re-used as long as the
+# tokenizer setup does not change
+_tokenizer_pool: Dict[str, Any] = {}
+_worker_tokenizer: Dict[str, Tokenizer] = {}
+
+
+def _init_tokenizer_worker(tokenizer: Tokenizer):
+    _worker_tokenizer["tokenizer"] = tokenizer
+
+
+def _process_batch_in_worker(texts: Collection[str]) -> List[List[str]]:
+    return _worker_tokenizer["tokenizer"].process_batch(texts)
+
+
+def _get_tokenizer_pool(tokenizer: Tokenizer) -> Any:
+    setup = tokenizer._setup()
+    if _tokenizer_pool.get("setup") != setup:
+        _close_tokenizer_pool()
+        _tokenizer_pool["pool"] = multiprocessing.Pool(
+            tokenizer.n_cpus,
+            initializer=_init_tokenizer_worker,
+            initargs=(tokenizer,),
+        )
+        _tokenizer_pool["setup"] = setup
+    return _tokenizer_pool["pool"]
+
+
+def _close_tokenizer_pool():
+    pool = _tokenizer_pool.pop("pool", None)
+    _tokenizer_pool.pop("setup", None)
+    if pool is not None:
+        pool.terminate()
+
+
+atexit.register(_close_tokenizer_pool)
+
+
+def _numericalize_batch(vocab, texts: Tokens) -> Tuple[np.ndarray, np.ndarray]:
+    # the lookup table (a hashed pandas Index over the tokens in `stoi` and
+    # their ids) is built once per `stoi` and then reused
+    lookup = getattr(vocab, "_stoi_lookup", None)
+    if lookup is None or lookup[0] is not vocab.stoi:
+        index = pd.Index(list(vocab.stoi.keys()), dtype=object)
+        ids = np.fromiter(vocab.stoi.values(), dtype="int32", count=len(index))
+        lookup = (vocab.stoi, index, ids)
+        vocab._stoi_lookup = lookup
+    _, index, ids = lookup
+
+    lengths = np.fromiter((len(t) for t in texts), dtype="int64", count=len(texts))
+    flat_tokens = np.fromiter(
+        chain.from_iterable(texts), dtype=object, count=int(lengths.sum())
+    )
+    positions = index.get_indexer(flat_tokens)
+    unk_idx = vocab.stoi.default_factory()
+    flat_ids = np.where(positions >= 0, ids[positions], unk_idx).astype("int32")
+
+    return flat_ids, lengths
 
 
 class Vocab:
@@ -457,6 +646,18 @@ class Vocab:
         """
         return [self.stoi[w] for w in t]
 
+    def numericalize_batch(self, texts: Tokens) -> Tuple[np.ndarray, np.ndarray]:
+        """Convert a collection of lists of tokens to their ids with a single,
+        vectorized lookup. Unknown tokens are mapped to the 'xxunk' id.
+
+        Returns
+        -------
+        Tuple[np.ndarray, np.ndarray]
+            Tuple with the flattened array of '_numericalsed_' tokens and the
+            number of tokens per text
+        """
+        return _numericalize_batch(self, texts)
+
     def transform(self, t: Collection[str]) -> List[int]:
         """
         Calls the `numericalize` method. I simply want to honor fast ai naming,
@@ -465,6 +666,12 @@ class Vocab:
         """
         return self.numericalize(t)
 
+    def transform_batch(self, texts: Tokens) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Calls the `numericalize_batch` method
+        """
+        return self.numericalize_batch(texts)
+
     def textify(self, nums: Collection[int], sep=" ") -> Union[str, List[str]]:
         """Convert a list of ``nums`` (or indexes) to their tokens.
 
@@ -520,45 +727,78 @@ class ChunkVocab:
         self,
         tokens: Tokens,
     ) -> "ChunkVocab":
+        self._count_tokens(tokens)
+
+        if self.chunk_counter == self.n_chunks:
+            self._build_vocab()
+
+        return self
+
+    def merge(self, other: "ChunkVocab") -> "ChunkVocab":
+        """Merges the token frequencies of another `ChunkVocab` fitted on
+        different chunks of the data. If, after merging, all `n_chunks`
+        chunks have been seen, the vocabulary is built.
+
+        Returns
+        -------
+        ChunkVocab
+            `ChunkVocab` with the merged token frequencies
+        """
+        self._merge_state(other)
+
+        if self.chunk_counter == self.n_chunks:
+            self._build_vocab()
+
+        return self
+
+    def _count_tokens(self, tokens: Tokens):
         if self.chunk_counter == 0:
             self.freq = Counter(tok for sent in tokens for tok in sent)
         else:
             self.freq.update(tok for sent in tokens for tok in sent)
         self.chunk_counter += 1
 
-        if self.chunk_counter == self.n_chunks:
-            itos = [
-                o
-                for o, c in self.freq.most_common(self.max_vocab)
-                if c >= self.min_freq
-            ]
-            for o in reversed(defaults.text_spec_tok):
-                if o in itos:
-                    itos.remove(o)
-                itos.insert(0, o)
-
-            if self.pad_idx is not None:
-                itos.remove(PAD)
-                itos.insert(self.pad_idx, PAD)
+    def _merge_state(self, other: "ChunkVocab"):
+        if other.chunk_counter == 0:
+            return
 
-            # get the new 'xxunk' index
-            xxunk_idx = np.where([el == "xxunk" for el in itos])[0][0]
+        if self.chunk_counter == 0:
+            self.freq = Counter()
+        self.freq.update(other.freq)
+        self.chunk_counter += other.chunk_counter
 
-            itos = itos[: self.max_vocab]
-            if (
-                len(itos) < self.max_vocab
-            ):  # Make sure vocab size is a multiple of 8 for fast mixed precision training
-                while len(itos) % 8 != 0:
-                    itos.append("xxfake")
+        # the vocabulary, if built, is no longer valid
+        self.is_fitted = False
 
-            self.itos = itos
-            self.stoi = defaultdict(
-                lambda: xxunk_idx, {v: k for k, v in enumerate(self.itos)}
-            )
+    def _build_vocab(self):
+        itos = [
+            o for o, c in self.freq.most_common(self.max_vocab) if c >= self.min_freq
+        ]
+        for o in reversed(defaults.text_spec_tok):
+            if o in itos:
+                itos.remove(o)
+            itos.insert(0, o)
 
-            self.is_fitted = True
+        if self.pad_idx is not None:
+            itos.remove(PAD)
+            itos.insert(self.pad_idx, PAD)
 
-        return self
+        # get the new 'xxunk' index
+        xxunk_idx = np.where([el == "xxunk" for el in itos])[0][0]
+
+        itos = itos[: self.max_vocab]
+        if (
+            len(itos) < self.max_vocab
+        ):  # Make sure vocab size is a multiple of 8 for fast mixed precision training
+            while len(itos) % 8 != 0:
+                itos.append("xxfake")
+
+        self.itos = itos
+        self.stoi = defaultdict(
+            lambda: xxunk_idx, {v: k for k, v in enumerate(self.itos)}
+        )
+
+        self.is_fitted = True
 
     def transform(self, t: Collection[str]) -> List[int]:
         """Convert a list of tokens ``t`` to their ids.
@@ -570,6 +810,18 @@ class ChunkVocab:
         """
         return [self.stoi[w] for w in t]
 
+    def transform_batch(self, texts: Tokens) -> Tuple[np.ndarray, np.ndarray]:
+        """Convert a collection of lists of tokens to their ids with a single,
+        vectorized lookup. Unknown tokens are mapped to the 'xxunk' id.
+
+        Returns
+        -------
+        Tuple[np.ndarray, np.ndarray]
+            Tuple with the flattened array of '_numericalsed_' tokens and the
+            number of tokens per text
+        """
+        return _numericalize_batch(self, texts)
+
     def inverse_transform(
         self, nums: Collection[int], sep=" "
     ) -> Union[str, List[str]]:
@@ -587,8 +839,15 @@ class ChunkVocab:
         )
 
     def __getstate__(self):
-        return {"itos": self.itos}
+        if getattr(self, "is_fitted", True):
+            return {"itos": self.itos}
+        # a partially fitted vocab (e.g. sent to or from another process)
+        # keeps its token frequencies
+        return {
+            k: v for k, v in self.__dict__.items() if k not in ("stoi", "_stoi_lookup")
+        }
 
     def __setstate__(self, state: dict):
-        self.itos = state["itos"]
-        self.stoi = defaultdict(int, {v: k for k, v in enumerate(self.itos)})
+        self.__dict__.update(state)
+        if "itos" in state:
+            self.stoi = defaultdict(int, {v: k for k, v in enumerate(self.itos)})
@@ -1,5 +1,7 @@
 import os
-from typing import List, Union, Optional
+import json
+import hashlib
+from typing import List, Tuple, Union, Literal, Iterator, Optional
 
 import numpy as np
 from gensim.utils import tokenize
@@ -8,9 +10,19 @@ from pytorch_widedeep.utils.fastai_transforms import (
     Vocab,
     Tokenizer,
     ChunkVocab,
+    RegexTokenizer,
+    SpacyTokenizer,
 )
 
-__all__ = ["simple_preprocess", "get_texts", "pad_sequences", "build_embeddings_matrix"]
+__all__ = [
+    "simple_preprocess",
+    "get_texts",
+    "pad_sequences",
+    "pad_sequences_batch",
+    "RaggedText",
+    "build_embeddings_matrix",
+    "convert_word_vectors",
+]
 
 
 def simple_preprocess(
@@ -62,6 +74,7 @@ def get_texts(
     texts: List[str],
     already_processed: Optional[bool] = False,
     n_cpus: Optional[int] = None,
+    tokenizer_engine: Literal["spacy", "regex"] = "spacy",
 ) -> List[List[str]]:
     r"""Tokenization using `Fastai`'s `Tokenizer` because it does a
     series of very convenients things during the tokenization process
@@ -79,6 +92,10 @@ def get_texts(
         just want to tokenize it
     n_cpus: int, Optional, default = None
         number of CPUs to used during the tokenization process
+    tokenizer_engine: str, default = 'spacy'
+        Engine used to split the texts into tokens. Choices are _'spacy'_
+        and _'regex'_. See
+        `pytorch_widedeep.utils.fastai_transforms.RegexTokenizer`
 
     Examples
     --------
@@ -106,7 +123,14 @@ def get_texts(
         processed_texts = [" ".join(simple_preprocess(t)) for t in texts]
     else:
         processed_texts = texts
-    tok = Tokenizer(n_cpus=num_cpus).process_all(processed_texts)
+    if tokenizer_engine not in ["spacy", "regex"]:
+        raise ValueError(
+            "'tokenizer_engine' must be one of 'spacy' or 'regex'. "
+            f"Got {tokenizer_engine}"
+        )
+    tok_func = SpacyTokenizer if tokenizer_engine == "spacy" else RegexTokenizer
+
+    tok = Tokenizer(tok_func=tok_func, n_cpus=num_cpus).process_all(processed_texts)
     return tok
 
 
@@ -155,6 +179,293 @@ def pad_sequences(
         return res
 
 
+def pad_sequences_batch(
+    seqs: np.ndarray,
+    lengths: np.ndarray,
+    maxlen: int,
+    pad_first: bool = True,
+    pad_idx: int = 1,
+) -> np.ndarray:
+    r"""
+    Vectorized version of `pad_sequences`. Given the flattened, `numericalised`
+    tokens of a collection of sequences and the length of each sequence, it
+    will return an array with all the padded sequences. Sequences longer than
+    `maxlen` are truncated keeping their last `maxlen` tokens, as in
+    `pad_sequences`
+
+    Parameters
+    ----------
+    seqs: np.ndarray
+        1D array with the concatenated `numericalised` tokens of all sequences
+    lengths: np.ndarray
+        1D array with the number of tokens of each sequence
+    maxlen: int
+        Maximum length of the padded sequences
+    pad_first: bool,  default = True
+        Indicates whether the padding index will be added at the beginning or the
+        end of the sequences
+    pad_idx: int, default = 1
+        padding index. Fastai's Tokenizer leaves 0 for the 'unknown' token.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from pytorch_widedeep.utils import pad_sequences_batch
+    >>> seqs, lengths = np.array([1, 2, 3, 4, 5]), np.array([3, 2])
+    >>> pad_sequences_batch(seqs, lengths, maxlen=4, pad_idx=0)
+    array([[0, 1, 2, 3],
+           [0, 0, 4, 5]], dtype=int32)
+
+    Returns
+    -------
+    np.ndarray
+        numpy array of shape `(n_sequences, maxlen)` with the padded sequences
+    """
+    lengths = np.asarray(lengths, dtype="int64")
+    n_seqs = len(lengths)
+
+    padded_seqs = np.full((n_seqs, maxlen), pad_idx, dtype="int32")
+
+    kept = np.minimum(lengths, maxlen)
+    n_kept = int(kept.sum())
+    if n_kept == 0:
+        return padded_seqs
+
+    # offsets of the first kept token of each sequence in 'seqs' and of its
+    # position in the padded row
+    src_start = np.cumsum(lengths) - kept
+    dst_start = maxlen - kept if pad_first else np.zeros(n_seqs, dtype="int64")
+
+    rows = np.repeat(np.arange(n_seqs), kept)
+    pos_in_seq = np.arange(n_kept) - np.repeat(np.cumsum(kept) - kept, kept)
+
+    padded_seqs[rows, np.repeat(dst_start, kept) + pos_in_seq] = np.asarray(seqs)[
+        np.repeat(src_start, kept) + pos_in_seq
+    ]
+
+    return padded_seqs
+
+
+class RaggedText:
+    r"""Collection of _'numericalised'_ sequences of different lengths,
+    stored as a flat array with all the tokens plus the offsets where each
+    sequence starts, so that no memory is spent on padding.
+
+    A `RaggedText` object can be passed as the `X_text` input to the
+    `Trainer`. The sequences in each batch will then be padded (at the end)
+    only up to the length of the longest sequence in that batch, and their
+    lengths will be passed to the text models alongside the padded
+    sequences (see the `WideDeepDataset`).
+
+    Indexing with an integer returns the tokens of the corresponding
+    sequence, while indexing with a slice, an array of indices or a boolean
+    mask returns a new `RaggedText` object
+
+    Parameters
+    ----------
+    ids: np.ndarray
+        1D array with the concatenated `numericalised` tokens of all sequences
+    offsets: np.ndarray
+        1D array of length `n_sequences + 1` with the position in `ids` where
+        each sequence starts. The last element must be `len(ids)`
+    padding_idx: int, default = 1
+        padding index that will be used to pad the batches
+
+    Attributes
+    ----------
+    lengths: np.ndarray
+        1D array with the number of tokens of each sequence
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from pytorch_widedeep.utils import RaggedText
+    >>> X = np.array([[1, 1, 5, 6], [1, 7, 8, 9]])
+    >>> X_ragged = RaggedText.from_padded(X, padding_idx=1)
+    >>> X_ragged.ids, X_ragged.offsets
+    (array([5, 6, 7, 8, 9]), array([0, 2, 5]))
+    >>> X_ragged[1]
+    array([7, 8, 9])
+    """
+
+    def __init__(self, ids: np.ndarray, offsets: np.ndarray, padding_idx: int = 1):
+        self.ids = np.asarray(ids)
+        self.offsets = np.asarray(offsets, dtype="int64")
+        self.padding_idx = padding_idx
+
+        assert self.ids.ndim == 1, "'ids' must be a 1D array"
+        assert (
+            len(self.offsets) > 0
+            and self.offsets[0] == 0
+            and self.offsets[-1] == len(self.ids)
+            and np.all(np.diff(self.offsets) >= 0)
+        ), (
+            "'offsets' must be a non decreasing array that starts at 0 and ends "
+            "at 'len(ids)'"
+        )
+
+    @classmethod
+    def from_lengths(
+        cls, ids: np.ndarray, lengths: np.ndarray, padding_idx: int = 1
+    ) -> "RaggedText":
+        r"""Builds a `RaggedText` object from the concatenated tokens and the
+        length of each sequence (e.g. as returned by `Vocab.transform_batch`)
+        """
+        offsets = np.zeros(len(lengths) + 1, dtype="int64")
+        np.cumsum(lengths, out=offsets[1:])
+        return cls(ids, offsets, padding_idx)
+
+    @classmethod
+    def from_padded(cls, X: np.ndarray, padding_idx: int = 1) -> "RaggedText":
+        r"""Builds a `RaggedText` object from an array of padded sequences,
+        padded either at the beginning or at the end
+        """
+        is_token = X != padding_idx
+        return cls.from_lengths(X[is_token], is_token.sum(axis=1), padding_idx)
+
+    @property
+    def lengths(self) -> np.ndarray:
+        return np.diff(self.offsets)
+
+    def to_padded(
+        self, maxlen: Optional[int] = None, pad_first: bool = True
+    ) -> np.ndarray:
+        r"""Returns the padded sequences
+
+        Parameters
+        ----------
+        maxlen: int, Optional, default = None
+            Maximum length of the padded sequences. If `None`, the length of
+            the longest sequence is used
+        pad_first: bool,  default = True
+            Indicates whether the padding index will be added at the beginning
+            or the end of the sequences
+
+        Returns
+        -------
+        np.ndarray
+            numpy array of shape `(n_sequences, maxlen)` with the padded
+            sequences
+        """
+        lengths = self.lengths
+        if maxlen is None:
+            maxlen = max(int(lengths.max()), 1) if len(lengths) > 0 else 1
+        return pad_sequences_batch(
+            self.ids, lengths, maxlen, pad_first=pad_first, pad_idx=self.padding_idx
+        )
+
+    def truncate(self, maxlen: int) -> "RaggedText":
+        r"""Returns a new `RaggedText` object where the sequences longer than
+        `maxlen` keep only their last `maxlen` tokens, as in `pad_sequences`
+        """
+        lengths = self.lengths
+        kept = np.minimum(lengths, maxlen)
+        return self._gather(self.offsets[1:] - kept, kept)
+
+    def _gather(self, starts: np.ndarray, lengths: np.ndarray) -> "RaggedText":
+        offsets = np.zeros(len(lengths) + 1, dtype="int64")
+        np.cumsum(lengths, out=offsets[1:])
+        # position in 'ids' of every token of the new collection
+        src = np.repeat(starts - offsets[:-1], lengths) + np.arange(offsets[-1])
+        return RaggedText(self.ids[src], offsets, self.padding_idx)
+
+    def __getitem__(self, idx):
+        if isinstance(idx, (int, np.integer)):
+            return self.ids[self.offsets[idx] : self.offsets[idx + 1]]
+        rows = np.arange(len(self))[idx]
+        return self._gather(self.offsets[rows], self.lengths[rows])
+
+    def __iter__(self) -> Iterator[np.ndarray]:
+        for start, end in zip(self.offsets[:-1], self.offsets[1:]):
+            yield self.ids[start:end]
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __repr__(self) -> str:
+        return "RaggedText(n_sequences={}, n_tokens={}, padding_idx={})".format(
+            len(self), len(self.ids), self.padding_idx
+        )
+
+
+def convert_word_vectors(
+    word_vectors_path: str,
+    output_path: Optional[str] = None,
+    verbose: int = 1,
+) -> str:
+    r"""One-time conversion of pretrained word vectors in text format (e.g.
+    GloVe or fastText's `.vec` files) to a binary store that can be memory
+    mapped.
+
+    The store is a directory with the vectors as a float32 matrix
+    (`vectors.bin`), a hash table with the words (`hashes.npy`, the sorted
+    64-bit hashes of the words, and `rows.npy`, their row in the matrix),
+    the mean word vector (`mean.npy`) and some metadata (`meta.json`). The
+    resulting path can be passed as `word_vectors_path` to
+    `build_embeddings_matrix` or to the `TextPreprocessor`, in which case
+    only the rows of the words in the vocabulary are read from disk.
+
+    Parameters
+    ----------
+    word_vectors_path: str
+        path to the pretrained word vectors in text format
+    output_path: str, Optional, default = None
+        directory where the binary store will be saved. If `None` it will be
+        `word_vectors_path` with the extension replaced by `.wv`
+    verbose: int,  default=1
+        level of verbosity. Set to 0 for no verbosity
+
+    Returns
+    -------
+    str
+        path to the binary store
+    """
+    if not os.path.isfile(word_vectors_path):
+        raise FileNotFoundError("{} not found".format(word_vectors_path))
+    if output_path is None:
+        output_path = os.path.splitext(word_vectors_path)[0] + ".wv"
+    os.makedirs(output_path, exist_ok=True)
+
+    if verbose:
+        print("Converting word vectors...")
+
+    hashes: List[int] = []
+    vector_sum: Optional[np.ndarray] = None
+    with open(os.path.join(output_path, "vectors.bin"), "wb") as f:
+        for word, vector in _read_word_vectors(word_vectors_path):
+            f.write(vector.tobytes())
+            hashes.append(_word_hash(word))
+            if vector_sum is None:
+                vector_sum = vector.astype("float64")
+            else:
+                vector_sum += vector
+
+    if vector_sum is None:
+        raise ValueError("{} contains no word vectors".format(word_vectors_path))
+
+    n_words, embedding_dim = len(hashes), len(vector_sum)
+
+    # As when building a dictionary from the text file, if a word appears
+    # more than once the last vector is kept. A stable sort leaves the last
+    # occurrence of each hash at the end of its run.
+    word_hashes = np.array(hashes, dtype="uint64")
+    rows = np.argsort(word_hashes, kind="stable")
+    sorted_hashes = word_hashes[rows]
+    is_last = np.append(sorted_hashes[1:] != sorted_hashes[:-1], True)
+    np.save(os.path.join(output_path, "hashes.npy"), sorted_hashes[is_last])
+    np.save(os.path.join(output_path, "rows.npy"), rows[is_last])
+    np.save(
+        os.path.join(output_path, "mean.npy"), (vector_sum / n_words).astype("float32")
+    )
+    with open(os.path.join(output_path, "meta.json"), "w") as f:
+        json.dump({"n_words": n_words, "embedding_dim": embedding_dim}, f)
+
+    if verbose:
+        print("Converted {} word vectors to {}".format(n_words, output_path))
+
+    return output_path
+
+
 def build_embeddings_matrix(
     vocab: Union[Vocab, ChunkVocab],
     word_vectors_path: str,
@@ -172,7 +483,9 @@ def build_embeddings_matrix(
     vocab: Vocab
         see `pytorch_widedeep.utils.fastai_utils.Vocab`
     word_vectors_path: str
-        path to the pretrained word embeddings
+        path to the pretrained word embeddings. This can be either the word
+        vectors in text format or a binary store created with
+        `convert_word_vectors`, which is much faster to load
     min_freq: int
         minimum frequency required for a word to be in the vocabulary
     verbose: int,  default=1
@@ -183,36 +496,25 @@ def build_embeddings_matrix(
     np.ndarray
         Pretrained word embeddings
     """
-    if not os.path.isfile(word_vectors_path):
+    if os.path.isdir(word_vectors_path):
+        vectors, mean_word_vector = _gather_from_store(word_vectors_path, vocab.itos)
+    elif os.path.isfile(word_vectors_path):
+        vectors, mean_word_vector = _gather_from_text(
+            word_vectors_path, vocab.itos, verbose
+        )
+    else:
         raise FileNotFoundError("{} not found".format(word_vectors_path))
-    if verbose:
-        print("Indexing word vectors...")
-
-    embeddings_index = {}
-    f = open(word_vectors_path)
-    for line in f:
-        values = line.split()
-        word = values[0]
-        coefs = np.asarray(values[1:], dtype="float32")
-        embeddings_index[word] = coefs
-    f.close()
 
     if verbose:
-        print("Loaded {} word vectors".format(len(embeddings_index)))
         print("Preparing embeddings matrix...")
 
-    mean_word_vector = np.mean(list(embeddings_index.values()), axis=0)  # type: ignore[arg-type]
-    embedding_dim = len(list(embeddings_index.values())[0])
-    num_words = len(vocab.itos)
-    embedding_matrix = np.zeros((num_words, embedding_dim))
+    embedding_matrix = np.tile(mean_word_vector, (len(vocab.itos), 1))
     found_words = 0
     for i, word in enumerate(vocab.itos):
-        embedding_vector = embeddings_index.get(word)
+        embedding_vector = vectors.get(word)
         if embedding_vector is not None:
             embedding_matrix[i] = embedding_vector
             found_words += 1
-        else:
-            embedding_matrix[i] = mean_word_vector
 
     if verbose:
         print(
@@ -222,3 +524,79 @@ def build_embeddings_matrix(
         )
 
     return embedding_matrix.astype("float32")
+
+
+def _read_word_vectors(word_vectors_path: str) -> Iterator[Tuple[str, np.ndarray]]:
+    with open(word_vectors_path) as f:
+        for i, line in enumerate(f):
+            values = line.split()
+            # fastText's .vec files start with a '<n_words> <dim>' header
+            if i == 0 and len(values) == 2 and values[1].isdigit():
+                continue
+            yield values[0], np.asarray(values[1:], dtype="float32")
+
+
+def _word_hash(word: str) -> int:
+    # python's hash() is salted per process, so a stable hash is needed for
+    # a table that is saved to disk
+    return int.from_bytes(
+        hashlib.blake2b(word.encode("utf-8"), digest_size=8).digest(), "little"
+    )
+
+
+def _gather_from_text(
+    word_vectors_path: str, words: List[str], verbose: int
+) -> Tuple[dict, np.ndarray]:
+    # only the vectors of the words in the vocabulary are kept in memory,
+    # while the mean vector is computed on the fly
+    if verbose:
+        print("Indexing word vectors...")
+
+    wanted = set(words)
+    vectors: dict = {}
+    vector_sum: Optional[np.ndarray] = None
+    n_words = 0
+    for word, vector in _read_word_vectors(word_vectors_path):
+        if word in wanted:
+            vectors[word] = vector
+        if vector_sum is None:
+            vector_sum = vector.astype("float64")
+        else:
+            vector_sum += vector
+        n_words += 1
+
+    if vector_sum is None:
+        raise ValueError("{} contains no word vectors".format(word_vectors_path))
+
+    if verbose:
+        print("Loaded {} word vectors".format(n_words))
+
+    return vectors, (vector_sum / n_words).astype("float32")
+
+
+def _gather_from_store(
+    word_vectors_path: str, words: List[str]
+) -> Tuple[dict, np.ndarray]:
+    with open(os.path.join(word_vectors_path, "meta.json")) as f:
+        meta = json.load(f)
+    hashes = np.load(os.path.join(word_vectors_path, "hashes.npy"), mmap_mode="r")
+    rows = np.load(os.path.join(word_vectors_path, "rows.npy"), mmap_mode="r")
+    mean_word_vector = np.load(os.path.join(word_vectors_path, "mean.npy"))
+    matrix = np.memmap(
+        os.path.join(word_vectors_path, "vectors.bin"),
+        dtype="float32",
+        mode="r",
+        shape=(meta["n_words"], meta["embedding_dim"]),
+    )
+
+    unique_words = list(dict.fromkeys(words))
+    word_hashes = np.array([_word_hash(w) for w in unique_words], dtype="uint64")
+    pos = np.minimum(np.searchsorted(hashes, word_hashes), len(hashes) - 1)
+    found = hashes[pos] == word_hashes
+
+    # only the rows of the words in the vocabulary are read
+    found_rows = np.asarray(rows[pos[found]])
+    found_vectors = np.asarray(matrix[found_rows])
+    vectors = dict(zip([w for w, f in zip(unique_words, found) if f], found_vectors))
+
+    return vectors, mean_word_vector
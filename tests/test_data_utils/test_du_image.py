@@ -53,3 +53,63 @@ def test_sizes():
 def test_notimplementederror():
     with pytest.raises(NotImplementedError):
         org_df = processor.inverse_transform(X_imgs)  # noqa: F841
+
+
+###############################################################################
+# Test the normalising metrics and the memory-mapped output
+###############################################################################
+
+
+def test_normalising_metrics():
+    imgs = X_imgs.reshape(-1, 3).astype("float64") / 255.0
+    mean_b, mean_g, mean_r = imgs.mean(axis=0)
+    std_b, std_g, std_r = imgs.std(axis=0)
+
+    mean, std = processor.normalise_metrics["mean"], processor.normalise_metrics["std"]
+    assert np.allclose(
+        [mean["R"], mean["G"], mean["B"], std["R"], std["G"], std["B"]],
+        [mean_r, mean_g, mean_b, std_r, std_g, std_b],
+    )
+
+
+def test_memmap_output(tmp_path):
+    memmap_path = str(tmp_path / "images.npy")
+    mm_processor = ImagePreprocessor(
+        img_col=img_col, img_path=imd_dir, n_cpus=2, memmap_path=memmap_path
+    )
+    X_imgs_mm = mm_processor.fit_transform(df)
+
+    assert (
+        isinstance(X_imgs_mm, np.memmap)
+        and np.array_equal(np.load(memmap_path, mmap_mode="r"), X_imgs)
+        and X_imgs_mm.dtype == np.uint8
+    )
+
+
+def test_memmap_output_not_overwritten(tmp_path):
+    memmap_path = str(tmp_path / "images_train.npy")
+    mm_processor = ImagePreprocessor(
+        img_col=img_col, img_path=imd_dir, verbose=0, memmap_path=memmap_path
+    )
+    X_train = mm_processor.fit_transform(df.iloc[:1])
+    X_train_copy = np.array(X_train)
+
+    # without a path, other data is written to a new file...
+    X_test = mm_processor.transform(df.iloc[1:])
+
+    # ...the file handed out for the train set cannot be reused explicitly...
+    with pytest.raises(ValueError):
+        mm_processor.transform(df.iloc[1:], memmap_path=memmap_path)
+
+    # ...and transforming other data into a given new file leaves it intact
+    X_val = mm_processor.transform(
+        df.iloc[1:], memmap_path=str(tmp_path / "images_val.npy")
+    )
+
+    assert (
+        X_test.filename == str(tmp_path / "images_train_1.npy")
+        and np.array_equal(X_train, X_train_copy)
+        and np.array_equal(X_train, X_imgs[:1])
+        and np.array_equal(X_test, X_imgs[1:])
+        and np.array_equal(X_val, X_imgs[1:])
+    )
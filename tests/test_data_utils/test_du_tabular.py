@@ -4,7 +4,10 @@ import pytest
 from sklearn.exceptions import NotFittedError
 
 from pytorch_widedeep.preprocessing import TabPreprocessor
-from pytorch_widedeep.utils.deeptabular_utils import LabelEncoder
+from pytorch_widedeep.utils.deeptabular_utils import (
+    LabelEncoder,
+    QuantileSketch,
+)
 from pytorch_widedeep.preprocessing.tab_preprocessor import embed_sz_rule
 
 
@@ -355,6 +358,60 @@ def test_quantization(quantization_setup, expected_bins_col1, expected_bins_col2
     )
 
 
+def test_quantization_quantile_strategy():
+    tab_preprocessor = TabPreprocessor(
+        continuous_cols=["col1", "col2"],
+        quantization_setup=4,
+        quantization_strategy="quantile",
+    )
+    X_quant = tab_preprocessor.fit_transform(df_for_quant)
+
+    # equal-frequency bins: 20 rows in 4 bins
+    _, counts = np.unique(X_quant[:, 0], return_counts=True)
+
+    assert counts.tolist() == [5, 5, 5, 5]
+
+
+def test_quantization_bins_from_fit_data():
+    # the bins are those computed at fit time, regardless of the data passed
+    # to transform
+    tab_preprocessor = TabPreprocessor(continuous_cols=["col1"], quantization_setup=2)
+    tab_preprocessor.fit(pd.DataFrame({"col1": np.linspace(0, 1, 20)}))
+
+    X_quant = tab_preprocessor.transform(pd.DataFrame({"col1": [-1.0, 0.1, 0.9, 2.0]}))
+
+    assert X_quant[:, 0].tolist() == [0, 1, 2, 0]
+
+
+@pytest.mark.parametrize("merge", [True, False])
+def test_quantile_sketch(merge):
+    values = np.random.default_rng(0).normal(size=100_000)
+    chunks = np.array_split(values, 10)
+
+    if merge:
+        sketch = QuantileSketch()
+        for chunk in chunks:
+            sketch.merge(QuantileSketch().update(chunk))
+    else:
+        sketch = QuantileSketch()
+        for chunk in chunks:
+            sketch.update(chunk)
+
+    qs = np.linspace(0, 1, 11)
+    estimated = sketch.quantiles(qs)
+
+    # the error is measured in terms of ranks
+    ranks = np.searchsorted(np.sort(values), estimated) / values.size
+
+    assert (
+        len(sketch) == values.size
+        and sum(c.size for c in sketch.compactors) < 5_000
+        and estimated[0] == values.min()
+        and estimated[-1] == values.max()
+        and np.abs(ranks - qs).max() < 0.02
+    )
+
+
 ###############################################################################
 # Increase coverage for the tabular utils module
 ###############################################################################
@@ -413,3 +470,113 @@ def test_label_encoder_with_chunks():
         and "F" in le.encoding_dict["cat2"]
         and df_chunk_org.equals(df_chunk)
     )
+
+
+###############################################################################
+# Test collapsing rare categories and frequency based embedding dims
+###############################################################################
+
+
+df_long_tail = pd.DataFrame(
+    {
+        "col1": ["a"] * 10 + ["b"] * 6 + ["c", "d", "e", "f"],
+        "col2": ["x"] * 19 + ["y"],
+    }
+)
+
+
+@pytest.mark.parametrize(
+    "min_freq, with_attention",
+    [(2, False), (0.1, False), (2, True)],
+)
+def test_label_encoder_min_freq(min_freq, with_attention):
+    le = LabelEncoder(
+        ["col1", "col2"], with_attention=with_attention, min_freq=min_freq
+    )
+    df_e = le.fit_transform(df_long_tail)
+
+    col1_idx = set(le.encoding_dict["col1"].values())
+    col2_idx = set(le.encoding_dict["col2"].values())
+
+    # 'a' and 'b' (col1) and 'x' (col2) plus one rare bucket per column
+    rare_col1 = set(df_e.col1[df_long_tail.col1.isin(["c", "d", "e", "f"])])
+    assert (
+        len(col1_idx) == 3
+        and len(col2_idx) == 2
+        and rare_col1 == {le.rare_idx["col1"]}
+        and le.inverse_encoding_dict["col1"][le.rare_idx["col1"]] == "rare"
+    )
+    if with_attention:
+        # the index keeps counting across columns
+        assert min(col2_idx) == max(col1_idx) + 1
+
+
+def test_label_encoder_min_freq_with_chunks():
+    le = LabelEncoder(["col1", "col2"], min_freq=2)
+    le.partial_fit(df_long_tail.iloc[:10].copy())
+    le.partial_fit(df_long_tail.iloc[10:].copy())
+    le.collapse_rare_categories()
+
+    full_le = LabelEncoder(["col1", "col2"], min_freq=2).fit(df_long_tail)
+
+    assert le.encoding_dict == full_le.encoding_dict
+
+
+@pytest.mark.parametrize("embed_dim_by_freq", [True, False])
+def test_tab_preprocessor_min_freq(embed_dim_by_freq):
+    tab_preprocessor = TabPreprocessor(
+        cat_embed_cols=["col1", "col2"],
+        min_freq=2,
+        embed_dim_by_freq=embed_dim_by_freq,
+    )
+    X_tab = tab_preprocessor.fit_transform(df_long_tail)
+
+    n_cats = {c: n for c, n, _ in tab_preprocessor.cat_embed_input}
+    embed_dims = {c: d for c, _, d in tab_preprocessor.cat_embed_input}
+
+    assert n_cats == {"col1": 3, "col2": 2}
+    assert X_tab.max(axis=0).tolist() == [3, 2]
+    if embed_dim_by_freq:
+        # a very skewed column has an effective cardinality close to 1
+        assert embed_dims["col2"] == embed_sz_rule(1)
+    else:
+        assert embed_dims == {"col1": embed_sz_rule(3), "col2": embed_sz_rule(2)}
+
+
+@pytest.mark.parametrize(
+    "min_freq, with_value_counts, expected_counts",
+    [
+        (None, False, {}),
+        (None, True, {"a": 10, "b": 6, "c": 1, "d": 1, "e": 1, "f": 1}),
+        (2, False, {"a": 10, "b": 6, "c": 1, "d": 1, "e": 1, "f": 1}),
+    ],
+)
+def test_label_encoder_value_counts(min_freq, with_value_counts, expected_counts):
+    # the counts are only kept when needed
+    le = LabelEncoder(
+        ["col1"], min_freq=min_freq, with_value_counts=with_value_counts
+    ).fit(df_long_tail)
+
+    assert le.value_counts.get("col1", {}) == expected_counts
+
+
+def test_tab_preprocessor_embed_dim_by_freq_without_min_freq():
+    tab_preprocessor = TabPreprocessor(
+        cat_embed_cols=["col1", "col2"], embed_dim_by_freq=True
+    )
+    tab_preprocessor.fit(df_long_tail)
+
+    embed_dims = {c: d for c, _, d in tab_preprocessor.cat_embed_input}
+
+    assert tab_preprocessor.label_encoder.with_value_counts and embed_dims[
+        "col2"
+    ] == embed_sz_rule(1)
+
+
+def test_label_encoder_partial_fit_new_categories_order():
+    le = LabelEncoder(["col1"])
+    le.partial_fit(pd.DataFrame({"col1": ["b", "a"]}))
+    le.partial_fit(pd.DataFrame({"col1": ["d", "a", "c", "d"]}))
+
+    # new categories are appended in the order they are seen
+    assert le.encoding_dict["col1"] == {"b": 1, "a": 2, "d": 3, "c": 4}
@@ -4,7 +4,7 @@ import pytest
 from sklearn.datasets import fetch_20newsgroups
 from sklearn.exceptions import NotFittedError
 
-from pytorch_widedeep.utils import text_utils
+from pytorch_widedeep.utils import Vocab, text_utils
 from pytorch_widedeep.preprocessing import TextPreprocessor
 
 texts = np.random.choice(fetch_20newsgroups().data, 10)
@@ -23,6 +23,59 @@ def test_pad_sequences():
     assert all(out)
 
 
+@pytest.mark.parametrize("pad_first", [True, False])
+@pytest.mark.parametrize("maxlen", [2, 5])
+def test_pad_sequences_batch(pad_first, maxlen):
+    seqs = [[2, 3, 4], [], [5, 6, 7, 8, 9, 10], [11]]
+    lengths = np.array([len(s) for s in seqs])
+    flat_seqs = np.array([el for s in seqs for el in s])
+    padded_seqs = text_utils.pad_sequences_batch(
+        flat_seqs, lengths, maxlen=maxlen, pad_first=pad_first, pad_idx=1
+    )
+    expected = np.vstack(
+        [
+            text_utils.pad_sequences(s, maxlen=maxlen, pad_first=pad_first, pad_idx=1)
+            for s in seqs
+        ]
+    )
+    assert padded_seqs.dtype == np.int32
+    assert np.array_equal(padded_seqs, expected)
+
+
+###############################################################################
+# Test ragged text
+###############################################################################
+def test_ragged_text():
+    X = np.array([[1, 1, 5, 6], [1, 7, 8, 9], [1, 1, 1, 1], [2, 3, 4, 5]])
+    X_ragged = text_utils.RaggedText.from_padded(X, padding_idx=1)
+
+    out = []
+    out.append(np.array_equal(X_ragged.lengths, [2, 3, 0, 4]))
+    out.append(np.array_equal(X_ragged[1], [7, 8, 9]))
+    out.append(np.array_equal(X_ragged.to_padded(maxlen=4), X))
+    # fancy indexing returns a new RaggedText
+    out.append(np.array_equal(X_ragged[[3, 0]].to_padded(maxlen=4), X[[3, 0]]))
+    out.append(
+        np.array_equal(X_ragged[X_ragged.lengths > 2].ids, [7, 8, 9, 2, 3, 4, 5])
+    )
+    # truncation keeps the last tokens, as padding does
+    out.append(np.array_equal(X_ragged.truncate(2).to_padded(), X[:, -2:]))
+    assert all(out)
+
+
+@pytest.mark.parametrize("pad_first", [True, False])
+def test_transform_return_ragged(pad_first):
+    text_preprocessor = TextPreprocessor(
+        text_col="texts", min_freq=0, maxlen=20, pad_first=pad_first, verbose=False
+    )
+    X_padded = text_preprocessor.fit_transform(df)
+    X_ragged = text_preprocessor.transform(df, return_ragged=True)
+
+    assert isinstance(X_ragged, text_utils.RaggedText)
+    assert X_ragged.lengths.max() <= 20
+    assert np.array_equal(X_ragged.to_padded(maxlen=20, pad_first=pad_first), X_padded)
+
+
 ###############################################################################
 # Test inverse transform
 ###############################################################################
@@ -58,3 +111,65 @@ def test_notfittederror():
     processor = TextPreprocessor(min_freq=0, text_col="texts")
     with pytest.raises(NotFittedError):
         processor.transform(df)
+
+
+###############################################################################
+# Test the regex tokenizer engine
+###############################################################################
+def test_regex_tokenizer_engine():
+    df = pd.DataFrame(
+        {
+            "text_column": [
+                "life is like a box of chocolates",
+                "You never know what you're going to get",
+            ]
+        }
+    )
+
+    spacy_text_preprocessor = TextPreprocessor(
+        text_col="text_column", max_vocab=25, min_freq=1, maxlen=10, verbose=False
+    )
+    regex_text_preprocessor = TextPreprocessor(
+        text_col="text_column",
+        max_vocab=25,
+        min_freq=1,
+        maxlen=10,
+        verbose=False,
+        tokenizer_engine="regex",
+    )
+
+    # simple_preprocess leaves clean text, so both engines return the same
+    # tokens
+    assert (
+        spacy_text_preprocessor.fit_transform(df)
+        == regex_text_preprocessor.fit_transform(df)
+    ).all()
+
+
+###############################################################################
+# Test the binary word vectors store
+###############################################################################
+def test_build_embeddings_matrix_from_store(tmp_path):
+    words = ["machine", "learning", "is", "great", "is"]
+    vectors = np.random.rand(len(words), 4).astype("float32")
+    word_vectors_path = str(tmp_path / "vectors.txt")
+    with open(word_vectors_path, "w") as f:
+        for word, vector in zip(words, vectors):
+            f.write(word + " " + " ".join(str(v) for v in vector) + "\n")
+
+    vocab = Vocab(max_vocab=20, min_freq=1).create([["machine", "is", "awesome"]])
+
+    store_path = text_utils.convert_word_vectors(word_vectors_path, verbose=0)
+    emb_from_text = text_utils.build_embeddings_matrix(
+        vocab, word_vectors_path, min_freq=1, verbose=0
+    )
+    emb_from_store = text_utils.build_embeddings_matrix(
+        vocab, store_path, min_freq=1, verbose=0
+    )
+
+    # the last vector is kept for duplicated words and the mean vector is
+    # used for words without a pretrained vector
+    assert np.allclose(emb_from_text, emb_from_store)
+    assert np.allclose(emb_from_store[vocab.stoi["is"]], vectors[-1])
+    assert np.allclose(emb_from_store[vocab.stoi["machine"]], vectors[0])
+    assert np.allclose(emb_from_store[vocab.stoi["awesome"]], vectors.mean(axis=0))
@@ -6,10 +6,14 @@ from that library to ensure adequate coverage
 Credit for the code here to Jeremy Howard and the fastai team
 """
 
+import pytest
+
 from pytorch_widedeep.utils.fastai_transforms import (
     Vocab,
     Tokenizer,
     BaseTokenizer,
+    RegexTokenizer,
+    SpacyTokenizer,
     fix_html,
     deal_caps,
     replace_rep,
@@ -106,6 +110,29 @@ def test_tokenize_ignores_extraneous_space():
     assert toks[0] == ["test"]
 
 
+@pytest.mark.parametrize("tok_func", [BaseTokenizer, SpacyTokenizer, RegexTokenizer])
+def test_tokenize_in_parallel(tok_func):
+    texts = [
+        "one two three four",
+        "Lorem ipsum dolor sit amet, consectetur adipiscing elit.",
+        "I'm suddenly SHOUTING FOR NO REASON",
+    ] * 10
+
+    toks = Tokenizer(tok_func, n_cpus=1).process_all(texts)
+    # small chunks so that the texts are sent to the worker processes
+    toks_parallel = Tokenizer(tok_func, n_cpus=2, chunksize=4).process_all(texts)
+    # the pool of workers is re-used
+    toks_parallel_2 = Tokenizer(tok_func, n_cpus=2, chunksize=4).process_all(texts)
+
+    assert toks == toks_parallel == toks_parallel_2 and len(toks) == len(texts)
+
+
+def test_regex_tokenizer():
+    texts = ["Lorem ipsum, dolor sit amet."]
+    toks = Tokenizer(RegexTokenizer).process_all(texts)
+    assert toks[0] == ["xxmaj", "lorem", "ipsum", ",", "dolor", "sit", "amet", "."]
+
+
 def test_numericalize_and_textify():
     toks = [
         ["ok", "!", "xxmaj", "nice", "!", "anti", "-", "virus"],
@@ -1,4 +1,5 @@
 import numpy as np
+import torch
 import pandas as pd
 import pytest
 
@@ -192,3 +193,62 @@ def test_feature_importances_tabnet():
     feat_imp_per_sample = trainer.explain(X_te, save_step_masks=False)
 
     assert len(feat_imps) == df_tr.shape[1] and feat_imp_per_sample.shape == df_te.shape
+
+
+def _fit_tabtransformer_trainer(feature_importance_sample_size):
+    tab_preprocessor = TabPreprocessor(
+        cat_embed_cols=cat_cols,
+        continuous_cols=cont_cols,
+        with_attention=True,
+    )
+    X_tr = tab_preprocessor.fit_transform(df_tr).astype(float)
+    X_te = tab_preprocessor.transform(df_te).astype(float)
+
+    tab_model = _build_model_for_feat_imp_test(
+        "tabtransformer",
+        {
+            "column_idx": tab_preprocessor.column_idx,
+            "cat_embed_input": tab_preprocessor.cat_embed_input,
+            "continuous_cols": tab_preprocessor.continuous_cols,
+        },
+    )
+
+    trainer = Trainer(WideDeep(deeptabular=tab_model), objective="binary")
+    trainer.fit(
+        X_tab=X_tr,
+        target=y_tr,
+        n_epochs=1,
+        batch_size=16,
+        feature_importance_sample_size=feature_importance_sample_size,
+    )
+
+    return trainer, X_te
+
+
+def test_feature_importances_sample_size_smaller_than_batch_size():
+    trainer, _ = _fit_tabtransformer_trainer(feature_importance_sample_size=4)
+
+    assert len(trainer.feature_importance) == df_tr.shape[1] and np.isclose(
+        sum(trainer.feature_importance.values()), 1.0
+    )
+
+
+def test_explain_cache():
+    trainer, X_te = _fit_tabtransformer_trainer(feature_importance_sample_size=16)
+
+    feat_imp_first_half = trainer.explain(X_te[:8])
+    n_cached = len(trainer.explainer._cache)
+
+    # only the last 8 rows are passed through the model
+    feat_imp = trainer.explain(X_te)
+
+    cache_is_reused = np.allclose(feat_imp[:8], feat_imp_first_half) and (
+        n_cached == 8 and len(trainer.explainer._cache) == len(X_te)
+    )
+
+    # any modification of the model weights invalidates the cache
+    with torch.no_grad():
+        next(trainer.model.parameters()).add_(1.0)
+    _ = trainer.explain(X_te[:4])
+
+    assert cache_is_reused and len(trainer.explainer._cache) == 4
@@ -177,3 +177,58 @@ def test_full_training_process(model_name):
 
     assert len(trainer.history) > 0 and "train_loss" in trainer.history.keys()
     assert preds.shape[0] == 2
+
+
+@pytest.mark.parametrize("dynamic_truncation", [True, False])
+def test_training_with_attention_mask(dynamic_truncation):
+    model_name = "distilbert-base-uncased"
+    tab_preprocessor = TabPreprocessor(
+        embed_cols=["cat1", "cat2"], continuous_cols=["num1", "num2"]
+    )
+    X_tab = tab_preprocessor.fit_transform(df)
+    tabmlp = TabMlp(
+        column_idx=tab_preprocessor.column_idx,
+        cat_embed_input=tab_preprocessor.cat_embed_input,
+        continuous_cols=tab_preprocessor.continuous_cols,
+        mlp_hidden_dims=[32, 16],
+    )
+
+    tokenizer = HFTokenizer(
+        model_name=model_name,
+        text_col="random_sentences",
+        encode_params={"max_length": 64, "padding": "max_length", "truncation": True},
+    )
+    X_text, X_text_mask = tokenizer.fit_transform(df, return_attention_mask=True)
+    hf_model = HFModel(model_name=model_name, dynamic_truncation=dynamic_truncation)
+    model = WideDeep(deeptabular=tabmlp, deeptext=hf_model)
+
+    # with the mask and the trailing padding removed, the cls token output is
+    # the same as without them
+    hf_model.eval()
+    out_with_mask = hf_model(
+        torch.tensor(X_text[:4]), attention_mask=torch.tensor(X_text_mask[:4])
+    )
+    out_without_mask = HFModel.forward(hf_model, torch.tensor(X_text[:4]))
+    assert torch.allclose(out_with_mask, out_without_mask, atol=1e-5)
+
+    trainer = Trainer(model, objective="binary", verbose=0)
+    trainer.fit(
+        X_train={
+            "X_tab": X_tab,
+            "X_text": X_text,
+            "X_text_mask": X_text_mask,
+            "target": df.target.values,
+        },
+        val_split=0.2,
+        batch_size=8,
+    )
+    preds = trainer.predict(
+        X_test={
+            "X_tab": X_tab[:2],
+            "X_text": X_text[:2],
+            "X_text_mask": X_text_mask[:2],
+        }
+    )
+
+    assert len(trainer.history) > 0 and "train_loss" in trainer.history.keys()
+    assert preds.shape[0] == 2
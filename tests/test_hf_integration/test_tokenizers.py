@@ -77,6 +77,29 @@ def test_tokenizer_multiprocessing():
     assert X.shape[0] == df.shape[0]
 
 
+@pytest.mark.parametrize("use_fast_tokenizer", [True, False])
+def test_tokenizer_batched_encoding(use_fast_tokenizer):
+    tokenizer = HFTokenizer(
+        model_name="distilbert-base-uncased",
+        use_fast_tokenizer=use_fast_tokenizer,
+        encode_params=encoder_params,
+    )
+    X = tokenizer.encode(df.random_sentences.tolist())
+
+    # small chunks so that the texts are encoded by more than one worker
+    batched_tokenizer = HFTokenizer(
+        model_name="distilbert-base-uncased",
+        use_fast_tokenizer=use_fast_tokenizer,
+        num_workers=2,
+        chunksize=8,
+        encode_params=encoder_params,
+    )
+    X_batched = batched_tokenizer.encode(df.random_sentences.tolist())
+
+    assert X_batched.dtype == np.int32
+    assert np.array_equal(X, X_batched)
+
+
 def test_tokenizer_with_params():
     tokenizer = HFTokenizer(
         model_name="distilbert-base-uncased", encode_params=encoder_params
@@ -1,5 +1,6 @@
 import os
 
+import numpy as np
 import pandas as pd
 import pytest
 
@@ -162,3 +163,180 @@ def test_chunk_text_preprocessor():
     reconstruced_df_chunk = chunk_text_processor.inverse_transform(X_text_chunk)
 
     assert reconstruced_df.equals(reconstruced_df_chunk)
+
+
+@pytest.mark.parametrize("n_jobs", [1, 2])
+@pytest.mark.parametrize("with_attention", [True, False])
+def test_chunk_tab_preprocessor_fit_parallel(n_jobs, with_attention):
+    df = pd.read_csv(os.path.join(data_folder, fname))
+
+    params = dict(
+        cat_embed_cols=cat_cols,
+        continuous_cols=num_cols,
+        cols_to_scale=["numeric1"],
+        with_attention=with_attention,
+        with_cls_token=with_attention,
+    )
+
+    chunk_tab_processor = ChunkTabPreprocessor(n_chunks=n_chunks, **params)
+    for chunk in pd.read_csv(os.path.join(data_folder, fname), chunksize=chunksize):
+        chunk_tab_processor.partial_fit(chunk)
+    X_tab_chunk = chunk_tab_processor.transform(df)
+
+    # n_chunks is set to the number of chunks seen when fitting in parallel
+    parallel_tab_processor = ChunkTabPreprocessor(n_chunks=1, **params)
+    parallel_tab_processor.fit_parallel(
+        pd.read_csv(os.path.join(data_folder, fname), chunksize=chunksize),
+        n_jobs=n_jobs,
+    )
+    X_tab_parallel = parallel_tab_processor.transform(df)
+
+    assert (
+        parallel_tab_processor.n_chunks == n_chunks
+        and parallel_tab_processor.label_encoder.encoding_dict
+        == chunk_tab_processor.label_encoder.encoding_dict
+        and np.allclose(X_tab_chunk, X_tab_parallel)
+    )
+
+
+@pytest.mark.parametrize("n_jobs", [1, 2])
+def test_chunk_wide_processor_fit_parallel(n_jobs):
+    df = pd.read_csv(os.path.join(data_folder, fname))
+    wide_processor = WidePreprocessor(wide_cols=cat_cols)
+    X_wide = wide_processor.fit_transform(df)
+
+    chunk_wide_processor = ChunkWidePreprocessor(wide_cols=cat_cols, n_chunks=1)
+    chunk_wide_processor.fit_parallel(
+        pd.read_csv(os.path.join(data_folder, fname), chunksize=chunksize),
+        n_jobs=n_jobs,
+    )
+    X_wide_chunk = chunk_wide_processor.transform(df)
+
+    reconstruced_df = wide_processor.inverse_transform(X_wide)
+    reconstruced_df_chunk = chunk_wide_processor.inverse_transform(X_wide_chunk)
+
+    assert reconstruced_df.equals(reconstruced_df_chunk)
+
+
+@pytest.mark.parametrize("n_jobs", [1, 2])
+def test_chunk_text_preprocessor_fit_parallel(n_jobs):
+    df = pd.read_csv(os.path.join(data_folder, fname))
+    text_processor = TextPreprocessor(
+        text_col=text_col, n_cpus=1, maxlen=10, max_vocab=50
+    )
+    X_text = text_processor.fit_transform(df)
+
+    chunk_text_processor = ChunkTextPreprocessor(
+        text_col=text_col, n_chunks=1, n_cpus=1, maxlen=10, max_vocab=50
+    )
+    chunk_text_processor.fit_parallel(
+        pd.read_csv(os.path.join(data_folder, fname), chunksize=chunksize),
+        n_jobs=n_jobs,
+    )
+    X_text_chunk = chunk_text_processor.transform(df)
+
+    assert (
+        chunk_text_processor.vocab.itos == text_processor.vocab.itos
+        and (X_text == X_text_chunk).all()
+    )
+
+
+def test_chunk_preprocessor_merge():
+    df = pd.read_csv(os.path.join(data_folder, fname))
+    chunks = list(pd.read_csv(os.path.join(data_folder, fname), chunksize=chunksize))
+
+    chunk_tab_processor = ChunkTabPreprocessor(
+        n_chunks=n_chunks, cat_embed_cols=cat_cols, continuous_cols=num_cols
+    )
+    for chunk in chunks:
+        chunk_tab_processor.partial_fit(chunk)
+
+    # two processors fitted on half of the chunks each
+    first_half = ChunkTabPreprocessor(
+        n_chunks=n_chunks, cat_embed_cols=cat_cols, continuous_cols=num_cols
+    )
+    second_half = ChunkTabPreprocessor(
+        n_chunks=n_chunks, cat_embed_cols=cat_cols, continuous_cols=num_cols
+    )
+    for chunk in chunks[: n_chunks // 2]:
+        first_half.partial_fit(chunk)
+    for chunk in chunks[n_chunks // 2 :]:
+        second_half.partial_fit(chunk)
+    first_half.merge(second_half)
+
+    assert first_half.is_fitted and np.allclose(
+        first_half.transform(df), chunk_tab_processor.transform(df)
+    )
+
+
+@pytest.mark.parametrize("quantization_strategy", ["uniform", "quantile"])
+@pytest.mark.parametrize("fit_parallel", [True, False])
+def test_chunk_tab_preprocessor_quantization(quantization_strategy, fit_parallel):
+    df = pd.read_csv(os.path.join(data_folder, fname))
+
+    # numeric1 is scaled and then quantized
+    quantization_setup = {"numeric1": 3, "numeric2": 4}
+    tab_processor = TabPreprocessor(
+        cat_embed_cols=cat_cols,
+        continuous_cols=num_cols,
+        cols_to_scale=["numeric1"],
+        quantization_setup=quantization_setup,
+        quantization_strategy=quantization_strategy,
+    )
+    X_tab = tab_processor.fit_transform(df)
+
+    chunk_tab_processor = ChunkTabPreprocessor(
+        n_chunks=n_chunks,
+        cat_embed_cols=cat_cols,
+        continuous_cols=num_cols,
+        cols_to_scale=["numeric1"],
+        cols_and_bins=quantization_setup,
+        quantization_strategy=quantization_strategy,
+    )
+    if fit_parallel:
+        chunk_tab_processor.fit_parallel(
+            pd.read_csv(os.path.join(data_folder, fname), chunksize=chunksize),
+            n_jobs=1,
+        )
+    else:
+        for chunk in pd.read_csv(os.path.join(data_folder, fname), chunksize=chunksize):
+            chunk_tab_processor.partial_fit(chunk)
+
+    # the bins do not depend on the data passed to transform
+    X_tab_chunk = chunk_tab_processor.transform(df.iloc[:chunksize])
+
+    assert (
+        all(
+            np.allclose(chunk_tab_processor.quantizer.bins[col], bins)
+            for col, bins in tab_processor.quantizer.bins.items()
+        )
+        and (X_tab[:chunksize] == X_tab_chunk).all()
+    )
+
+
+@pytest.mark.parametrize("embed_dim_by_freq", [True, False])
+def test_chunk_tab_preprocessor_auto_embed_dim(embed_dim_by_freq):
+    df = pd.read_csv(os.path.join(data_folder, fname))
+    tab_processor = TabPreprocessor(
+        cat_embed_cols=cat_cols,
+        continuous_cols=num_cols,
+        auto_embed_dim=True,
+        embed_dim_by_freq=embed_dim_by_freq,
+        min_freq=2 if embed_dim_by_freq else None,
+    )
+    tab_processor.fit(df)
+
+    chunk_tab_processor = ChunkTabPreprocessor(
+        n_chunks=n_chunks,
+        cat_embed_cols=cat_cols,
+        continuous_cols=num_cols,
+        auto_embed_dim=True,
+        embed_dim_by_freq=embed_dim_by_freq,
+        min_freq=2 if embed_dim_by_freq else None,
+    )
+    for chunk in pd.read_csv(os.path.join(data_folder, fname), chunksize=chunksize):
+        chunk_tab_processor.partial_fit(chunk)
+
+    assert sorted(chunk_tab_processor.cat_embed_input) == sorted(
+        tab_processor.cat_embed_input
+    )
@@ -1,5 +1,6 @@
 import os
 
+import numpy as np
 import torch
 import pandas as pd
 import pytest
@@ -18,6 +19,11 @@ from pytorch_widedeep.load_from_folder import (
     ImageFromFolder,
     WideDeepDatasetFromFolder,
 )
+from pytorch_widedeep.load_from_folder.image.image_from_folder import (
+    cv2_loader,
+    default_loader,
+    torchvision_loader,
+)
 
 full_path = os.path.realpath(__file__)
 path = os.path.split(full_path)[0]
@@ -112,6 +118,41 @@ def test_text_from_folder_alone():
     assert (processed_sample == processed_sample_from_folder).all()
 
 
+def test_text_from_folder_with_cache(tmp_path):
+    df = pd.read_csv("/".join([data_folder, fname]))
+
+    text_processors = []
+    for maxlen in [10, 12]:
+        chunk_text_processor = ChunkTextPreprocessor(
+            text_col=text_col, n_chunks=1, n_cpus=1, maxlen=maxlen, max_vocab=50
+        )
+        for chunk in pd.read_csv("/".join([data_folder, fname]), chunksize=chunksize):
+            chunk_text_processor.partial_fit(chunk)
+        text_processors.append(chunk_text_processor)
+
+    text_folder = TextFromFolder(
+        preprocessor=text_processors[0], cache_dir=str(tmp_path)
+    )
+    # a different vocabulary or padding must result in a different cache
+    text_folder_other_vocab = TextFromFolder(
+        preprocessor=text_processors[1], cache_dir=str(tmp_path)
+    )
+
+    processed_sample = text_processors[0].transform(df)[:4]
+    first_access = [text_folder.get_item(t) for t in df.text.loc[:3]]
+    second_access = [text_folder.get_item(t) for t in df.text.loc[:3]]
+    _ = [text_folder_other_vocab.get_item(t) for t in df.text.loc[:1]]
+
+    assert (
+        len(text_folder.cache) == df.text.loc[:3].nunique()
+        and len(text_folder_other_vocab.cache) == df.text.loc[:1].nunique()
+        and all(
+            np.array_equal(a, b) and np.array_equal(a, c)
+            for a, b, c in zip(processed_sample, first_access, second_access)
+        )
+    )
+
+
 def test_image_from_folder_alone():
     df = pd.read_csv("/".join([data_folder, fname]))
 
@@ -147,6 +188,42 @@ def test_image_from_folder_with_transforms():
     return processed_sample_from_folder.shape == torch.Size([3, 10, 10])
 
 
+@pytest.mark.parametrize("loader", [default_loader, cv2_loader, torchvision_loader])
+def test_image_from_folder_with_cache(tmp_path, loader):
+    df = pd.read_csv("/".join([data_folder, fname]))
+
+    img_preprocessor = ImagePreprocessor(
+        img_col=img_col, img_path=img_folder, width=32, height=32
+    )
+
+    img_from_folder = ImageFromFolder(
+        preprocessor=img_preprocessor, loader=loader, cache_dir=str(tmp_path)
+    )
+    img_from_folder_no_cache = ImageFromFolder(
+        preprocessor=img_preprocessor, loader=loader
+    )
+
+    # first access fills the cache, second one reads from it
+    first_access = [img_from_folder.get_item(f) for f in df.images.loc[:3]]
+    second_access = [img_from_folder.get_item(f) for f in df.images.loc[:3]]
+    no_cache = [img_from_folder_no_cache.get_item(f) for f in df.images.loc[:3]]
+
+    assert len(img_from_folder.cache) == 4 and all(
+        np.array_equal(a, b) and np.array_equal(a, c)
+        for a, b, c in zip(first_access, second_access, no_cache)
+    )
+
+
+def test_cv2_loader_reduced_decoding():
+    img_path = os.path.join(img_folder, "image_0.png")
+
+    full_img = cv2_loader(img_path)
+    h, w = full_img.shape[:2]
+    reduced_img = cv2_loader(img_path, reduce_to=(h // 2, w // 2))
+
+    assert reduced_img.shape[:2] == (h // 2, w // 2)
+
+
 @pytest.mark.parametrize("hugginface", [True, False])
 def test_full_wide_deep_dataset_from_folder(hugginface):
     df = pd.read_csv("/".join([data_folder, fname]))
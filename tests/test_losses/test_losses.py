@@ -15,6 +15,7 @@ from pytorch_widedeep.losses import (
     ZILNLoss,
     HuberLoss,
     RMSLELoss,
+    InfoNCELoss,
     TweedieLoss,
     FocalR_L1Loss,
     FocalR_MSELoss,
@@ -376,3 +377,68 @@ def test_FocalR_losses_act_f(loss_f):
         except Exception:
             has_run = False
         assert has_run
+
+
+##############################################################################
+# Test InfoNCE loss: chunked and with capped negatives
+##############################################################################
+def _infonce(z, z_, reduction):
+    norm_z = torch.nn.functional.normalize(z, dim=-1).flatten(1)
+    norm_z_ = torch.nn.functional.normalize(z_, dim=-1).flatten(1)
+    target = torch.arange(len(norm_z))
+    loss = torch.nn.functional.cross_entropy(
+        (norm_z @ norm_z_.t()) / 0.1, target, reduction=reduction
+    )
+    loss_ = torch.nn.functional.cross_entropy(
+        (norm_z_ @ norm_z.t()) / 0.1, target, reduction=reduction
+    )
+    return (loss + loss_) / 2.0
+
+
+@pytest.mark.parametrize("reduction", ["mean", "sum", "none"])
+@pytest.mark.parametrize("chunk_size", [None, 4, 7, 32])
+def test_infonce_chunked(reduction, chunk_size):
+    z = torch.randn(23, 5, 8, requires_grad=True)
+    z_ = torch.randn(23, 5, 8, requires_grad=True)
+
+    expected = _infonce(z, z_, reduction)
+    expected_grads = torch.autograd.grad(expected.sum(), (z, z_))
+
+    loss = InfoNCELoss(reduction=reduction, chunk_size=chunk_size)((z, z_))
+    grads = torch.autograd.grad(loss.sum(), (z, z_))
+
+    assert torch.allclose(loss, expected, atol=1e-5)
+    assert all(torch.allclose(g, eg, atol=1e-5) for g, eg in zip(grads, expected_grads))
+
+
+def test_infonce_max_negatives():
+    z = torch.randn(11, 5, 8, requires_grad=True)
+    z_ = torch.randn(11, 5, 8, requires_grad=True)
+
+    # as many negatives as in the batch: same loss, in a different order
+    all_neg = InfoNCELoss(max_negatives=10)((z, z_))
+    assert torch.allclose(all_neg, _infonce(z, z_, "mean"), atol=1e-5)
+
+    # 11 observations in groups of 4: the last group only has 3
+    loss = InfoNCELoss(max_negatives=3, reduction="none")((z, z_))
+    loss.sum().backward()
+
+    assert loss.shape == (11,)
+    assert torch.isfinite(z.grad).all() and torch.isfinite(z_.grad).all()
+
+    # the groups are reproducible if a seeded generator is passed
+    def _loss(generator):
+        return InfoNCELoss(max_negatives=3, reduction="none")((z, z_), generator)
+
+    assert torch.equal(
+        _loss(torch.Generator().manual_seed(0)),
+        _loss(torch.Generator().manual_seed(0)),
+    )
+
+    # each observation is contrasted with its own positive and the loss is
+    # returned in the order of the input
+    perm = torch.randperm(11, generator=torch.Generator().manual_seed(0))
+    expected = torch.empty(11)
+    for group in perm.split(4):
+        expected[group] = _infonce(z[group], z_[group], "none")
+    assert torch.allclose(_loss(torch.Generator().manual_seed(0)), expected, atol=1e-5)
@@ -5,7 +5,11 @@ import torch
 import pandas as pd
 import pytest
 
-from pytorch_widedeep.models import SelfAttentionMLP, ContextAttentionMLP
+from pytorch_widedeep.models import (
+    SelfAttentionMLP,
+    ContextAttentionMLP,
+    capture_attention_weights,
+)
 from pytorch_widedeep.preprocessing import TabPreprocessor
 
 colnames = list(string.ascii_lowercase)[:10]
@@ -138,7 +142,8 @@ def test_shared_embed_and_cls(
             with_addnorm=with_addnorm,
         )
 
-    out = model(X_inp)
+    with capture_attention_weights(model):
+        out = model(X_inp)
     attn_weights = model.attention_weights
 
     checks = []
@@ -1,3 +1,4 @@
+import copy
 import string
 
 import numpy as np
@@ -5,8 +6,13 @@ import torch
 import pytest
 
 from pytorch_widedeep.wdtypes import WideDeep
+from pytorch_widedeep.models.tabular.tabnet import sparsemax
 from pytorch_widedeep.models.tabular.tabnet._utils import create_explain_matrix
-from pytorch_widedeep.models.tabular.tabnet.tab_net import TabNet  # noqa: F403
+from pytorch_widedeep.models.tabular.tabnet._layers import GBN
+from pytorch_widedeep.models.tabular.tabnet.tab_net import (  # noqa: F403
+    TabNet,
+    tabnet_inference_mode,
+)
 
 # I am going over test this model due to the number of components
 
@@ -92,6 +98,8 @@ def test_tabnet_embed_continuos(embed_continuous):
     [
         "sparsemax",
         "entmax",
+        "sparsemax_bisect",
+        "entmax_bisect",
     ],
 )
 def test_mask_type(mask_type):
@@ -105,6 +113,32 @@ def test_mask_type(mask_type):
     assert out1.size(0) == 10 and out1.size(1) == model.step_dim
 
 
+@pytest.mark.parametrize(
+    "mask_fn, mask_bisect_fn",
+    [
+        (sparsemax.sparsemax, sparsemax.sparsemax_bisect),
+        (sparsemax.entmax15, sparsemax.entmax15_bisect),
+    ],
+)
+@pytest.mark.parametrize("dim", [-1, 1])
+def test_bisect_masks(mask_fn, mask_bisect_fn, dim):
+    torch.manual_seed(0)
+    X = torch.randn(32, 20, 3, dtype=torch.double) * 3
+    X1 = X.clone().requires_grad_()
+    X2 = X.clone().requires_grad_()
+    grad = torch.randn_like(X)
+
+    # the sort based sparsemax modifies its input in place
+    out1 = mask_fn(X1 * 1.0, dim)
+    out2 = mask_bisect_fn(X2, dim)
+    out1.backward(grad)
+    out2.backward(grad)
+
+    assert torch.allclose(out1, out2, atol=1e-6)
+    assert torch.allclose(out2.sum(dim), torch.ones(1, dtype=X.dtype))
+    assert torch.allclose(X1.grad, X2.grad, atol=1e-6)
+
+
 ###############################################################################
 # Test functioning with/without ghost BN
 ###############################################################################
@@ -128,6 +162,35 @@ def test_ghost_bn(ghost_bn):
     assert out1.size(0) == 10 and out1.size(1) == model.step_dim
 
 
+@pytest.mark.parametrize(
+    "bsz, virtual_batch_size",
+    [(256, 128), (300, 128), (50, 128), (257, 32)],
+)
+def test_ghost_bn_matches_chunked_bn(bsz, virtual_batch_size):
+    torch.manual_seed(0)
+    gbn = GBN(8, virtual_batch_size=virtual_batch_size, momentum=0.1)
+    bn = copy.deepcopy(gbn.bn)
+    with torch.no_grad():
+        gbn.bn.weight.uniform_()
+        gbn.bn.bias.uniform_()
+        bn.load_state_dict(gbn.bn.state_dict())
+
+    X = torch.randn(bsz, 8) * 3 + 1
+    n_chunks = int(np.ceil(bsz / virtual_batch_size))
+    for _ in range(2):
+        out = gbn(X)
+        expected = torch.cat([bn(x) for x in X.chunk(n_chunks, 0)], dim=0)
+        assert torch.allclose(out, expected, atol=1e-5)
+
+    assert torch.allclose(gbn.bn.running_mean, bn.running_mean, atol=1e-5)
+    assert torch.allclose(gbn.bn.running_var, bn.running_var, atol=1e-5)
+    assert gbn.bn.num_batches_tracked == bn.num_batches_tracked
+
+    gbn.eval()
+    bn.eval()
+    assert torch.allclose(gbn(X), bn(X), atol=1e-5)
+
+
 ###############################################################################
 # Test forward_mask method
 ###############################################################################
@@ -150,6 +213,31 @@ def test_forward_masks():
     assert all(out)
 
 
+###############################################################################
+# Test tabnet_inference_mode
+###############################################################################
+
+
+def test_tabnet_inference_mode():
+    model = TabNet(
+        column_idx={k: v for v, k in enumerate(colnames)},
+        cat_embed_input=embed_input,
+        continuous_cols=colnames[n_cols:],
+    )
+    model.eval()
+    with torch.no_grad():
+        out, M_loss = model(X_tab)
+        M_explain, masks = model.forward_masks(X_tab)
+        with tabnet_inference_mode(model, store_masks=True):
+            out_inf, M_loss_inf = model(X_tab)
+
+    assert model.encoder.compute_sparsity_loss and not model.encoder.store_masks
+    assert M_loss.item() != 0 and M_loss_inf.item() == 0
+    assert torch.allclose(out, out_inf)
+    assert torch.allclose(M_explain, model.encoder.M_explain)
+    assert all(torch.allclose(masks[k], model.encoder.masks[k]) for k in masks)
+
+
 ###############################################################################
 # Test create_explain_matrix
 ###############################################################################
@@ -1,3 +1,5 @@
+import contextlib
+
 import numpy as np
 import torch
 import pytest
@@ -7,6 +9,7 @@ from pytorch_widedeep.models import (
     Transformer,
     AttentiveRNN,
     StackedAttentiveRNN,
+    capture_attention_weights,
 )
 
 padded_sequences = np.random.choice(np.arange(1, 100), (100, 48))
@@ -67,7 +70,8 @@ def test_basic_model_with_attn(bidirectional, attn_concatenate):
         bidirectional=bidirectional,
         attn_concatenate=attn_concatenate,
     )
-    out = model(torch.from_numpy(padded_sequences))
+    with capture_attention_weights(model):
+        out = model(torch.from_numpy(padded_sequences))
     if attn_concatenate and bidirectional:
         out_size_1_ok = out.size(1) == model.hidden_dim * 4
     elif attn_concatenate or bidirectional:
@@ -297,7 +301,8 @@ def test_attn_weights(stacked):
             head_hidden_dims=[64, 16],
         )
 
-    out = model(torch.from_numpy(padded_sequences))  # noqa: F841
+    with capture_attention_weights(model):
+        out = model(torch.from_numpy(padded_sequences))  # noqa: F841
 
     attn_w = model.attention_weights
 
@@ -309,6 +314,81 @@ def test_attn_weights(stacked):
         assert attn_w.size() == torch.Size([100, 50])
 
 
+###############################################################################
+# Test packed sequences
+###############################################################################
+
+
+@pytest.mark.parametrize(
+    "model_name",
+    ["basic", "attentive", "stacked"],
+)
+@pytest.mark.parametrize(
+    "bidirectional",
+    [True, False],
+)
+def test_packed_sequences(model_name, bidirectional):
+    # sequences of different lengths, padded at the beginning (index 0)
+    lengths = np.random.randint(1, 50, 100)
+    X = np.zeros((100, 50), dtype=np.int64)
+    for i, length in enumerate(lengths):
+        X[i, -length:] = np.random.choice(np.arange(1, 100), length)
+
+    params = dict(
+        vocab_size=vocab_size,
+        embed_dim=16,
+        hidden_dim=8,
+        padding_idx=0,
+        bidirectional=bidirectional,
+    )
+    torch.manual_seed(0)
+    if model_name == "basic":
+        model = BasicRNN(use_packed_sequences=True, n_layers=2, **params)
+    elif model_name == "attentive":
+        model = AttentiveRNN(use_packed_sequences=True, n_layers=2, **params)
+    else:
+        model = StackedAttentiveRNN(use_packed_sequences=True, n_blocks=2, **params)
+    model.eval()
+
+    out = model(torch.from_numpy(X))
+
+    # with packed sequences the padding has no effect: the output for a
+    # sequence is the same as the one for that sequence without padding
+    model.use_packed_sequences = False
+    out_no_pad = model(torch.from_numpy(X[:1, -lengths[0] :]))
+
+    assert out.size(0) == 100
+    assert torch.allclose(out[:1], out_no_pad, atol=1e-5)
+
+
+@pytest.mark.parametrize(
+    "model_name",
+    ["basic", "attentive", "stacked"],
+)
+def test_lengths_input(model_name):
+    # sequences padded at the end, as the ragged text inputs are collated,
+    # passed alongside their lengths
+    lengths = np.random.randint(0, 50, 100)
+    X = np.zeros((100, 50), dtype=np.int64)
+    for i, length in enumerate(lengths):
+        X[i, :length] = np.random.choice(np.arange(1, 100), length)
+
+    params = dict(vocab_size=vocab_size, embed_dim=16, hidden_dim=8, padding_idx=0)
+    if model_name == "basic":
+        model = BasicRNN(use_packed_sequences=True, **params)
+    elif model_name == "attentive":
+        model = AttentiveRNN(use_packed_sequences=True, **params)
+    else:
+        model = StackedAttentiveRNN(use_packed_sequences=True, **params)
+    model.eval()
+
+    out = model(torch.from_numpy(X), torch.from_numpy(lengths))
+    # lengths inferred from the padding index
+    out_inferred = model(torch.from_numpy(X))
+
+    assert torch.allclose(out, out_inferred, atol=1e-5)
+
+
 # ###############################################################################
 # # Test Basic Transformer
 # ###############################################################################
@@ -349,6 +429,45 @@ def test_basic_transformer(with_cls_token):
     assert all(res)
 
 
+@pytest.mark.parametrize(
+    "attention",
+    ["standard", "stored_weights", "linear"],
+)
+def test_basic_transformer_lengths(attention):
+    # sequences padded at the end, as the ragged text inputs are collated.
+    # With a cls token, the output must not depend on the padding tokens
+    lengths = torch.randint(1, 8, (16,))
+    X = torch.randint(1, 10, (16, 8))
+    X_other = torch.where(
+        torch.arange(8).unsqueeze(0) < lengths.unsqueeze(1),
+        X,
+        torch.randint(1, 10, (16, 8)),
+    )
+    X[:, 0] = X_other[:, 0] = 10  # cls token
+
+    model = Transformer(
+        vocab_size=11,
+        seq_length=10,
+        input_dim=8,
+        n_heads=2,
+        n_blocks=2,
+        use_linear_attention=attention == "linear",
+        with_cls_token=True,
+    ).eval()
+
+    ctx = (
+        capture_attention_weights(model)
+        if attention == "stored_weights"
+        else contextlib.nullcontext()
+    )
+    with ctx:
+        out = model(X, lengths)
+        out_other = model(X_other, lengths)
+
+    assert out.shape == (16, model.output_dim)
+    assert torch.allclose(out, out_other, atol=1e-5)
+
+
 # ###############################################################################
 # # Test Custom Positional Encoder
 # ###############################################################################
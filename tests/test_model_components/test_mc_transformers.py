@@ -11,6 +11,7 @@ from pytorch_widedeep.models import (
     FTTransformer,
     TabFastFormer,
     TabTransformer,
+    capture_attention_weights,
 )
 from pytorch_widedeep.models.tabular.embeddings_layers import (
     ContEmbeddings,
@@ -391,7 +392,8 @@ def test_transformers_keep_attn(model_name):
 
     model = _build_model(model_name, params)
 
-    out = model(X_tab)
+    with capture_attention_weights(model):
+        out = model(X_tab)
 
     res = [out.size(0) == 10]
     if model_name != "tabperceiver":
@@ -477,3 +479,131 @@ def test_transformers_only_cont(model_name):
     out = model(X_tab_only_cont)
 
     assert out.size(0) == 10 and out.size(1) == model.output_dim
+
+
+###############################################################################
+# Test SAINT row attention in windows and with a reference set of rows
+###############################################################################
+
+
+def test_saint_row_attn_chunksize():
+    model = SAINT(
+        column_idx={k: v for v, k in enumerate(colnames)},
+        cat_embed_input=embed_input,
+        continuous_cols=colnames[n_cols:],
+        row_attn_chunksize=4,
+    )
+    with capture_attention_weights(model):
+        out = model(X_tab)
+
+    # 2 complete windows of 4 rows, the remaining 2 rows attend to each other
+    assert out.size(0) == 10
+    assert list(model.attention_weights[0][1].shape) == [2, model.n_heads, 4, 4]
+
+
+@pytest.mark.parametrize("row_attn_chunksize", [None, 3])
+def test_saint_row_attention_reference(row_attn_chunksize):
+    model = SAINT(
+        column_idx={k: v for v, k in enumerate(colnames)},
+        cat_embed_input=embed_input,
+        continuous_cols=colnames[n_cols:],
+        row_attn_chunksize=row_attn_chunksize,
+    )
+    model.set_row_attention_reference(X_tab[:6])
+
+    # with a reference set, the output of a row does not depend on the batch
+    out = model(X_tab)
+    out_single_rows = torch.cat([model(X_tab[i : i + 1]) for i in range(10)])
+    assert torch.allclose(out, out_single_rows, atol=1e-5)
+
+    # the reference is ignored in train mode
+    model.train()
+    with capture_attention_weights(model):
+        model(X_tab)
+    assert model.attention_weights[0][1] is not None
+
+    model.eval()
+    model.clear_row_attention_reference()
+    assert all(blk.row_attn_kv is None for blk in model.encoder)
+
+
+###############################################################################
+# Test TabPerceiver keys and values are computed once with shared weights
+###############################################################################
+
+
+@pytest.mark.parametrize("share_weights", [True, False])
+def test_tabperceiver_kv_reuse(share_weights):
+    model = TabPerceiver(
+        column_idx={k: v for v, k in enumerate(colnames)},
+        cat_embed_input=embed_input,
+        continuous_cols=colnames[n_cols:],
+        n_cross_attns=2,
+        n_perceiver_blocks=3,
+        n_latents=4,
+        latent_dim=16,
+        share_weights=share_weights,
+    )
+    model.eval()
+
+    n_calls = []
+
+    def _count_calls(module, input, output):
+        n_calls.append(1)
+
+    # shared cross attention layers are registered only once
+    kv_projs = {
+        id(cross_attn): cross_attn.attn.kv_proj
+        for blk in model.encoder.values()
+        for cross_attn in blk["cross_attns"]
+    }
+    for kv_proj in kv_projs.values():
+        kv_proj.register_forward_hook(_count_calls)
+
+    with torch.no_grad():
+        out = model(X_tab)
+        n_calls_per_forward = len(n_calls)
+        # the latents are broadcast along the batch, so the output of a row
+        # does not depend on the rest of the batch
+        out_single_rows = torch.cat([model(X_tab[i : i + 1]) for i in range(2)])
+
+    assert n_calls_per_forward == (2 if share_weights else 2 * 3)
+    assert out.size(0) == 10
+    assert torch.allclose(out[:2], out_single_rows, atol=1e-5)
+
+
+###############################################################################
+# Test the attention weights are only kept when captured
+###############################################################################
+
+
+@pytest.mark.parametrize(
+    "model_name",
+    [
+        "tabtransformer",
+        "saint",
+        "fttransformer",
+        "tabfastformer",
+        "tabperceiver",
+    ],
+)
+def test_capture_attention_weights(model_name):
+    params = {
+        "column_idx": {k: v for v, k in enumerate(colnames)},
+        "cat_embed_input": embed_input,
+        "continuous_cols": colnames[n_cols:],
+    }
+    model = _build_model(model_name, params)
+    model.eval()
+
+    out = model(X_tab)
+    attn_layers = [m for m in model.modules() if hasattr(m, "store_attn_weights")]
+    assert all(m.attn_weights is None for m in attn_layers)
+
+    with capture_attention_weights(model):
+        out_captured = model(X_tab)
+    assert all(m.attn_weights is not None for m in attn_layers)
+    assert not any(m.store_attn_weights for m in attn_layers)
+
+    # the fused and the explicit attention give the same result
+    assert torch.allclose(out, out_captured, atol=1e-5)
@@ -5,16 +5,24 @@ import numpy as np
 import pytest
 from torch import nn
 
+from pytorch_widedeep.utils import RaggedText
 from pytorch_widedeep.models import (
     Wide,
     TabMlp,
     TabNet,
+    BasicRNN,
     WideDeep,
+    Transformer,
+    AttentiveRNN,
     TabTransformer,
+    StackedAttentiveRNN,
 )
 from pytorch_widedeep.metrics import R2Score
 from pytorch_widedeep.training import Trainer
-from pytorch_widedeep.dataloaders import DataLoaderImbalanced
+from pytorch_widedeep.dataloaders import (
+    DataLoaderBucketed,
+    DataLoaderImbalanced,
+)
 
 # Wide array
 X_wide = np.random.choice(50, (32, 10))
@@ -303,6 +311,119 @@ def test_custom_dataloader():
     assert "train_loss" in trainer.history.keys()
 
 
+def test_bucketed_dataloader():
+    # texts of different lengths, padded at the beginning
+    X_text = np.ones((32, 12), dtype=int)
+    for i, length in enumerate(np.random.choice(np.arange(1, 13), 32)):
+        X_text[i, -length:] = np.random.choice(np.arange(2, 20), length)
+
+    deeptext = BasicRNN(
+        vocab_size=20, embed_dim=8, hidden_dim=8, use_packed_sequences=True
+    )
+    model = WideDeep(deeptext=deeptext)
+    trainer = Trainer(model, loss="binary", verbose=0)
+    trainer.fit(
+        X_text=X_text,
+        target=target_binary,
+        batch_size=8,
+        custom_dataloader=DataLoaderBucketed,
+        bucket_size_mul=2,
+    )
+    assert "train_loss" in trainer.history.keys()
+
+
+def test_bucketing_args_without_bucketed_dataloader():
+    model = WideDeep(deeptext=BasicRNN(vocab_size=20, embed_dim=8, hidden_dim=8))
+    trainer = Trainer(model, loss="binary", verbose=0)
+    with pytest.warns(UserWarning, match="bucket_size_mul"):
+        trainer.fit(
+            X_text=np.random.choice(np.arange(2, 20), (32, 12)),
+            target=target_binary,
+            batch_size=8,
+            bucket_size_mul=2,
+        )
+    assert "train_loss" in trainer.history.keys()
+
+
+def _build_text_model(model_name):
+    if model_name == "basic":
+        return BasicRNN(vocab_size=20, embed_dim=8, hidden_dim=8)
+    if model_name == "attentive":
+        return AttentiveRNN(vocab_size=20, embed_dim=8, hidden_dim=8)
+    if model_name == "stacked":
+        return StackedAttentiveRNN(vocab_size=20, embed_dim=8, hidden_dim=8)
+    if model_name == "transformer":
+        return Transformer(
+            vocab_size=20, seq_length=12, input_dim=8, n_heads=2, n_blocks=1
+        )
+    if model_name == "transformer_cls":
+        return Transformer(
+            vocab_size=20,
+            seq_length=12,
+            input_dim=8,
+            n_heads=2,
+            n_blocks=1,
+            with_cls_token=True,
+        )
+
+
+# the HFModel is not included since it requires downloading a pretrained model
+@pytest.mark.parametrize(
+    "model_name",
+    ["basic", "attentive", "stacked", "transformer", "transformer_cls"],
+)
+@pytest.mark.parametrize("with_bucketing", [True, False])
+def test_fit_with_ragged_text(model_name, with_bucketing):
+    lengths = np.random.choice(np.arange(0, 13), 32)
+    X_text = RaggedText.from_lengths(
+        np.random.choice(np.arange(2, 20), lengths.sum()), lengths
+    )
+
+    model = WideDeep(
+        deeptabular=TabMlp(column_idx=column_idx, continuous_cols=colnames),
+        deeptext=_build_text_model(model_name),
+    )
+    trainer = Trainer(model, loss="binary", verbose=0)
+    trainer.fit(
+        X_tab=X_tab,
+        X_text=X_text,
+        target=target_binary,
+        batch_size=8,
+        val_split=0.2,
+        custom_dataloader=DataLoaderBucketed if with_bucketing else None,
+    )
+    preds = trainer.predict(X_tab=X_tab, X_text=X_text, batch_size=8)
+
+    assert "val_loss" in trainer.history.keys()
+    assert preds.shape[0] == 32
+
+
+class _TextModelWithoutLengths(nn.Module):
+    def __init__(self):
+        super().__init__()
+        self.embedding = nn.Embedding(20, 8)
+
+    def forward(self, X):
+        return self.embedding(X.long()).mean(1)
+
+    @property
+    def output_dim(self):
+        return 8
+
+
+def test_fit_with_ragged_text_unsupported_model():
+    lengths = np.random.choice(np.arange(1, 13), 32)
+    X_text = RaggedText.from_lengths(
+        np.random.choice(np.arange(2, 20), lengths.sum()), lengths
+    )
+
+    model = WideDeep(deeptext=_TextModelWithoutLengths())
+    trainer = Trainer(model, loss="binary", verbose=0)
+
+    with pytest.raises(ValueError, match="ragged text inputs"):
+        trainer.fit(X_text=X_text, target=target_binary, batch_size=8)
+
+
 ##############################################################################
 # Test raise warning for multiclass classification
 ##############################################################################
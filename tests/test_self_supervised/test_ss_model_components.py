@@ -5,6 +5,7 @@ import torch
 import pandas as pd
 import pytest
 
+from pytorch_widedeep.losses import DenoisingLoss
 from pytorch_widedeep.models import (
     SAINT,
     TabMlp,
@@ -24,6 +25,19 @@ from pytorch_widedeep.models.tabular.self_supervised import (
     EncoderDecoderModel,
     ContrastiveDenoisingModel,
 )
+from pytorch_widedeep.models.tabular.self_supervised._denoise_mlps import (
+    CatGroupedMlp,
+    ContGroupedMlp,
+    CatMlpPerFeature,
+    ContMlpPerFeature,
+)
+from pytorch_widedeep.models.tabular.self_supervised._augmentations import (
+    mix_up,
+    cut_mix,
+)
+from pytorch_widedeep.models.tabular.self_supervised._random_obfuscator import (
+    RandomObfuscator,
+)
 
 colnames = list(string.ascii_lowercase)[:10]
 embed_cols = [np.random.choice(np.arange(5), 10) for _ in range(5)]
@@ -476,3 +490,72 @@ def _check_cont_only_multiple_denoise_mlps(X, cont_x_and_x_, with_cls_token):
     assertions.extend([assrt1, assrt2])
 
     return assertions
+
+
+def test_seeded_augmentations():
+    X = torch.from_numpy(np.vstack(embed_cols + cont_cols).transpose()).float()
+
+    def _gen(seed):
+        return torch.Generator().manual_seed(seed)
+
+    cut_mixed = cut_mix(X, generator=_gen(0))
+    assert torch.equal(cut_mixed, cut_mix(X, generator=_gen(0)))
+    assert torch.equal(cut_mix(X, lam=1.0, generator=_gen(0)), X)
+    # values are only swapped within the same column
+    assert all(
+        set(cut_mixed[:, j].tolist()) <= set(X[:, j].tolist())
+        for j in range(X.shape[1])
+    )
+
+    mixed_up = mix_up(X, generator=_gen(0))
+    assert torch.equal(mixed_up, mix_up(X, generator=_gen(0)))
+
+    masker1, masker2 = RandomObfuscator(p=0.5, seed=0), RandomObfuscator(p=0.5, seed=0)
+    masked_x, mask = masker1(X)
+    assert torch.equal(mask, masker2(X)[1])
+    assert torch.equal(masked_x, (1 - mask) * X)
+    # the generator state carries on across calls
+    assert not torch.equal(mask, masker1(X)[1])
+
+
+@pytest.mark.parametrize(
+    "cat_or_cont",
+    ["cat", "cont"],
+)
+def test_grouped_denoise_mlps(cat_or_cont):
+    torch.manual_seed(0)
+    cols = colnames[:5]
+    column_idx = {k: v for v, k in enumerate(cols)}
+    cat_embed_input = [(col, n_cat) for col, n_cat in zip(cols, [2, 3, 5, 3, 4])]
+    X = torch.stack([torch.randint(0, n, (10,)) for _, n in cat_embed_input], 1)
+    r_ = torch.randn(10, 5, 8)
+
+    if cat_or_cont == "cat":
+        per_feat = CatMlpPerFeature(8, cat_embed_input, column_idx, "relu")
+        grouped = CatGroupedMlp(8, cat_embed_input, column_idx, "relu")
+    else:
+        per_feat = ContMlpPerFeature(8, cols, column_idx, "relu")
+        grouped = ContGroupedMlp(8, cols, column_idx, "relu")
+
+    # load the weights of each MLP into the (padded) stacked weights
+    with torch.no_grad():
+        for i, col in enumerate(cols):
+            lin1 = per_feat.mlp["mlp_" + col].mlp.dense_layer_0[0]
+            lin2 = per_feat.mlp["mlp_" + col].mlp.dense_layer_1[0]
+            h, o = lin1.out_features, lin2.out_features
+            grouped.grouped_mlp.w1[i, :, :h] = lin1.weight.t()
+            grouped.grouped_mlp.b1[i, 0, :h] = lin1.bias
+            grouped.grouped_mlp.w2[i, :h, :o] = lin2.weight.t()
+            grouped.grouped_mlp.b2[i, 0, :o] = lin2.bias
+
+    loss = DenoisingLoss()
+    if cat_or_cont == "cat":
+        res_per_feat, res_grouped = loss(per_feat(X, r_), None), loss(
+            grouped(X, r_), None
+        )
+    else:
+        res_per_feat, res_grouped = loss(None, per_feat(X, r_)), loss(
+            None, grouped(X, r_)
+        )
+
+    assert torch.allclose(res_per_feat, res_grouped, atol=1e-5)
@@ -1,19 +1,23 @@
 import string
 
 import numpy as np
+import torch
 import pandas as pd
 import pytest
 
 from pytorch_widedeep.models import TabMlp as TabMlpEncoder
 from pytorch_widedeep.models import TabNet as TabNetEncoder
+from pytorch_widedeep.models import WideDeep
 from pytorch_widedeep.models import TabResnet as TabResnetEncoder
 from pytorch_widedeep.models import (
     TabMlpDecoder,
     TabNetDecoder,
     TabResnetDecoder,
 )
+from pytorch_widedeep.training import Trainer
 from pytorch_widedeep.preprocessing import TabPreprocessor
 from pytorch_widedeep.self_supervised_training import (
+    CachedEncoderHead,
     EncoderDecoderTrainer,
     ContrastiveDenoisingTrainer,
 )
@@ -273,6 +277,40 @@ def test_cont_den_trainer_method_name(
     assert len(cd_trainer.history["train_loss"]) == 2
 
 
+@pytest.mark.parametrize(
+    "infonce_kwargs",
+    [{"infonce_chunk_size": 5}, {"infonce_max_negatives": 3}],
+)
+def test_cont_den_trainer_infonce_kwargs(infonce_kwargs):
+    cat_embed_cols = ["col1", "col2"]
+    continuous_cols = ["col3", "col4"]
+
+    preprocessor = TabPreprocessor(
+        cat_embed_cols=cat_embed_cols,
+        continuous_cols=continuous_cols,
+        with_attention=True,
+    )
+    X_tab = preprocessor.fit_transform(test_df)
+
+    tr_model = _build_transf_model(
+        "saint",
+        preprocessor,
+        preprocessor.cat_embed_input,
+        preprocessor.continuous_cols,
+    )
+
+    cd_trainer = ContrastiveDenoisingTrainer(
+        model=tr_model,
+        preprocessor=preprocessor,
+        loss_type="contrastive",
+        verbose=0,
+        **infonce_kwargs,
+    )
+    cd_trainer.pretrain(X_tab, n_epochs=2, batch_size=16)
+
+    assert len(cd_trainer.history["train_loss"]) == 2
+
+
 ###############################################################################
 # Test that ContrastiveDenoisingTrainer with varying params
 ###############################################################################
@@ -292,7 +330,7 @@ def test_cont_den_trainer_method_name(
 )
 @pytest.mark.parametrize(
     "mlp_type",
-    ["single", "multiple"],
+    ["single", "multiple", "grouped"],
 )
 @pytest.mark.parametrize(
     "with_cls_token",
@@ -371,3 +409,103 @@ def test_projection_head_value_error(
             projection_head2_dims=proj_head_dims[1],
             verbose=0,
         )
+
+
+###############################################################################
+# Test that the cached encoder outputs + CachedEncoderHead reproduce the
+# pre-trained model
+###############################################################################
+
+
+def _check_cached_encoder_head(model, X_tab, X_cached):
+    model.eval()
+    head = CachedEncoderHead(model).eval()
+    with torch.no_grad():
+        # same batches as when caching, since SAINT's row attention depends on
+        # the other observations in the batch
+        out = torch.cat(
+            [
+                model(X)[0] if isinstance(model, TabNetEncoder) else model(X)
+                for X in torch.from_numpy(X_tab).split(10)
+            ]
+        )
+        head_out = head(torch.from_numpy(np.array(X_cached)))
+
+    wd_model = WideDeep(deeptabular=CachedEncoderHead(model))
+    trainer = Trainer(wd_model, objective="binary", verbose=0)
+    trainer.fit(X_tab=X_cached, target=target, n_epochs=1, batch_size=16)
+    preds = trainer.predict(X_tab=X_cached, batch_size=16)
+
+    return torch.allclose(out, head_out, atol=1e-5) and len(preds) == len(X_tab)
+
+
+target = np.random.choice(2, 32)
+
+
+@pytest.mark.parametrize(
+    "model_type",
+    ["mlp", "resnet", "tabnet"],
+)
+def test_enc_dec_cache_encoder_outputs(model_type, tmp_path):
+    cat_embed_cols = ["col1", "col2"]
+    continuous_cols = ["col3", "col4"]
+    preprocessor = TabPreprocessor(
+        cat_embed_cols=cat_embed_cols, continuous_cols=continuous_cols
+    )
+    X_tab = preprocessor.fit_transform(test_df)
+
+    encoder = _build_enc_models(
+        model_type,
+        preprocessor.column_idx,
+        preprocessor.cat_embed_input,
+        preprocessor.continuous_cols,
+    )
+
+    ed_trainer = EncoderDecoderTrainer(encoder=encoder, verbose=0)
+    ed_trainer.pretrain(X_tab, n_epochs=1, batch_size=16)
+
+    X_cached = ed_trainer.cache_encoder_outputs(
+        X_tab, str(tmp_path / "encoder_outputs.npy"), batch_size=10
+    )
+
+    assert X_cached.shape == (len(X_tab), encoder.output_dim)
+    assert _check_cached_encoder_head(encoder, X_tab, X_cached)
+
+
+@pytest.mark.parametrize(
+    "transf_model",
+    ["saint", "fttransformer", "contextattentionmlp"],
+)
+@pytest.mark.parametrize(
+    "with_cls_token",
+    [True, False],
+)
+def test_cont_den_cache_encoder_outputs(transf_model, with_cls_token, tmp_path):
+    cat_embed_cols = ["col1", "col2"]
+    continuous_cols = ["col3", "col4"]
+    preprocessor = TabPreprocessor(
+        cat_embed_cols=cat_embed_cols,
+        continuous_cols=continuous_cols,
+        with_attention=True,
+        with_cls_token=with_cls_token,
+    )
+    X_tab = preprocessor.fit_transform(test_df)
+
+    tr_model = _build_transf_model(
+        transf_model,
+        preprocessor,
+        preprocessor.cat_embed_input,
+        preprocessor.continuous_cols,
+    )
+
+    cd_trainer = ContrastiveDenoisingTrainer(
+        model=tr_model, preprocessor=preprocessor, verbose=0
+    )
+    cd_trainer.pretrain(X_tab, n_epochs=1, batch_size=16)
+
+    X_cached = cd_trainer.cache_encoder_outputs(
+        X_tab, str(tmp_path / "encoder_outputs.npy"), batch_size=10
+    )
+
+    assert X_cached.shape == (len(X_tab), X_tab.shape[1], tr_model.input_dim)
+    assert _check_cached_encoder_head(tr_model, X_tab, X_cached)